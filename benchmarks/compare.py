@@ -0,0 +1,60 @@
+"""Compare two benchmark results and report the stages which became slower or used more memory.
+
+    python benchmarks/compare.py base.json new.json --threshold 0.1
+
+The exit status is 1 if a stage of a case run in both results regressed by more than the threshold.
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, Tuple
+
+# Stages faster than this are not compared, since their wall time is mostly noise.
+MIN_SECONDS = 0.001
+
+
+def load_cases(path:str)->Dict[Tuple[str, int, int], Dict[str, Any]]:
+    with open(path, 'r') as f:
+        report = json.load(f)
+    return {(case['shape'], case['scale'], case['phase_num']): case for case in report['cases']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two benchmark results')
+    parser.add_argument('base', help='JSON results of the base version')
+    parser.add_argument('new', help='JSON results of the new version')
+    parser.add_argument('--threshold', type=float, default=0.1, help='ratio of increase reported as a regression (default : 0.1)')
+    args = parser.parse_args()
+
+    base_cases = load_cases(args.base)
+    new_cases = load_cases(args.new)
+
+    regressions = 0
+    print(f'{"case":<28} {"stage":<16} {"seconds":>21} {"peak MiB":>21}')
+    for key in sorted(base_cases.keys() & new_cases.keys()):
+        base_stages = base_cases[key]['stages']
+        new_stages = new_cases[key]['stages']
+        for stage in new_stages:
+            if stage not in base_stages:
+                continue
+            base, new = base_stages[stage], new_stages[stage]
+            marks = []
+            if base['seconds'] >= MIN_SECONDS and new['seconds'] > base['seconds'] * (1 + args.threshold):
+                marks.append('time')
+            if base['peak_bytes'] > 0 and new['peak_bytes'] > base['peak_bytes'] * (1 + args.threshold):
+                marks.append('memory')
+            regressions += len(marks)
+            print(
+                f'{f"{key[0]} x {key[1]} ({key[2]} phases)":<28} {stage:<16} '
+                f'{base["seconds"]:9.4f} -> {new["seconds"]:9.4f} '
+                f'{base["peak_bytes"]/2**20:9.2f} -> {new["peak_bytes"]/2**20:9.2f} '
+                f'{" ".join(marks)}'
+            )
+
+    if regressions > 0:
+        print(f'{regressions} regression(s) over {args.threshold:.0%}', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
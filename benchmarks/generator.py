@@ -0,0 +1,95 @@
+"""Seeded generator of synthetic research flow status for benchmarks.
+
+Shapes:
+    realistic   : phases of random sizes. Parents are mostly in the previous phase, some are up to 3 phases back.
+    wide        : every phase has the full number of sub flows, each with one parent in the previous phase.
+    deep        : parallel chains. Each sub flow has the sub flow at the same position in the previous phase as parent.
+    fan_in      : each sub flow has many parents (up to 50) in the previous phase.
+    far_parents : every sub flow after the second phase has a parent in the first phase, which needs dummy nodes in every phase between.
+"""
+import random
+from typing import Callable, Dict, List
+
+from dg_drawer.research_flow.research_flow_status import PhaseStatus, SubFlowStatus
+
+SHAPES = ('realistic', 'wide', 'deep', 'fan_in', 'far_parents')
+
+
+def generate_research_flow_status(shape:str, sub_flow_num:int, phase_num:int=9, seed:int=0)->List[PhaseStatus]:
+    """Generate research flow status.
+
+    Args:
+        shape (str): [shape of the research flow history. One of SHAPES]
+
+        sub_flow_num (int): [number of sub flows of each phase (maximum number for 'realistic')]
+
+        phase_num (int, optional): [number of phases]. Defaults to 9.
+
+        seed (int, optional): [seed of the random numbers]. Defaults to 0.
+
+    Returns:
+        List[PhaseStatus]: [Research Flow Status Instance]
+    """
+    if shape not in SHAPES:
+        raise ValueError(f'Unknown shape [{shape}]. Shapes : {list(SHAPES)}')
+    rnd = random.Random(f'{shape}:{sub_flow_num}:{phase_num}:{seed}')
+    choose_parents:Callable = _PARENT_CHOOSERS[shape]
+
+    research_flow_status = []
+    ids_each_phase:List[List[str]] = []
+    for phase_index in range(phase_num):
+        if shape == 'realistic' and phase_index > 0:
+            num = rnd.randint(max(1, sub_flow_num // 2), sub_flow_num)
+        else:
+            num = sub_flow_num
+        ids = [f'sf_{phase_index}_{i}' for i in range(num)]
+        sub_flow_data = []
+        for i, id in enumerate(ids):
+            parent_ids = [] if phase_index == 0 else choose_parents(rnd, ids_each_phase, phase_index, i)
+            sub_flow_data.append(SubFlowStatus(
+                id=id,
+                name=f'{id} name',
+                link=f'https://example.com/{id}' if rnd.random() < 0.5 else '',
+                parent_ids=parent_ids,
+                create_datetime=phase_index*1000000 + rnd.randint(0, 999999),
+            ))
+        ids_each_phase.append(ids)
+        research_flow_status.append(PhaseStatus(phase_index+1, f'phase_{phase_index+1}', sub_flow_data))
+    return research_flow_status
+
+
+def _choose_realistic(rnd:random.Random, ids_each_phase:List[List[str]], phase_index:int, i:int)->List[str]:
+    parent_ids = set()
+    for _ in range(rnd.randint(1, 3)):
+        if rnd.random() < 0.9:
+            parent_phase_index = phase_index - 1
+        else:
+            parent_phase_index = rnd.randint(max(0, phase_index - 3), phase_index - 1)
+        parent_ids.add(rnd.choice(ids_each_phase[parent_phase_index]))
+    return sorted(parent_ids)
+
+
+def _choose_wide(rnd:random.Random, ids_each_phase:List[List[str]], phase_index:int, i:int)->List[str]:
+    return [rnd.choice(ids_each_phase[phase_index - 1])]
+
+
+def _choose_deep(rnd:random.Random, ids_each_phase:List[List[str]], phase_index:int, i:int)->List[str]:
+    return [ids_each_phase[phase_index - 1][i]]
+
+
+def _choose_fan_in(rnd:random.Random, ids_each_phase:List[List[str]], phase_index:int, i:int)->List[str]:
+    pre_ids = ids_each_phase[phase_index - 1]
+    return sorted(rnd.sample(pre_ids, min(len(pre_ids), 50)))
+
+
+def _choose_far_parents(rnd:random.Random, ids_each_phase:List[List[str]], phase_index:int, i:int)->List[str]:
+    return [rnd.choice(ids_each_phase[0])]
+
+
+_PARENT_CHOOSERS:Dict[str, Callable] = {
+    'realistic': _choose_realistic,
+    'wide': _choose_wide,
+    'deep': _choose_deep,
+    'fan_in': _choose_fan_in,
+    'far_parents': _choose_far_parents,
+}
@@ -0,0 +1,216 @@
+"""Benchmarks of drawing research flow histories.
+
+Each case (shape x number of sub flows per phase) is drawn stage by stage, and the wall time (best of the repeats),
+the peak memory (tracemalloc, measured in a separate run) and the output size of each stage are saved as JSON.
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --shapes realistic fan_in --scales 100 1000 --repeat 5 --output results.json
+    python benchmarks/compare.py base.json results.json
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dg_drawer.research_flow.flow_drawer import FlowDrawer
+from dg_drawer.research_flow.flow_store import FlowStore
+from dg_drawer.research_flow.level_of_detail import LevelOfDetail
+from dg_drawer.research_flow.research_flow_status import ResearchFlowStatus
+from dg_drawer.research_flow.status_validator import StatusValidator
+
+from generator import SHAPES, generate_research_flow_status
+
+# Cases run by default : every shape at small and medium scales, and a large realistic flow (9 phases x 10k sub flows)
+DEFAULT_CASES = [(shape, scale) for scale in (100, 1000) for shape in SHAPES] + [('realistic', 10000)]
+
+
+def run_stages(research_flow_status_json:bytes)->List[Tuple[str, Callable[[Dict[str, Any]], Any]]]:
+    """Obtain the stages of drawing. Each stage takes the state of the previous stages and returns its output.
+
+    Args:
+        research_flow_status_json (bytes): [research flow status data]
+
+    Returns:
+        List[Tuple[str, Callable[[Dict[str, Any]], Any]]]: [name and function of each stage]
+    """
+    def load(state):
+        state['research_flow_status'] = ResearchFlowStatus.load(research_flow_status_json)
+        state['drawer'] = FlowDrawer(state['research_flow_status'])
+
+    def validate(state):
+        state['rows'] = StatusValidator.validate(state['research_flow_status'])
+
+    def summarize(state):
+        # Summary of a drawing with level of detail. The other stages draw every sub flow.
+        LevelOfDetail(max_phase_nodes=100, compress_chains=True).summarize(state['research_flow_status'])
+
+    def build_store(state):
+        state['store'] = FlowStore.from_research_flow_status(state['research_flow_status'], state['rows'])
+
+    def fill_dummy_rows(state):
+        state['drawer'].fill_dummy_rows(state['store'])
+
+    def sort_rows(state):
+        state['drawer'].sort_rows_each_phase(state['store'])
+
+    def order_rows(state):
+        # Rows reordered as with FlowDrawer(ordering='barycenter'). The ordering replaces the row arrays of the phases
+        # without changing them, so the sorted rows are restored afterwards and the next stages time the default ordering.
+        store = state['store']
+        sorted_phase_rows = list(store.phase_rows)
+        FlowDrawer(state['research_flow_status'], ordering='barycenter').order_rows(store)
+        for phase_index, rows in enumerate(sorted_phase_rows):
+            store.set_phase_rows(phase_index, rows)
+
+    def set_locations(state):
+        state['drawer'].set_row_locations(state['store'])
+        state['body_height'] = state['drawer'].calculate_body_height(state['store'].phase_rows)
+
+    def frame(state):
+        phase_width = state['drawer']._whole_max_width // len(state['research_flow_status'])
+        return ''.join(state['drawer'].get_frame(phase_width, state['body_height']).iter_frame())
+
+    def lines(state):
+        drawer = state['drawer']
+        return ''.join(drawer.iter_svg_lines(drawer.iter_row_lines(state['store'])))
+
+    def nodes(state):
+        return ''.join(node.generate_svg_component() for node in state['drawer'].iter_row_nodes(state['store']))
+
+    def labels(state):
+        return ''.join(node.get_lable_svg_component() for node in state['drawer'].iter_row_nodes(state['store']))
+
+    def draw(state):
+        return FlowDrawer(state['research_flow_status']).draw()
+
+    return [
+        ('load', load), ('validate', validate), ('summarize', summarize), ('build_store', build_store), ('fill_dummy_rows', fill_dummy_rows),
+        ('sort_rows', sort_rows), ('order_rows', order_rows), ('set_locations', set_locations),
+        ('frame', frame), ('lines', lines), ('nodes', nodes), ('labels', labels),
+        ('draw', draw),
+    ]
+
+
+def run_case(shape:str, scale:int, phase_num:int, repeat:int, seed:int)->Dict[str, Any]:
+    """Run the benchmark of a case.
+
+    Args:
+        shape (str): [shape of the research flow history]
+        scale (int): [number of sub flows of each phase]
+        phase_num (int): [number of phases]
+        repeat (int): [number of runs measuring the wall time]
+        seed (int): [seed of the generator]
+
+    Returns:
+        Dict[str, Any]: [results of the case]
+    """
+    research_flow_status = generate_research_flow_status(shape, scale, phase_num=phase_num, seed=seed)
+    research_flow_status_json = json.dumps({'research_flow_pahse_data': [
+        {
+            'seq_number': phase_status._seq_number,
+            'name': phase_status._name,
+            'sub_flow_data': [
+                {'id': sf._id, 'name': sf._name, 'link': sf._link, 'parent_ids': sf._parent_ids, 'create_datetime': sf._create_datetime}
+                for sf in phase_status._sub_flow_data
+            ],
+        }
+        for phase_status in research_flow_status
+    ]}).encode('utf-8')
+    del research_flow_status
+
+    stages = run_stages(research_flow_status_json)
+    results = {name: {'seconds': float('inf'), 'peak_bytes': 0, 'output_bytes': 0} for name, _ in stages}
+
+    for _ in range(repeat):
+        state:Dict[str, Any] = {}
+        for name, stage in stages:
+            gc.collect()
+            start = time.perf_counter()
+            output = stage(state)
+            results[name]['seconds'] = min(results[name]['seconds'], time.perf_counter() - start)
+            if isinstance(output, str):
+                results[name]['output_bytes'] = len(output.encode('utf-8'))
+
+    # Peak memory is measured in a separate run, since tracemalloc slows down the stages.
+    # Only the memory allocated by each stage is traced.
+    state = {}
+    for name, stage in stages:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            stage(state)
+            results[name]['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    store = state['store']
+    dummy_num = sum(1 for _, row in store.iter_rows() if store.is_dummy(row))
+    return {
+        'shape': shape,
+        'scale': scale,
+        'phase_num': phase_num,
+        'input_bytes': len(research_flow_status_json),
+        'sub_flow_num': len(state['rows']),
+        'dummy_node_num': dummy_num,
+        'line_num': sum(len(store.get_layer_parent_rows(row)) for _, row in store.iter_rows()),
+        'stages': results,
+    }
+
+
+def get_git_revision()->str:
+    try:
+        return subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks of drawing research flow histories')
+    parser.add_argument('--shapes', nargs='+', choices=SHAPES, help='shapes to run (default : every shape)')
+    parser.add_argument('--scales', nargs='+', type=int, help='numbers of sub flows per phase (default : 100 and 1000, and 10000 for realistic)')
+    parser.add_argument('--phase-num', type=int, default=9, help='number of phases (default : 9)')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs measuring the wall time (default : 3)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the generator (default : 0)')
+    parser.add_argument('--output', help='path of the JSON results (default : standard output)')
+    args = parser.parse_args()
+
+    if args.shapes is None and args.scales is None:
+        cases = DEFAULT_CASES
+    else:
+        cases = [(shape, scale) for scale in (args.scales or [100, 1000]) for shape in (args.shapes or SHAPES)]
+
+    results = []
+    for shape, scale in cases:
+        result = run_case(shape, scale, args.phase_num, args.repeat, args.seed)
+        results.append(result)
+        draw = result['stages']['draw']
+        print(f'{shape:>12} x {scale:>6} : {draw["seconds"]:8.3f} s  {draw["peak_bytes"]/2**20:8.1f} MiB  {draw["output_bytes"]/2**20:8.1f} MiB', file=sys.stderr)
+
+    report = {
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'git_revision': get_git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cases': results,
+    }
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,4 +6,7 @@ class JSONDataError(Exception):
     pass
 
 class EnumValueError(Exception):
+    pass
+
+class BinaryDataError(JSONDataError):
     pass
\ No newline at end of file
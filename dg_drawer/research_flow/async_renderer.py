@@ -0,0 +1,74 @@
+import asyncio
+from concurrent.futures import Executor
+import os
+from typing import IO, List, Optional, Union
+
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow.flow_drawer import FlowDrawer
+from dg_drawer.research_flow.research_flow_status import PhaseStatus, ResearchFlowStatus
+
+
+class AsyncRenderer():
+    """AsyncRenderer class
+
+    Loading and drawing of research flow status for asyncio applications.
+
+    The work is run in an executor, so that the event loop is not blocked, and the number of
+    loads and draws running at the same time is limited, so that slow draws do not occupy every worker.
+    Callers over the limit wait without blocking the event loop.
+    """
+
+    def __init__(self, executor:Executor=None, max_concurrency:int=None) -> None:
+        """AsyncRenderer constructor
+
+        Args:
+            executor (Executor, optional): [executor running loads and draws]. Defaults to None (default executor of the event loop).
+
+            max_concurrency (int, optional): [maximum number of loads and draws running at the same time]. Defaults to None (no limit).
+
+        Raises:
+            ArgError: [Error if max_concurrency is less than 1]
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ArgError(f'max_concurrency must be 1 or more : {max_concurrency}')
+        self._executor = executor
+        self._max_concurrency = max_concurrency
+        # The semaphore is created in the event loop using it.
+        self._semaphore:Optional[asyncio.Semaphore] = None
+
+    async def aload(self, source:Union[str, bytes, os.PathLike, IO])->List[PhaseStatus]:
+        """Load research flow status data (JSON).
+
+        Args:
+            source (Union[str, bytes, os.PathLike, IO]): [Research flow status data. See ResearchFlowStatus.load()]
+
+        Returns:
+            List[PhaseStatus]: [Research Flow Status Instance]
+        """
+        async with self._get_semaphore():
+            return await ResearchFlowStatus.aload(source, executor=self._executor)
+
+    async def adraw(self, research_flow_status:List[PhaseStatus], **drawer_options)->str:
+        """Draw research flow history as SVG data.
+
+        Args:
+            research_flow_status (List[PhaseStatus]): [Research Flow Status Instance]
+
+            drawer_options : [options of FlowDrawer (whole_max_width, header_height, ...)]
+
+        Returns:
+            str: [research flow history as SVG data]
+        """
+        drawer = FlowDrawer(research_flow_status, **drawer_options)
+        async with self._get_semaphore():
+            return await drawer.adraw(executor=self._executor)
+
+    def _get_semaphore(self)->asyncio.Semaphore:
+        if self._semaphore is None:
+            # Without limit, a semaphore which never blocks
+            self._semaphore = asyncio.Semaphore(self._max_concurrency or 2**31)
+        return self._semaphore
+
+    @property
+    def max_concurrency(self)->Optional[int]:
+        return self._max_concurrency
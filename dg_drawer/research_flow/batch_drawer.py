@@ -0,0 +1,169 @@
+from concurrent.futures import Executor, FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+import os
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow.flow_drawer import FlowDrawer
+from dg_drawer.research_flow.research_flow_status import PhaseStatus, ResearchFlowStatus
+
+# A research flow status instance, or a source of ResearchFlowStatus.load() (file path, JSON text or bytes data)
+DrawInput = Union[List[PhaseStatus], str, bytes, os.PathLike]
+
+
+class DrawResult():
+    """DrawResult class
+
+    Result of drawing one research flow status of a batch.
+    """
+
+    __slots__ = ('_key', '_svg', '_error')
+
+    def __init__(self, key:Hashable, svg:Optional[str]=None, error:Optional[BaseException]=None) -> None:
+        """DrawResult constructor
+
+        Args:
+            key (Hashable): [key of the input (index in the inputs, or key of the mapping of inputs)]
+
+            svg (Optional[str], optional): [SVG data. None if drawing failed]. Defaults to None.
+
+            error (Optional[BaseException], optional): [error raised while loading or drawing]. Defaults to None.
+        """
+        self._key = key
+        self._svg = svg
+        self._error = error
+
+    @property
+    def key(self)->Hashable:
+        return self._key
+
+    @property
+    def svg(self)->Optional[str]:
+        return self._svg
+
+    @property
+    def error(self)->Optional[BaseException]:
+        return self._error
+
+    @property
+    def ok(self)->bool:
+        return self._error is None
+
+    def __repr__(self)->str:
+        return f'DrawResult(key={self._key!r}, ok={self.ok})'
+
+
+def draw_many(inputs:Union[Iterable[DrawInput], Mapping[Hashable, DrawInput]], max_workers:int=None, chunksize:int=1,
+              executor:Executor=None, **drawer_options)->Iterator[DrawResult]:
+    """Draw many research flow status in a process pool.
+
+    The inputs are sent to the workers in chunks, and the results are yielded as soon as their chunk is finished
+    (not in the order of the inputs). An error of an input is reported in its result and does not stop the batch.
+    Only a limited number of chunks is submitted at a time, so the inputs may be a generator of any length.
+
+    Args:
+        inputs (Union[Iterable[DrawInput], Mapping[Hashable, DrawInput]]): [research flow status instances or sources of ResearchFlowStatus.load().
+                                                                          If a mapping is given, its keys are the keys of the results]
+
+        max_workers (int, optional): [number of worker processes]. Defaults to None (number of CPUs).
+
+        chunksize (int, optional): [number of inputs drawn by a worker at a time]. Defaults to 1.
+
+        executor (Executor, optional): [executor used instead of a new process pool. It is not shut down]. Defaults to None.
+
+        drawer_options : [options of FlowDrawer (whole_max_width, header_height, ...). They must be picklable]
+
+    Raises:
+        ArgError: [Error if max_workers or chunksize is less than 1, or an option of FlowDrawer is not supported.
+                   Raised by the call, before the results are iterated]
+
+    Returns:
+        Iterator[DrawResult]: [result of each input]
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers < 1:
+        raise ArgError(f'max_workers must be 1 or more : {max_workers}')
+    if chunksize < 1:
+        raise ArgError(f'chunksize must be 1 or more : {chunksize}')
+    # The options are checked once, before any worker is started.
+    FlowDrawer([], **drawer_options)
+
+    items = inputs.items() if isinstance(inputs, Mapping) else enumerate(inputs)
+    return _iter_draw_results(items, max_workers, chunksize, executor, drawer_options)
+
+
+def _iter_draw_results(items:Iterable[Tuple[Hashable, DrawInput]], max_workers:int, chunksize:int, executor:Optional[Executor],
+                       drawer_options:Dict[str, Any])->Iterator[DrawResult]:
+    # The process pool is started when the results are iterated.
+    if executor is not None:
+        yield from _draw_chunks(executor, items, max_workers, chunksize, drawer_options)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        yield from _draw_chunks(pool, items, max_workers, chunksize, drawer_options)
+
+
+def _draw_chunks(executor:Executor, items:Iterable[Tuple[Hashable, DrawInput]], max_workers:int, chunksize:int,
+                 drawer_options:Dict[str, Any])->Iterator[DrawResult]:
+    """Submit chunks of inputs to an executor and yield their results as they finish.
+
+    Args:
+        executor (Executor): [executor]
+        items (Iterable[Tuple[Hashable, DrawInput]]): [keys and inputs]
+        max_workers (int): [number of workers]
+        chunksize (int): [number of inputs of a chunk]
+        drawer_options (Dict[str, Any]): [options of FlowDrawer]
+
+    Yields:
+        DrawResult: [result of each input]
+    """
+    items = iter(items)
+    # Two chunks per worker are kept in flight, so that workers do not wait for the next chunk.
+    max_pending = max_workers * 2
+    pending:Dict[Future, List[Hashable]] = {}
+    exhausted = False
+    while True:
+        while not exhausted and len(pending) < max_pending:
+            chunk = []
+            for item in items:
+                chunk.append(item)
+                if len(chunk) >= chunksize:
+                    break
+            if len(chunk) < chunksize:
+                exhausted = True
+            if len(chunk) > 0:
+                pending[executor.submit(_draw_chunk, chunk, drawer_options)] = [key for key, _ in chunk]
+        if len(pending) == 0:
+            return
+
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            keys = pending.pop(future)
+            try:
+                results = future.result()
+            except Exception as e:
+                # The chunk could not be drawn at all (ex. a worker process died, or an input could not be pickled).
+                results = [DrawResult(key, error=e) for key in keys]
+            yield from results
+
+
+def _draw_chunk(chunk:List[Tuple[Hashable, DrawInput]], drawer_options:Dict[str, Any])->List[DrawResult]:
+    """Draw a chunk of inputs in a worker.
+
+    Args:
+        chunk (List[Tuple[Hashable, DrawInput]]): [keys and inputs]
+        drawer_options (Dict[str, Any]): [options of FlowDrawer]
+
+    Returns:
+        List[DrawResult]: [result of each input]
+    """
+    results = []
+    for key, draw_input in chunk:
+        try:
+            if isinstance(draw_input, (str, bytes, os.PathLike)):
+                research_flow_status = ResearchFlowStatus.load(draw_input)
+            else:
+                research_flow_status = draw_input
+            results.append(DrawResult(key, svg=FlowDrawer(research_flow_status, **drawer_options).draw()))
+        except Exception as e:
+            results.append(DrawResult(key, error=e))
+    return results
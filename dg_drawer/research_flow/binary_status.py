@@ -0,0 +1,405 @@
+import argparse
+from array import array
+import gc
+import itertools
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, List, Optional, Tuple, Union
+
+from dg_drawer.error.error import ArgError, BinaryDataError
+from dg_drawer.research_flow.research_flow_status import PhaseStatus, ResearchFlowStatus, SubFlowStatus
+from dg_drawer.research_flow.status_validator import StatusValidator
+
+# First bytes of a binary research flow status file
+BINARY_MAGIC = b'DGRF'
+# Version of the binary format. Change it when the layout of the file changes.
+BINARY_FORMAT_VERSION = 1
+
+# magic, version, flags, number of phases, sub flows, strings and parents, size of the string data (bytes)
+_HEADER = struct.Struct('<4sHHIIIIQ')
+# Flag set if no string contains the separator, so that the string data is split at once.
+_FLAG_SPLITTABLE = 1
+_SEPARATOR = '\0'
+_ALIGNMENT = 8
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def _get_sections(phase_num:int, sub_flow_num:int, string_num:int, parent_num:int)->Tuple[Tuple[str, str, int], ...]:
+    """Obtain the columns of a binary research flow status file, in the order of the file.
+
+    Args:
+        phase_num (int): [number of phases]
+        sub_flow_num (int): [number of sub flows]
+        string_num (int): [number of strings]
+        parent_num (int): [number of parent IDs]
+
+    Returns:
+        Tuple[Tuple[str, str, int], ...]: [name, type code (array module) and length of each column]
+    """
+    return (
+        # character offsets of the strings in the string data, each string being followed by a separator (CSR)
+        ('string_offsets', 'q', string_num + 1),
+        ('seq_numbers', 'q', phase_num),
+        ('phase_names', 'I', phase_num),
+        # rows of the first sub flow of each phase (CSR)
+        ('phase_offsets', 'I', phase_num + 1),
+        ('ids', 'I', sub_flow_num),
+        ('names', 'I', sub_flow_num),
+        ('links', 'I', sub_flow_num),
+        ('create_datetimes', 'q', sub_flow_num),
+        # offsets of the parents of each sub flow in parent_rows (CSR)
+        ('parent_offsets', 'I', sub_flow_num + 1),
+        ('parent_rows', 'I', parent_num),
+    )
+
+
+def _align(offset:int)->int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def write_binary_status(research_flow_status:List[PhaseStatus], path:Union[str, os.PathLike])->int:
+    """Write research flow status to a binary research flow status file.
+
+    The file holds a string table (each distinct string once), the rows of the sub flows as integer IDs,
+    columns of the sequence numbers and the creation datetimes, and the parents of each sub flow as rows (CSR).
+    All the columns are little-endian and aligned to 8 bytes, so they are read from a memory map without copying.
+
+    Args:
+        research_flow_status (List[PhaseStatus]): [Research Flow Status Instance]
+
+        path (Union[str, os.PathLike]): [path of the binary file]
+
+    Raises:
+        ArgError: [Error if the research flow status is not valid or a number does not fit in 64 bits]
+
+    Returns:
+        int: [number of bytes written]
+    """
+    research_flow_status = sorted(research_flow_status, key=lambda x : x._seq_number)
+    rows = StatusValidator.validate(research_flow_status)
+
+    string_indexes:Dict[str, int] = {}
+    def get_string_index(value:str)->int:
+        return string_indexes.setdefault(value, len(string_indexes))
+
+    columns:Dict[str, array] = {name: array(type_code) for name, type_code, _ in _get_sections(0, 0, 0, 0)}
+    columns['phase_offsets'].append(0)
+    columns['parent_offsets'].append(0)
+    for phase_status in research_flow_status:
+        columns['seq_numbers'].append(_check_int64(phase_status._seq_number, 'seq_number'))
+        columns['phase_names'].append(get_string_index(phase_status._name))
+        for sub_flow in phase_status._sub_flow_data:
+            columns['ids'].append(get_string_index(sub_flow._id))
+            columns['names'].append(get_string_index(sub_flow._name))
+            columns['links'].append(get_string_index(sub_flow._link))
+            columns['create_datetimes'].append(_check_int64(sub_flow._create_datetime, 'create_datetime'))
+            columns['parent_rows'].extend(rows[parent_id] for parent_id in sub_flow._parent_ids)
+            columns['parent_offsets'].append(len(columns['parent_rows']))
+        columns['phase_offsets'].append(len(columns['ids']))
+    strings = list(string_indexes)
+    columns['string_offsets'].extend(itertools.accumulate(itertools.chain((0,), (len(string) + 1 for string in strings))))
+    text = ''.join(string + _SEPARATOR for string in strings).encode('utf-8')
+    flags = 0 if any(_SEPARATOR in string for string in strings) else _FLAG_SPLITTABLE
+
+    header = _HEADER.pack(BINARY_MAGIC, BINARY_FORMAT_VERSION, flags, len(research_flow_status), len(columns['ids']),
+                          len(strings), len(columns['parent_rows']), len(text))
+    with open(path, 'wb') as f:
+        f.write(header)
+        offset = len(header)
+        for name, _, _ in _get_sections(0, 0, 0, 0):
+            column = columns[name]
+            if sys.byteorder != 'little':
+                column.byteswap()
+            f.write(b'\0' * (_align(offset) - offset))
+            f.write(column.tobytes())
+            offset = _align(offset) + column.itemsize * len(column)
+        f.write(b'\0' * (_align(offset) - offset))
+        f.write(text)
+        return _align(offset) + len(text)
+
+
+def _check_int64(value:int, name:str)->int:
+    if not _INT64_MIN <= value <= _INT64_MAX:
+        raise ArgError(f'{name} does not fit in 64 bits : {value}')
+    return value
+
+
+def convert_json_to_binary(json_path:Union[str, os.PathLike], binary_path:Union[str, os.PathLike])->int:
+    """Convert a research flow status file (JSON) into a binary research flow status file.
+
+    Args:
+        json_path (Union[str, os.PathLike]): [path of the research flow status file (JSON)]
+
+        binary_path (Union[str, os.PathLike]): [path of the binary file]
+
+    Raises:
+        JSONDataError: [Error if the JSON data is not valid research flow status]
+
+    Returns:
+        int: [number of bytes written]
+    """
+    return write_binary_status(ResearchFlowStatus.load_from_json(json_path), binary_path)
+
+
+def is_binary_status(data:bytes)->bool:
+    """Check whether data starts like a binary research flow status file.
+
+    Args:
+        data (bytes): [first bytes of the data]
+
+    Returns:
+        bool: [True if the data starts with the magic of the binary format]
+    """
+    return bytes(data[:len(BINARY_MAGIC)]) == BINARY_MAGIC
+
+
+class BinaryStatusFile():
+    """BinaryStatusFile class
+
+    Binary research flow status file (see write_binary_status()) mapped in memory.
+    The columns are memoryviews of the memory map, so opening the file reads nothing but the header,
+    and processes mapping the same file share its pages.
+    """
+
+    def __init__(self, source:Union[str, os.PathLike, bytes, bytearray, memoryview]) -> None:
+        """BinaryStatusFile constructor
+
+        Args:
+            source (Union[str, os.PathLike, bytes, bytearray, memoryview]): [path of the binary file, or its data]
+
+        Raises:
+            BinaryDataError: [Error if the data is not a binary research flow status file of a supported version, or is truncated]
+        """
+        self._mmap:Optional[mmap.mmap] = None
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < _HEADER.size:
+                    raise BinaryDataError(f'Too short binary research flow status data : {source}')
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._buffer = memoryview(self._mmap)
+        else:
+            self._buffer = memoryview(source).cast('B')
+        self._views:List[memoryview] = [self._buffer]
+        try:
+            self._columns = self._map_columns()
+        except BinaryDataError:
+            self.close()
+            raise
+
+    def _map_columns(self)->Dict[str, memoryview]:
+        buffer = self._buffer
+        if len(buffer) < _HEADER.size:
+            raise BinaryDataError('Too short binary research flow status data')
+        magic, version, flags, phase_num, sub_flow_num, string_num, parent_num, text_bytes = _HEADER.unpack_from(buffer)
+        if magic != BINARY_MAGIC:
+            raise BinaryDataError('Not binary research flow status data')
+        if version != BINARY_FORMAT_VERSION:
+            raise BinaryDataError(f'Unsupported version of binary research flow status data : {version} (supported {BINARY_FORMAT_VERSION})')
+        self._flags = flags
+        self._phase_num = phase_num
+        self._sub_flow_num = sub_flow_num
+        self._string_num = string_num
+
+        columns:Dict[str, memoryview] = {}
+        offset = _HEADER.size
+        for name, type_code, length in _get_sections(phase_num, sub_flow_num, string_num, parent_num):
+            start = _align(offset)
+            offset = start + array(type_code).itemsize * length
+            if offset > len(buffer):
+                raise BinaryDataError('Truncated binary research flow status data')
+            columns[name] = self._map_column(buffer[start:offset], type_code)
+        start = _align(offset)
+        if start + text_bytes != len(buffer):
+            raise BinaryDataError('Truncated binary research flow status data')
+        columns['text'] = buffer[start:]
+        self._views.extend(columns.values())
+        return columns
+
+    def _map_column(self, data:memoryview, type_code:str)->memoryview:
+        if sys.byteorder == 'little':
+            return data.cast(type_code)
+        # Only big-endian hosts copy the columns.
+        column = array(type_code, data.tobytes())
+        column.byteswap()
+        return memoryview(column)
+
+    def close(self):
+        """Release the columns and the memory map.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self)->'BinaryStatusFile':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_column(self, name:str)->memoryview:
+        """Obtain a column of the file.
+
+        Args:
+            name (str): [column name ('string_offsets', 'seq_numbers', 'phase_names', 'phase_offsets', 'ids', 'names', 'links',
+                         'create_datetimes', 'parent_offsets', 'parent_rows' or 'text')]
+
+        Raises:
+            ArgError: [Error if the column does not exist]
+
+        Returns:
+            memoryview: [column (view of the memory map)]
+        """
+        if name not in self._columns:
+            raise ArgError(f'Unknown column [{name}]. Columns : {list(self._columns)}')
+        return self._columns[name]
+
+    def get_strings(self)->List[str]:
+        """Decode the string table. The string data is decoded at once, then split at the separators
+        (or sliced at the offsets if a string contains the separator).
+
+        Raises:
+            BinaryDataError: [Error if the string data is not valid]
+
+        Returns:
+            List[str]: [strings by index]
+        """
+        try:
+            text = str(self._columns['text'], 'utf-8')
+        except UnicodeDecodeError as e:
+            raise BinaryDataError(f'Invalid string data of binary research flow status data : {e}') from None
+        if self._string_num == 0:
+            return []
+        if self._flags & _FLAG_SPLITTABLE:
+            strings = text[:-1].split(_SEPARATOR)
+            if len(strings) != self._string_num:
+                raise BinaryDataError('Invalid string data of binary research flow status data')
+            return strings
+        offsets = self._columns['string_offsets'].tolist()
+        if offsets[0] != 0 or offsets[-1] != len(text):
+            raise BinaryDataError('Invalid string offsets of binary research flow status data')
+        return list(map(text.__getitem__, map(slice, offsets, (offset - 1 for offset in itertools.islice(offsets, 1, None)))))
+
+    def to_research_flow_status(self, validate:bool=True)->List[PhaseStatus]:
+        """Build the research flow status instance. Sub flow IDs and parent IDs share the strings of the string table.
+
+        Args:
+            validate (bool, optional): [True to check that the rows and the IDs are valid.
+                                        False for files written by write_binary_status() and not changed since]. Defaults to True.
+
+        Raises:
+            BinaryDataError: [Error if the data is not valid]
+
+        Returns:
+            List[PhaseStatus]: [Research Flow Status Instance]
+        """
+        # The collector is paused while the objects are created, as they have no reference cycle
+        # and collections triggered by the allocations would walk all of them again and again.
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._build_research_flow_status(validate)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _build_research_flow_status(self, validate:bool)->List[PhaseStatus]:
+        columns = self._columns
+        strings = self.get_strings()
+        phase_offsets = columns['phase_offsets'].tolist()
+        parent_offsets = columns['parent_offsets'].tolist()
+        parent_rows = columns['parent_rows'].tolist()
+        if validate:
+            self._validate_rows(phase_offsets, parent_offsets, parent_rows)
+        try:
+            ids = list(map(strings.__getitem__, columns['ids'].tolist()))
+            names = map(strings.__getitem__, columns['names'].tolist())
+            links = map(strings.__getitem__, columns['links'].tolist())
+            parent_ids = list(map(ids.__getitem__, parent_rows))
+            parents = map(parent_ids.__getitem__, map(slice, parent_offsets, itertools.islice(parent_offsets, 1, None)))
+            sub_flows = list(map(SubFlowStatus, ids, names, links, parents, columns['create_datetimes'].tolist()))
+            phase_names = list(map(strings.__getitem__, columns['phase_names'].tolist()))
+        except IndexError:
+            raise BinaryDataError('Invalid string index or row of binary research flow status data') from None
+        research_flow_status = [
+            PhaseStatus(seq_number, name, sub_flows[start:stop])
+            for seq_number, name, start, stop in zip(columns['seq_numbers'].tolist(), phase_names, phase_offsets, phase_offsets[1:])
+        ]
+        research_flow_status.sort(key=lambda x : x._seq_number)
+        if validate and len(set(ids)) != len(ids):
+            # The duplicate ID is reported with its location.
+            StatusValidator.validate(research_flow_status, error_class=BinaryDataError)
+        return research_flow_status
+
+    def _validate_rows(self, phase_offsets:List[int], parent_offsets:List[int], parent_rows:List[int]):
+        """Check the CSR offsets, and that the parents of the sub flows of each phase are in the previous phases.
+
+        Raises:
+            BinaryDataError: [Error if an offset or a parent row is not valid]
+        """
+        if phase_offsets[0] != 0 or phase_offsets[-1] != self._sub_flow_num or parent_offsets[0] != 0 or parent_offsets[-1] != len(parent_rows) \
+                or any(map(int.__gt__, phase_offsets, itertools.islice(phase_offsets, 1, None))) \
+                or any(map(int.__gt__, parent_offsets, itertools.islice(parent_offsets, 1, None))):
+            raise BinaryDataError('Invalid offsets of binary research flow status data')
+        seq_numbers = self._columns['seq_numbers'].tolist()
+        if seq_numbers != sorted(seq_numbers):
+            raise BinaryDataError('Phases of binary research flow status data are not sorted')
+        for phase_index, (start, stop) in enumerate(zip(phase_offsets, phase_offsets[1:])):
+            rows = parent_rows[parent_offsets[start]:parent_offsets[stop]]
+            if len(rows) > 0 and max(rows) >= start:
+                raise BinaryDataError(f'Parent of a sub flow of phase [{seq_numbers[phase_index]}] is not in a previous phase')
+
+    '''
+    getter
+    '''
+    @property
+    def phase_num(self)->int:
+        return self._phase_num
+
+    @property
+    def sub_flow_num(self)->int:
+        return self._sub_flow_num
+
+    @property
+    def string_num(self)->int:
+        return self._string_num
+
+
+def load_binary_status(source:Union[str, os.PathLike, bytes, bytearray, memoryview], validate:bool=True)->List[PhaseStatus]:
+    """Load a binary research flow status file (see write_binary_status()) to obtain an instance.
+
+    Args:
+        source (Union[str, os.PathLike, bytes, bytearray, memoryview]): [path of the binary file, or its data]
+
+        validate (bool, optional): [True to check that the rows and the IDs are valid]. Defaults to True.
+
+    Raises:
+        BinaryDataError: [Error if the data is not valid binary research flow status data]
+
+    Returns:
+        List[PhaseStatus]: [Research Flow Status Instance]
+    """
+    with BinaryStatusFile(source) as binary_status_file:
+        return binary_status_file.to_research_flow_status(validate)
+
+
+def main(argv:List[str]=None):
+    """Convert research flow status files (JSON) into binary files. ex. python -m dg_drawer.research_flow.binary_status status.json status.dgrf
+
+    Args:
+        argv (List[str], optional): [command line arguments]. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description='Convert a research flow status file (JSON) into a binary research flow status file.')
+    parser.add_argument('json_path', help='research flow status file (JSON)')
+    parser.add_argument('binary_path', help='binary research flow status file')
+    args = parser.parse_args(argv)
+    convert_json_to_binary(args.json_path, args.binary_path)
+
+
+if __name__ == '__main__':
+    main()
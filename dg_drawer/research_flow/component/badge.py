@@ -0,0 +1,56 @@
+from typing import Tuple
+
+class Badge():
+    """Badge class
+
+    Small label on a line. ex. number of sub flows hidden in a compressed chain.
+    """
+
+    __slots__ = ('_value', '_x', '_y', '_font_size')
+
+    def __init__(self, value:str, x:int, y:int, font_size:int=10) -> None:
+        """Badge constructor
+
+        Args:
+            value (str): [badge value]
+            x (int): [X-coordinate of the center]
+            y (int): [Y-coordinate of the center]
+            font_size (int, optional): [Font size (px)]. Defaults to 10.
+        """
+        self._value = value
+        self._x = x
+        self._y = y
+        self._font_size = font_size
+
+    def get_box(self)->Tuple[float, float, float, float]:
+        """Obtain the box of the badge.
+
+        Returns:
+            Tuple[float, float, float, float]: [x, y, width and height of the box]
+        """
+        width = len(self._value) * self._font_size * 0.6 + 8
+        height = self._font_size + 6
+        return self._x - width / 2, self._y - height / 2, width, height
+
+    def generate_svg_component(self)->str:
+        """Generation of SVG badge components.
+
+        Returns:
+            str: [SVG badge components]
+        """
+        x, y, width, height = self.get_box()
+        return (f'<rect x="{x}" y="{y}" width="{width}" height="{height}" rx="{height / 2}" fill="#ffffff" stroke="gray" stroke-width="1" />'
+                f'<text x="{self._x}" y="{self._y}" text-anchor="middle" dominant-baseline="middle" font-size="{self._font_size}" fill="gray">{self._value}</text>')
+
+    def generate_classed_svg_component(self, class_name:str)->str:
+        """Generation of SVG badge components styled by a class instead of presentation attributes.
+
+        Args:
+            class_name (str): [class of the badge]
+
+        Returns:
+            str: [SVG badge components]
+        """
+        x, y, width, height = self.get_box()
+        return (f'<rect class="{class_name}" x="{x}" y="{y}" width="{width}" height="{height}" rx="{height / 2}"/>'
+                f'<text class="{class_name}" x="{self._x}" y="{self._y}">{self._value}</text>')
@@ -1,6 +1,7 @@
 from dg_drawer.research_flow.component.rectangle import Rectangle
 from dg_drawer.research_flow.enums.color import ColorType
-from typing import List
+from typing import Iterable, Iterator, List, Optional
+from dg_drawer.research_flow.component.svg_style import SvgStyle
 from dg_drawer.research_flow.research_flow_status import PhaseStatus
 
 class Frame():
@@ -80,13 +81,39 @@ class Frame():
         Returns:
             str: [a chunk of SVG header and body components.]
         """
-        frame_svg = ''
-        headers = self.generate_headers()
-        for header in headers:
-            frame_svg = frame_svg + header.generate_svg_component()
+        return ''.join(self.iter_frame())
 
-        bodies = self.generate_bodies()
-        for body in bodies:
-            frame_svg = frame_svg + body.generate_svg_component()
+    def iter_frame(self, style:Optional[SvgStyle]=None, phase_indexes:Optional[Iterable[int]]=None, headers:bool=True, bodies:bool=True)->Iterator[str]:
+        """Generate SVG header and body components one by one.
 
-        return frame_svg
+        Args:
+            style (Optional[SvgStyle], optional): [style sheet whose classes replace the presentation attributes]. Defaults to None.
+
+            phase_indexes (Optional[Iterable[int]], optional): [indexes of the phases whose header and body are generated]. Defaults to None (every phase).
+
+            headers (bool, optional): [False not to generate the headers]. Defaults to True.
+
+            bodies (bool, optional): [False not to generate the bodies]. Defaults to True.
+
+        Yields:
+            str: [SVG header or body component]
+        """
+        if phase_indexes is None:
+            phase_indexes = range(len(self._phase_list))
+        else:
+            phase_indexes = list(phase_indexes)
+        header_list = self.generate_headers() if headers else []
+        body_list = self.generate_bodies() if bodies else []
+
+        if style is not None:
+            for index in phase_indexes if headers else []:
+                yield header_list[index].generate_classed_svg_component(style.get_header_class(index), style.HEADER_TEXT_CLASS)
+            for index in phase_indexes if bodies else []:
+                yield body_list[index].generate_classed_svg_component(style.BODY_CLASS)
+            return
+
+        for index in phase_indexes if headers else []:
+            yield header_list[index].generate_svg_component()
+
+        for index in phase_indexes if bodies else []:
+            yield body_list[index].generate_svg_component()
@@ -1,11 +1,14 @@
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Tuple
 from dg_drawer.error.error import ArgError
 from dg_drawer.research_flow.component.node import Node
+from dg_drawer.research_flow.flow_store import FlowStore
 
 class Line():
     """Line class
     """
 
+    __slots__ = ('_parent_node_x', '_parent_node_y', '_child_node_x', '_child_node_y', '_stroke', '_stroke_width')
+
     def __init__(self, parent_node: Node, child_node:Node, stroke:str='gray', stroke_width:int=1) -> None:
         """Line constructor
 
@@ -32,6 +35,29 @@ class Line():
         self._stroke = stroke
         self._stroke_width = stroke_width
 
+    @classmethod
+    def from_points(cls, parent_node_x:int, parent_node_y:int, child_node_x:int, child_node_y:int, stroke:str='gray', stroke_width:int=1)->'Line':
+        """Create a line from the coordinates of the parent and child nodes, without checking their relationship.
+
+        Args:
+            parent_node_x (int): [X-coordinate of the parent node]
+            parent_node_y (int): [Y-coordinate of the parent node]
+            child_node_x (int): [X-coordinate of the child node]
+            child_node_y (int): [Y-coordinate of the child node]
+            stroke (str, optional): [Outline colour]. Defaults to 'gray'.
+            stroke_width (int, optional): [Outline thickness]. Defaults to 1.
+
+        Returns:
+            Line: [line between the nodes]
+        """
+        line = cls.__new__(cls)
+        line._parent_node_x = parent_node_x
+        line._parent_node_y = parent_node_y
+        line._child_node_x = child_node_x
+        line._child_node_y = child_node_y
+        line._stroke = stroke
+        line._stroke_width = stroke_width
+        return line
 
     def generate_svg_component(self)->str:
         """Generation of SVG node components.
@@ -42,6 +68,29 @@ class Line():
 
         return f'<line x1="{self._parent_node_x}" y1="{self._parent_node_y}" x2="{self._child_node_x}" y2="{self._child_node_y}" stroke="{self._stroke}" stroke-width="{self._stroke_width}" />'
 
+    def generate_classed_svg_component(self, class_name:str)->str:
+        """Generation of SVG line components styled by a class instead of presentation attributes.
+
+        Args:
+            class_name (str): [class of the line]
+
+        Returns:
+            str: [SVG line components]
+        """
+        return f'<line class="{class_name}" x1="{self._parent_node_x}" y1="{self._parent_node_y}" x2="{self._child_node_x}" y2="{self._child_node_y}"/>'
+
+    def generate_path_data(self)->str:
+        """Generation of the path data (d attribute of the path element) of the line.
+
+        Returns:
+            str: [path data]
+        """
+        return f'M{self._parent_node_x} {self._parent_node_y}L{self._child_node_x} {self._child_node_y}'
+
+    @property
+    def style(self)->Tuple[str, int]:
+        return (self._stroke, self._stroke_width)
+
     @classmethod
     def generate_svg_lines(cls, nodes_each_pahse:List[List[Node]])->str:
         """Generate a chunk of SVG line components.
@@ -52,16 +101,90 @@ class Line():
         Returns:
             str: [chunk of SVG line components.]
         """
-        line_svg = ''
+        return ''.join(cls.iter_svg_lines(nodes_each_pahse))
+
+    @classmethod
+    def iter_svg_lines(cls, nodes_each_pahse:List[List[Node]])->Iterator[str]:
+        """Generate SVG line components one by one.
+
+        Args:
+            nodes_each_pahse (list[list[Node]]): [Separate node lists for each phase]
+
+        Yields:
+            str: [SVG line component]
+        """
+        for line in cls.iter_lines(nodes_each_pahse):
+            yield line.generate_svg_component()
+
+    @classmethod
+    def generate_svg_paths(cls, nodes_each_pahse:List[List[Node]])->str:
+        """Generate SVG path components in which lines of the same style are merged.
+
+        Args:
+            nodes_each_pahse (list[list[Node]]): [Separate node lists for each phase]
+
+        Returns:
+            str: [chunk of SVG path components.]
+        """
+        return ''.join(cls.iter_svg_paths(nodes_each_pahse))
+
+    @classmethod
+    def iter_svg_paths(cls, nodes_each_pahse:List[List[Node]])->Iterator[str]:
+        """Generate one SVG path component per line style.
+
+        Args:
+            nodes_each_pahse (list[list[Node]]): [Separate node lists for each phase]
+
+        Returns:
+            Iterator[str]: [SVG path components]
+        """
+        return cls.iter_merged_svg_paths(cls.iter_lines(nodes_each_pahse))
+
+    @classmethod
+    def iter_merged_svg_paths(cls, lines:Iterable['Line'], class_name:str=None)->Iterator[str]:
+        """Merge lines of the same style into one SVG path component per style.
+
+        Args:
+            lines (Iterable[Line]): [lines]
+
+            class_name (str, optional): [class replacing the presentation attributes. All lines are merged into one path]. Defaults to None.
+
+        Yields:
+            str: [SVG path component]
+        """
+        if class_name is not None:
+            d = ''.join(line.generate_path_data() for line in lines)
+            if len(d) > 0:
+                yield f'<path class="{class_name}" d="{d}"/>'
+            return
+
+        path_data_each_style:Dict[Tuple[str, int], List[str]] = {}
+        for line in lines:
+            path_data_each_style.setdefault(line.style, []).append(line.generate_path_data())
+
+        for (stroke, stroke_width), path_data in path_data_each_style.items():
+            d = ''.join(path_data)
+            yield f'<path d="{d}" fill="none" stroke="{stroke}" stroke-width="{stroke_width}" />'
+
+    @classmethod
+    def iter_lines(cls, nodes_each_pahse:List[List[Node]])->Iterator['Line']:
+        """Generate the lines between each node and its parent nodes in the previous phase.
+
+        Args:
+            nodes_each_pahse (list[list[Node]]): [Separate node lists for each phase]
+
+        Yields:
+            Line: [line between nodes]
+        """
+        # The rows of the store are numbered in the order of the nodes.
+        store = FlowStore.from_nodes_each_phase(nodes_each_pahse)
+        nodes = [node for phase_nodes in nodes_each_pahse for node in phase_nodes]
+        phase_indexes = store.phase_indexes
+
         phase_num = len(nodes_each_pahse)
-        nodes_each_pahse.reverse()
-        for index, nodes in enumerate(nodes_each_pahse):
-            if index < (phase_num -1) :
-                for node in nodes:
-                    for parent_id in node.parent_ids:
-                        nodes_pre_phase = nodes_each_pahse[index+1]
-                        for node_pre_phase in nodes_pre_phase:
-                            if parent_id == node_pre_phase.id:
-                                line = Line(parent_node=node_pre_phase, child_node=node)
-                                line_svg = line_svg + line.generate_svg_component()
-        return line_svg
+        for index in range(phase_num-1, 0, -1):
+            for node in nodes_each_pahse[index]:
+                for parent_id in node.parent_ids:
+                    parent_row = store.get_row(parent_id)
+                    if parent_row >= 0 and phase_indexes[parent_row] == index-1:
+                        yield Line(parent_node=nodes[parent_row], child_node=node)
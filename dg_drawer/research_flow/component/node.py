@@ -5,6 +5,8 @@ class Node():
     """Node class
     """
 
+    __slots__ = ('_id', '_create_datetime', '_parent_ids', '_node_name', '_cx', '_cy', '_cr', '_fill', '_href', '_stroke', '_stroke_width')
+
     def __init__(self, id:str, parent_ids:List[str], create_datetime:int, node_name:str,cx:int=0, cy:int=0, cr:int=0, fill:str="", href:str="", stroke:str="black", stroke_width:int=1) -> None:
         """Node constructor
 
@@ -51,13 +53,35 @@ class Node():
         else:
             return f'<a href="{self._href}" target="{target}">{circle}</a>'
 
-    def get_lable_svg_component(self)->str:
+    def generate_svg_use_component(self, marker_id:str, class_name:str, target:str='_self')->str:
+        """Generation of SVG node components referring to a shared circle.
+
+        Args:
+            marker_id (str): [ID of the circle (centered on the origin) in the defs element]
+            class_name (str): [class of the node]
+            target (str, optional): [target of the link]. Defaults to '_self'.
+
+        Returns:
+            str : [SVG node components]
+        """
+        use = f'<use href="#{marker_id}" class="{class_name}" x="{self._cx}" y="{self._cy}"/>'
+        if self._href == "":
+            return use
+        else:
+            return f'<a href="{self._href}" target="{target}">{use}</a>'
+
+    def get_lable_svg_component(self, class_name:str=None)->str:
         """Get Lable's SVG component from the Node instance.
 
+        Args:
+            class_name (str, optional): [class of the label replacing the presentation attributes]. Defaults to None.
+
         Returns:
             str: [Lable's SVG component]
         """
         label = NoneLabel(value=self._node_name, x=self._cx, y=(self._cy - (self._cr + 5)))
+        if class_name is not None:
+            return label.generate_classed_svg_component(class_name)
         return label.generate_svg_component()
 
     '''
@@ -131,5 +155,7 @@ class Node():
 
 class DummyNode(Node):
 
+    __slots__ = ()
+
     def __init__(self, id:str, parent_ids:List[str], create_datetime:int, node_name:str, cx:int=0, cy:int=0, cr:int=0, fill:str="", href:str="", stroke:str="black", stroke_width:int=1) -> None:
         super().__init__(id, parent_ids, create_datetime, node_name, cx, cy, cr, fill, href, stroke, stroke_width)
\ No newline at end of file
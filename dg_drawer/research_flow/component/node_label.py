@@ -3,6 +3,8 @@ class NoneLabel():
     """NodeLabel class
     """
 
+    __slots__ = ('_value', '_x', '_y', '_text_anchor', '_font_size')
+
     def __init__(self, value: str, x:int, y:int, text_anchor:str="middle", font_size:int=12) -> None:
         """NodeLabel constructor
 
@@ -26,4 +28,15 @@ class NoneLabel():
             str: [SVG node label components.]
         """
 
-        return f'<text x="{self._x}" y="{self._y}" text-anchor="{self._text_anchor}" font-size="{self._font_size}">{self._value}</text>'
\ No newline at end of file
+        return f'<text x="{self._x}" y="{self._y}" text-anchor="{self._text_anchor}" font-size="{self._font_size}">{self._value}</text>'
+
+    def generate_classed_svg_component(self, class_name:str)->str:
+        """Generation of SVG node label components styled by a class instead of presentation attributes.
+
+        Args:
+            class_name (str): [class of the label]
+
+        Returns:
+            str: [SVG node label components.]
+        """
+        return f'<text class="{class_name}" x="{self._x}" y="{self._y}">{self._value}</text>'
\ No newline at end of file
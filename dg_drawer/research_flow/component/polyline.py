@@ -0,0 +1,67 @@
+from typing import List, Tuple
+from dg_drawer.error.error import ArgError
+
+class Polyline():
+    """Polyline class
+
+    Line between a node and its parent node several phases before, bent at virtual points in the phases between.
+    """
+
+    __slots__ = ('_points', '_stroke', '_stroke_width')
+
+    def __init__(self, points:List[Tuple[int, int]], stroke:str='gray', stroke_width:int=1) -> None:
+        """Polyline constructor
+
+        Args:
+            points (List[Tuple[int, int]]): [coordinates of the parent node, the bend points and the child node]
+
+            stroke (str, optional): [Outline colour]. Defaults to 'gray'.
+
+            stroke_width (int, optional): [Outline thickness]. Defaults to 1.
+
+        Raises:
+            ArgError: [Error if less than two points are given]
+        """
+        if len(points) < 2:
+            raise ArgError(f'A polyline needs two or more points : {len(points)}')
+        self._points = points
+        self._stroke = stroke
+        self._stroke_width = stroke_width
+
+    def generate_svg_component(self)->str:
+        """Generation of SVG polyline components.
+
+        Returns:
+            str: [SVG polyline components]
+        """
+        points = ' '.join(f'{x},{y}' for x, y in self._points)
+        return f'<polyline points="{points}" fill="none" stroke="{self._stroke}" stroke-width="{self._stroke_width}" />'
+
+    def generate_classed_svg_component(self, class_name:str)->str:
+        """Generation of SVG polyline components styled by a class instead of presentation attributes.
+
+        Args:
+            class_name (str): [class of the polyline]
+
+        Returns:
+            str: [SVG polyline components]
+        """
+        points = ' '.join(f'{x},{y}' for x, y in self._points)
+        return f'<polyline class="{class_name}" points="{points}"/>'
+
+    def generate_path_data(self)->str:
+        """Generation of the path data (d attribute of the path element) of the polyline.
+
+        Returns:
+            str: [path data]
+        """
+        (x, y), *bends = self._points
+        return f'M{x} {y}' + ''.join(f'L{x} {y}' for x, y in bends)
+
+    @property
+    def points(self)->List[Tuple[int, int]]:
+        return list(self._points)
+
+    @property
+    def style(self)->Tuple[str, int]:
+        return (self._stroke, self._stroke_width)
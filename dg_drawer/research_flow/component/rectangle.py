@@ -3,6 +3,8 @@ class Rectangle():
     """Rectangle class
     """
 
+    __slots__ = ('_x', '_y', '_width', '_height', '_fill', '_stroke', '_stroke_width', '_text', '_font_size', '_text_fill')
+
     def __init__(self, x:int, y:int, width:int, height:int, fill:str="none", text:str="", font_size:int=16, text_fill:str="black", stroke:str="black", stroke_width:int=2) -> None:
         """Rectangle constructor
 
@@ -36,4 +38,21 @@ class Rectangle():
 
             return f'<rect x="{self._x}" y="{self._y}" width="{self._width}" height="{self._height}" fill="{self._fill}" stroke="{self._stroke}" stroke-width="{self._stroke_width}" />\n<text x="{text_x}" y="{test_y}" text-anchor="middle" dominant-baseline="middle" font-size="{self._font_size}" fill="{self._text_fill}">{self._text}</text>'
         else:
-            return f'<rect x="{self._x}" y="{self._y}" width="{self._width}" height="{self._height}" fill="{self._fill}" stroke="{self._stroke}" stroke-width="{self._stroke_width}" />'
\ No newline at end of file
+            return f'<rect x="{self._x}" y="{self._y}" width="{self._width}" height="{self._height}" fill="{self._fill}" stroke="{self._stroke}" stroke-width="{self._stroke_width}" />'
+
+    def generate_classed_svg_component(self, class_name:str, text_class_name:str='')->str:
+        """Generation of SVG square components styled by classes instead of presentation attributes.
+
+        Args:
+            class_name (str): [class of the square]
+            text_class_name (str, optional): [class of the text]. Defaults to ''.
+
+        Returns:
+            str: [SVG square components]
+        """
+        rect = f'<rect class="{class_name}" x="{self._x}" y="{self._y}" width="{self._width}" height="{self._height}"/>'
+        if len(self._text) > 0:
+            text_x = self._x + (self._width / 2)
+            text_y = self._y + (self._height / 2)
+            return f'{rect}<text class="{text_class_name}" x="{text_x}" y="{text_y}">{self._text}</text>'
+        return rect
\ No newline at end of file
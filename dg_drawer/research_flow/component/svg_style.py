@@ -0,0 +1,77 @@
+from dg_drawer.research_flow.enums.color import ColorType
+
+class SvgStyle():
+    """SvgStyle class
+
+    Style sheet and shared definitions of the compact SVG data ('css' style mode).
+    The presentation attributes repeated by every element are replaced by classes, and nodes are
+    drawn with <use> elements referring to one circle in <defs>.
+    The rules only apply inside the svg element with the root class, so the SVG data can be embedded in an HTML document.
+    """
+
+    ROOT_CLASS = 'dg-rf'
+    NODE_ID = 'dg-rf-node'
+    BODY_CLASS = 'b'
+    HEADER_TEXT_CLASS = 'ht'
+    LINE_CLASS = 'l'
+    LABEL_CLASS = 't'
+    BADGE_CLASS = 'bd'
+
+    __slots__ = ('_phase_num', '_node_r')
+
+    def __init__(self, phase_num:int, node_r:int=10) -> None:
+        """SvgStyle constructor
+
+        Args:
+            phase_num (int): [number of phases]
+            node_r (int, optional): [node radius]. Defaults to 10.
+        """
+        self._phase_num = phase_num
+        self._node_r = node_r
+
+    @staticmethod
+    def get_header_class(phase_index:int)->str:
+        """Obtain the class of the header of a phase.
+
+        Args:
+            phase_index (int): [phase index]
+
+        Returns:
+            str: [class name]
+        """
+        return f'h{phase_index}'
+
+    @staticmethod
+    def get_node_class(phase_index:int)->str:
+        """Obtain the class of the nodes of a phase.
+
+        Args:
+            phase_index (int): [phase index]
+
+        Returns:
+            str: [class name]
+        """
+        return f'n{phase_index}'
+
+    def generate_svg_component(self)->str:
+        """Generation of the SVG style and defs components.
+
+        Returns:
+            str: [SVG style and defs components]
+        """
+        root = f'.{self.ROOT_CLASS}'
+        rules = [
+            f'{root} rect{{stroke:black;stroke-width:2}}',
+            f'{root} .{self.BODY_CLASS}{{fill:#ffffff}}',
+            f'{root} .{self.HEADER_TEXT_CLASS}{{text-anchor:middle;dominant-baseline:middle;font-size:16px;fill:#ffffff}}',
+            f'{root} .{self.LINE_CLASS}{{fill:none;stroke:gray;stroke-width:1}}',
+            f'{root} use{{stroke:black;stroke-width:1}}',
+            f'{root} .{self.LABEL_CLASS}{{text-anchor:middle;font-size:12px}}',
+            f'{root} rect.{self.BADGE_CLASS}{{fill:#ffffff;stroke:gray;stroke-width:1}}',
+            f'{root} text.{self.BADGE_CLASS}{{text-anchor:middle;dominant-baseline:middle;font-size:10px;fill:gray}}',
+        ]
+        for phase_index, (phase_color, node_color) in enumerate(ColorType.get_palette(self._phase_num)):
+            rules.append(f'{root} .{self.get_header_class(phase_index)}{{fill:{phase_color}}}')
+            rules.append(f'{root} .{self.get_node_class(phase_index)}{{fill:{node_color}}}')
+        style = ''.join(rules)
+        return f'<style>{style}</style><defs><circle id="{self.NODE_ID}" r="{self._node_r}"/></defs>'
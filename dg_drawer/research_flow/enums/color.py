@@ -1,8 +1,13 @@
+import colorsys
 from enum import Enum
+import threading
+from typing import List, Tuple
 from dg_drawer.error.error import EnumValueError
 
 class ColorType(Enum):
     """Colour type (enumerated type)
+
+    Colours of the first phases. The colours of the following phases are generated (see get_palette()).
     """
     GREY = (0, '#616161', '#BDBDBD')
     TEAL = (1, '#00796B', '#B2DFDB')
@@ -22,15 +27,12 @@ class ColorType(Enum):
             index (int): [colour index]
 
         Raises:
-            EnumValueError: [Error if Index not defined]
+            EnumValueError: [Error if Index is negative]
 
         Returns:
             str: [colour code]
         """
-        for e in ColorType:
-            if e.value[0] == index:
-                return e.value[1]
-        raise EnumValueError('{} is not defined in Color Class.'.format(index))
+        return _get_colors(index)[0]
 
     @classmethod
     def get_phase_node_by_index(cls, index:int):
@@ -40,12 +42,59 @@ class ColorType(Enum):
             index (int): [colour index]
 
         Raises:
-            EnumValueError: [Error if Index not defined]
+            EnumValueError: [Error if Index is negative]
 
         Returns:
             [type]: [colour code]
         """
-        for e in ColorType:
-            if e.value[0] == index:
-                return e.value[2]
+        return _get_colors(index)[1]
+
+    @classmethod
+    def get_palette(cls, phase_num:int)->List[Tuple[str, str]]:
+        """Obtain the colour codes of phases and nodes for a number of phases.
+
+        The colours of the phases after the defined colours are generated by rotating the hue by the golden angle,
+        so that adjacent phases have distinct colours for any number of phases.
+
+        Args:
+            phase_num (int): [number of phases]
+
+        Returns:
+            List[Tuple[str, str]]: [colour codes of the phase and of the nodes of each phase]
+        """
+        with _PALETTE_LOCK:
+            while len(_PALETTE) < phase_num:
+                _PALETTE.append(_generate_colors(len(_PALETTE)))
+        return _PALETTE[:phase_num]
+
+
+def _generate_colors(index:int)->Tuple[str, str]:
+    """Generate the colour codes of a phase and its nodes.
+
+    Args:
+        index (int): [colour index]
+
+    Returns:
+        Tuple[str, str]: [colour codes of the phase and of the nodes]
+    """
+    # Golden angle (degrees) from the hue of the last defined colour
+    hue = ((index - len(ColorType)) * 137.508 + 30.0) % 360.0 / 360.0
+    return (_to_color_code(colorsys.hls_to_rgb(hue, 0.38, 0.65)), _to_color_code(colorsys.hls_to_rgb(hue, 0.85, 0.65)))
+
+
+def _to_color_code(rgb:Tuple[float, float, float])->str:
+    return '#' + ''.join(f'{round(value * 255):02X}' for value in rgb)
+
+
+def _get_colors(index:int)->Tuple[str, str]:
+    if index < 0:
         raise EnumValueError('{} is not defined in Color Class.'.format(index))
+    if index < len(_PALETTE):
+        return _PALETTE[index]
+    # Only get_palette() extends the table, so an arbitrary index does not grow it.
+    return _generate_colors(index)
+
+
+# Lookup table of the colour codes of the phases and of the nodes by colour index, extended by get_palette() up to the number of phases drawn
+_PALETTE:List[Tuple[str, str]] = [color.value[1:] for color in sorted(ColorType, key=lambda color: color.value[0])]
+_PALETTE_LOCK = threading.Lock()
@@ -0,0 +1,167 @@
+from typing import Any, Dict, List, Tuple
+
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow.flow_drawer import FlowDrawer
+from dg_drawer.research_flow.flow_layout import FlowLayout
+from dg_drawer.research_flow.layout_renderer import SvgRenderer
+from dg_drawer.research_flow.research_flow_status import PhaseStatus
+
+# Version of the patches. Change it when the keys or the meaning of the operations change.
+PATCH_FORMAT_VERSION = 1
+
+
+class FlowDiff():
+    """FlowDiff class
+
+    Structural difference between the layouts of two versions of a research flow history :
+    added, removed and moved nodes and lines, and changes of the frame and of the image size.
+
+    get_patch() gives the difference as a compact patch of the SVG data drawn by a renderer with element IDs,
+    which a client applies to the SVG DOM of the old version :
+
+    * 'width' and 'height' : new size of the svg element (only if the size changed).
+    * 'remove' : IDs of the elements to remove.
+    * 'replace' : SVG component of each changed element by ID (the element group '<prefix>frame' when the frame changed).
+    * 'add' : element group ID and SVG component of each added element, to append to the element group.
+    """
+
+    def __init__(self, old_layout:FlowLayout, new_layout:FlowLayout, renderer:SvgRenderer=None) -> None:
+        """FlowDiff constructor
+
+        Args:
+            old_layout (FlowLayout): [layout of the old version]
+
+            new_layout (FlowLayout): [layout of the new version]
+
+            renderer (SvgRenderer, optional): [renderer with element IDs drawing the SVG data of the client]. Defaults to None (SvgRenderer(element_id_prefix='')).
+
+        Raises:
+            ArgError: [Error if the renderer has no element ID prefix]
+        """
+        if renderer is None:
+            renderer = SvgRenderer(element_id_prefix='')
+        if renderer.element_id_prefix is None:
+            raise ArgError('The renderer of a diff must have an element ID prefix')
+        self._old_layout = old_layout
+        self._new_layout = new_layout
+        self._renderer = renderer
+
+        old_nodes = {node[0]: node[1:] for node in old_layout.iter_nodes()}
+        new_nodes = {node[0]: node[1:] for node in new_layout.iter_nodes()}
+        self._added_nodes = [id for id in new_nodes if id not in old_nodes]
+        self._removed_nodes = [id for id in old_nodes if id not in new_nodes]
+        # name, link, phase index, cx, cy
+        self._moved_nodes = [id for id, node in new_nodes.items() if id in old_nodes and old_nodes[id][2:] != node[2:]]
+        self._changed_nodes = [id for id, node in new_nodes.items() if id in old_nodes and old_nodes[id][:2] != node[:2]]
+
+        old_edges = {(parent_id, child_id): points for parent_id, child_id, points in old_layout.iter_edges()}
+        new_edges = {(parent_id, child_id): points for parent_id, child_id, points in new_layout.iter_edges()}
+        self._added_edges = [key for key in new_edges if key not in old_edges]
+        self._removed_edges = [key for key in old_edges if key not in new_edges]
+        self._moved_edges = [key for key, points in new_edges.items() if key in old_edges and old_edges[key] != points]
+
+        self._frame_changed = (old_layout.phase_names, old_layout.phase_width, old_layout.header_height, old_layout.body_height) \
+                              != (new_layout.phase_names, new_layout.phase_width, new_layout.header_height, new_layout.body_height)
+        self._size_changed = (old_layout.width, old_layout.height) != (new_layout.width, new_layout.height)
+
+    @classmethod
+    def from_research_flow_status(cls, old_research_flow_status:List[PhaseStatus], new_research_flow_status:List[PhaseStatus],
+                                  renderer:SvgRenderer=None, **drawer_options)->'FlowDiff':
+        """Lay out two versions of a research flow history and calculate their difference.
+
+        Args:
+            old_research_flow_status (List[PhaseStatus]): [research flow status of the old version]
+
+            new_research_flow_status (List[PhaseStatus]): [research flow status of the new version]
+
+            renderer (SvgRenderer, optional): [renderer with element IDs drawing the SVG data of the client]. Defaults to None (SvgRenderer(element_id_prefix='')).
+
+            drawer_options : [layout options of FlowDrawer (whole_max_width, header_height, ...)]
+
+        Raises:
+            ArgError: [Error if a version is not valid, an option is not supported or the renderer has no element ID prefix]
+
+        Returns:
+            FlowDiff: [difference between the versions]
+        """
+        old_layout = FlowDrawer(research_flow_status=old_research_flow_status, **drawer_options).layout()
+        new_layout = FlowDrawer(research_flow_status=new_research_flow_status, **drawer_options).layout()
+        return cls(old_layout, new_layout, renderer)
+
+    def get_patch(self)->Dict[str, Any]:
+        """Obtain the patch turning the SVG data of the old version into the SVG data of the new version.
+        Applying the patch to the DOM gives the elements of renderer.render(new_layout).
+
+        Returns:
+            Dict[str, Any]: [patch (JSON serializable data)]
+        """
+        renderer = self._renderer
+        patch:Dict[str, Any] = {'version': PATCH_FORMAT_VERSION}
+        if self._size_changed:
+            patch['width'] = self._new_layout.width
+            patch['height'] = self._new_layout.height
+
+        remove:List[str] = []
+        replace:Dict[str, str] = {}
+        add:List[Tuple[str, str]] = []
+        old_frame = renderer.get_svg_frame_group(self._old_layout)
+        new_frame = renderer.get_svg_frame_group(self._new_layout)
+        if old_frame != new_frame:
+            replace[renderer.get_element_id('frame')] = new_frame
+
+        # Elements are compared without their IDs, so only the IDs of the elements of the patch are calculated.
+        for layer in renderer.LAYERS:
+            group_id = renderer.get_element_id(layer)
+            old_components = dict(renderer.iter_layer_components(self._old_layout, layer))
+            for key, svg in renderer.iter_layer_components(self._new_layout, layer):
+                old_svg = old_components.pop(key, None)
+                if old_svg is None:
+                    add.append((group_id, renderer.set_element_id(svg, renderer.get_element_id(*key))))
+                elif old_svg != svg:
+                    element_id = renderer.get_element_id(*key)
+                    replace[element_id] = renderer.set_element_id(svg, element_id)
+            remove.extend(renderer.get_element_id(*key) for key in old_components)
+
+        patch['remove'] = remove
+        patch['replace'] = replace
+        patch['add'] = add
+        return patch
+
+    '''
+    getter
+    '''
+    @property
+    def added_nodes(self)->List[str]:
+        return self._added_nodes
+
+    @property
+    def removed_nodes(self)->List[str]:
+        return self._removed_nodes
+
+    @property
+    def moved_nodes(self)->List[str]:
+        return self._moved_nodes
+
+    @property
+    def changed_nodes(self)->List[str]:
+        return self._changed_nodes
+
+    @property
+    def added_edges(self)->List[Tuple[str, str]]:
+        return self._added_edges
+
+    @property
+    def removed_edges(self)->List[Tuple[str, str]]:
+        return self._removed_edges
+
+    @property
+    def moved_edges(self)->List[Tuple[str, str]]:
+        return self._moved_edges
+
+    @property
+    def frame_changed(self)->bool:
+        return self._frame_changed
+
+    @property
+    def size_changed(self)->bool:
+        return self._size_changed
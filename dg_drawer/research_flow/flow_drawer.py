@@ -1,14 +1,37 @@
+from array import array
+import asyncio
+import codecs
+from concurrent.futures import Executor
+from contextlib import nullcontext
+import hashlib
+import io
+import itertools
+import json
 import math
-from typing import List
-from copy import deepcopy
-import uuid
+import os
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+from dg_drawer.error.error import ArgError
 from dg_drawer.research_flow.component.node import Node, DummyNode
 from dg_drawer.research_flow.component.line import Line
+from dg_drawer.research_flow.component.polyline import Polyline
 from dg_drawer.research_flow.component.frame import Frame
-from dg_drawer.research_flow.enums.color import ColorType
+from dg_drawer.research_flow.component.svg_style import SvgStyle
+from dg_drawer.research_flow.flow_layout import FlowLayout
+from dg_drawer.research_flow.flow_store import FlowStore
+from dg_drawer.research_flow.flow_viewport import FlowViewport
+from dg_drawer.research_flow.layer_ordering import LayerOrdering
+from dg_drawer.research_flow.layout_renderer import JsonRenderer, SvgRenderer
+from dg_drawer.research_flow.level_of_detail import FlowSummary, LevelOfDetail
+from dg_drawer.research_flow.render_cache import RenderCache, get_fingerprint
+from dg_drawer.research_flow.render_stats import RenderStats
+from dg_drawer.research_flow.status_validator import StatusValidator
+from dg_drawer.research_flow.svg_codec import iter_compressed
 from dg_drawer.research_flow.research_flow_status import PhaseStatus, SubFlowStatus
 
+# Context of the drawing stages without stats
+_NO_STAGE = nullcontext()
+
 
 class FlowDrawer():
     """FlowDrawer class
@@ -16,7 +39,12 @@ class FlowDrawer():
     This class manipulates the drawing of Research Flow Status images (SVG).
     """
 
-    def __init__(self, research_flow_status:List[PhaseStatus], whole_max_width:int=900, header_height:int=100, top_margin:int=50, bottom_margin:int=50, between_node_vertical_length:int=100 ) -> None:
+    LINE_MODES = SvgRenderer.LINE_MODES
+    LONG_EDGE_MODES = SvgRenderer.LONG_EDGE_MODES
+    STYLE_MODES = SvgRenderer.STYLE_MODES
+    ORDERINGS = ('parent',) + LayerOrdering.METHODS
+
+    def __init__(self, research_flow_status:List[PhaseStatus], whole_max_width:int=900, header_height:int=100, top_margin:int=50, bottom_margin:int=50, between_node_vertical_length:int=100, line_mode:str='line', long_edge_mode:str='dummy', style_mode:str='inline', ordering:str='parent', ordering_iterations:int=4, lod:LevelOfDetail=None, cache:RenderCache=None, stats:RenderStats=None) -> None:
         """FlowDrawer constructor
 
         Args:
@@ -31,7 +59,36 @@ class FlowDrawer():
             bottom_margin (int, optional): [Distance of the node from the lowest horizontal edge in the body part of the Research Flow History Image]. Defaults to 50.
 
             between_node_vertical_length (int, optional): [Distance between vertical nodes]. Defaults to 100.
+
+            line_mode (str, optional): [Drawing of inter-node lines. 'line' : one line element per line, 'path' : one path element per line style]. Defaults to 'line'.
+
+            long_edge_mode (str, optional): [Drawing of lines to parent nodes two or more phases before. 'dummy' : invisible dummy nodes in the phases between, joined by lines,
+                                            'polyline' : one polyline per line, bent at the reserved positions of the phases between (no dummy node is drawn)]. Defaults to 'dummy'.
+
+            style_mode (str, optional): [Styling of the elements. 'inline' : presentation attributes on every element,
+                                        'css' : compact SVG data with a style sheet of classes, nodes referring to a shared circle and no invisible element (see SvgStyle)].
+                                        Defaults to 'inline'.
+
+            ordering (str, optional): [Order of the nodes of each phase. 'parent' : grouped by the first parent in the previous phase, in order of creation datetime,
+                                      'barycenter' or 'median' : reordered from the 'parent' order to reduce line crossings (see LayerOrdering)]. Defaults to 'parent'.
+
+            ordering_iterations (int, optional): [Maximum number of sweeps of the 'barycenter' and 'median' orderings]. Defaults to 4.
+
+            lod (LevelOfDetail, optional): [Level of detail summarizing large phases and linear chains of sub flows]. Defaults to None (every sub flow is drawn).
+
+            cache (RenderCache, optional): [Cache of the layout (keyed by the layout fingerprint) and the SVG data (keyed by the fingerprint)]. Defaults to None.
+
+            stats (RenderStats, optional): [Statistics recording the duration of each drawing stage and the numbers of nodes, lines and output bytes].
+                                           Defaults to None (nothing is recorded).
+
+        Raises:
+            ArgError: [Error if line_mode, long_edge_mode, style_mode or ordering is not supported, or ordering_iterations is negative]
         """
+        self._renderer = SvgRenderer(line_mode=line_mode, long_edge_mode=long_edge_mode, style_mode=style_mode)
+        if ordering not in self.ORDERINGS:
+            raise ArgError(f'Unsupported ordering [{ordering}]. Supported orderings : {list(self.ORDERINGS)}')
+        if ordering_iterations < 0:
+            raise ArgError(f'ordering_iterations must be 0 or more : {ordering_iterations}')
 
         self._research_flow_status = research_flow_status
         self._whole_max_width = whole_max_width
@@ -39,6 +96,75 @@ class FlowDrawer():
         self._top_margin = top_margin
         self._bottom_margin = bottom_margin
         self._between_node_vertical_length = between_node_vertical_length
+        self._line_mode = line_mode
+        self._long_edge_mode = long_edge_mode
+        self._style_mode = style_mode
+        self._ordering = ordering
+        self._ordering_iterations = ordering_iterations
+        self._lod = lod
+        self._summary:Optional[FlowSummary] = None
+        self._cache = cache
+        self._stats = stats
+
+    def get_options(self)->Dict[str, Any]:
+        """Obtain the drawing options which change the layout or the SVG data.
+
+        Returns:
+            Dict[str, Any]: [drawing options]
+        """
+        return dict(self.get_layout_options(), line_mode=self._line_mode, style_mode=self._style_mode)
+
+    def get_layout_options(self)->Dict[str, Any]:
+        """Obtain the drawing options which change the layout (placement of the nodes).
+        The options only used to render the layout (line_mode, style_mode) are left out.
+
+        Returns:
+            Dict[str, Any]: [drawing options of the layout]
+        """
+        return {
+            'whole_max_width': self._whole_max_width,
+            'header_height': self._header_height,
+            'top_margin': self._top_margin,
+            'bottom_margin': self._bottom_margin,
+            'between_node_vertical_length': self._between_node_vertical_length,
+            'long_edge_mode': self._long_edge_mode,
+            'ordering': self._ordering,
+            'ordering_iterations': self._ordering_iterations,
+            'lod': None if self._lod is None else self._lod.get_options(),
+        }
+
+    def fingerprint(self)->str:
+        """Calculate the fingerprint of the research flow status and the drawing options, without drawing.
+
+        The same fingerprint gives the same SVG data. It can be used as a cache key or an ETag.
+
+        Returns:
+            str: [fingerprint (SHA-256 hex digest)]
+        """
+        return get_fingerprint(self._research_flow_status, self.get_options())
+
+    def layout_fingerprint(self)->str:
+        """Calculate the fingerprint of the research flow status and the drawing options of the layout, without drawing.
+
+        The same fingerprint gives the same layout, whatever the options of its rendering. The cache keys the layouts with it.
+
+        Returns:
+            str: [fingerprint (SHA-256 hex digest)]
+        """
+        return get_fingerprint(self._research_flow_status, self.get_layout_options())
+
+    def _stage(self, name:str)->ContextManager:
+        """Obtain the context recording a drawing stage.
+
+        Args:
+            name (str): [stage name]
+
+        Returns:
+            ContextManager: [context recording the stage, or a context doing nothing without stats]
+        """
+        if self._stats is None:
+            return _NO_STAGE
+        return self._stats.stage(name)
 
     def pack_svg_tag(self, frame:str, line:str, node:str, node_label:str,  height:int, width:int)->str:
         """Package three SVG data (frame, line, node, node label) into an SVG tag
@@ -103,16 +229,8 @@ class FlowDrawer():
             node.cy = start_y
             # Set X-coordinate
             node.cx = node_x
-            # Set radius
-            node.cr = node_r
-
-            if type(node) is DummyNode:
-                node.fill = 'none'
-                node._stroke = 'none'
-                node._stroke_width = 0
-            else:
-                # Set color
-                node.fill = ColorType.get_phase_node_by_index(color_index)
+            # Set radius and color
+            self.style_node(node=node, color_index=color_index, node_r=node_r)
 
             positioned_nodes.append(node)
                 # Update of initial X-coordinates
@@ -120,6 +238,49 @@ class FlowDrawer():
 
         return positioned_nodes
 
+    def style_node(self, node:Node, color_index:int, node_r:int=10)->Node:
+        """Set the radius and colour of a node. Dummy nodes are made invisible (see SvgRenderer.style_node()).
+
+        Args:
+            node (Node): [node]
+            color_index (int): [color index of the node being drawn.]
+            node_r (int, optional): [node radius]. Defaults to 10.
+
+        Returns:
+            Node: [Updated node]
+        """
+        return SvgRenderer.style_node(node=node, color_index=color_index, node_r=node_r)
+
+    def set_row_locations(self, store:FlowStore):
+        """Set the coordinates in the SVG to each row of the store, in the order of the rows of each phase.
+
+        Args:
+            store (FlowStore): [store of the nodes]
+        """
+        for index in range(store.phase_num):
+            self.set_phase_row_locations(store, index)
+
+    def set_phase_row_locations(self, store:FlowStore, phase_index:int):
+        """Set the coordinates in the SVG to each row of a phase, in the order of the rows.
+
+        Args:
+            store (FlowStore): [store of the nodes]
+            phase_index (int): [phase index]
+        """
+        phase_num = store.phase_num
+        # Calculation of horizontal node spacing length
+        between_node_horizontal_length = math.floor(self._whole_max_width / phase_num)
+        # Calculate initial coordinates.
+        node_x = math.floor(self._whole_max_width / phase_num / 2) + (between_node_horizontal_length * phase_index)
+        node_y = self._header_height + self._top_margin
+
+        cx = store.cx
+        cy = store.cy
+        for row in store.phase_rows[phase_index]:
+            cx[row] = node_x
+            cy[row] = node_y
+            node_y += self._between_node_vertical_length
+
     def calculate_body_height(self, nodes_each_phase:List[List[Node]])->int:
         """Calculate the height of the body part of the research flow history image.
 
@@ -151,163 +312,719 @@ class FlowDrawer():
         Returns:
             str: [research flow history as SVG data]
         """
+        return ''.join(self.iter_svg())
+
+    async def adraw(self, executor:Executor=None)->str:
+        """Drawing research flow history as SVG data in an executor, without blocking the event loop
+
+        Args:
+            executor (Executor, optional): [executor running draw(). With a process pool, the drawer must be picklable (no cache)].
+                                           Defaults to None (default executor of the event loop).
+
+        Returns:
+            str: [research flow history as SVG data]
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.draw)
+
+    def iter_svg(self)->Iterator[str]:
+        """Drawing research flow history as SVG data fragments
+
+        The layout is calculated first, then the SVG data is yielded piece by piece
+        (svg start tag, style sheet in the 'css' style mode, frame, lines, nodes, node labels and svg end tag) without building the whole document.
+        If a cache is set, the whole SVG data is yielded at once from the cache.
+
+        Yields:
+            str: [fragment of research flow history SVG data]
+        """
+        if self._stats is None:
+            yield from self._iter_cached_svg()
+            return
+
+        stats = self._stats
+        for fragment in self._iter_cached_svg():
+            stats.add_count('output_bytes', len(fragment.encode('utf-8')))
+            yield fragment
+
+    def iter_svg_document(self, encoding:str='utf-8')->Iterator[str]:
+        """Drawing research flow history as fragments of a standalone SVG document (ex. .svg file, image/svg+xml response)
+
+        Unlike the SVG data of iter_svg() (embedded in HTML), the svg element declares the SVG namespace,
+        and the document starts with an XML declaration of the encoding if it is not UTF-8.
+
+        Args:
+            encoding (str, optional): [encoding of the document]. Defaults to 'utf-8'.
+
+        Raises:
+            LookupError: [Error if the encoding is not known]
+
+        Yields:
+            str: [fragment of research flow history SVG document]
+        """
+        if codecs.lookup(encoding).name != 'utf-8':
+            yield f'<?xml version="1.0" encoding="{encoding}"?>\n'
+        fragments = self.iter_svg()
+        yield self._renderer.add_namespace(next(fragments))
+        yield from fragments
+
+    def _iter_cached_svg(self)->Iterator[str]:
+        """Drawing research flow history as SVG data fragments, through the cache if it is set.
+
+        Yields:
+            str: [fragment of research flow history SVG data]
+        """
+        if self._cache is None:
+            yield from self._iter_svg()
+            return
+
+        with self._stage('fingerprint'):
+            key = self.fingerprint()
+        svg = self._cache.get_svg(key)
+        if svg is None:
+            svg = ''.join(self._iter_svg())
+            self._cache.put_svg(key, svg)
+        elif self._stats is not None:
+            self._stats.add_count('svg_cache_hits')
+        yield svg
+
+    def _iter_svg(self)->Iterator[str]:
+        """Drawing research flow history as SVG data fragments
+
+        Yields:
+            str: [fragment of research flow history SVG data]
+        """
+        yield from self._renderer.iter_svg(self.layout(), self._stage)
+
+    def layout(self, key:str=None)->FlowLayout:
+        """Lay out the research flow history, to draw it with one or more renderers (SvgRenderer, JsonRenderer) without repeating the layout work.
+
+        If a cache is set, the layout is obtained from the cache or stored to it.
+
+        Args:
+            key (str, optional): [layout fingerprint (see layout_fingerprint()), if already calculated]. Defaults to None.
+
+        Raises:
+            ArgError: [Error if a sub flow ID is duplicated, or a parent ID is not found in the previous phases]
+
+        Returns:
+            FlowLayout: [layout of the research flow history]
+        """
+        store, phase_width, body_height = self.layout_store(key)
+        return FlowLayout(store, self._research_flow_status, phase_width, self._header_height, body_height, self.get_badges(store))
+
+    def get_renderer(self)->SvgRenderer:
+        """Obtain the SVG renderer of the line mode, the long edge mode and the style mode of the drawer.
+
+        Returns:
+            SvgRenderer: [SVG renderer]
+        """
+        return self._renderer
+
+    def get_badges(self, store:FlowStore)->List[Tuple[str, int, int]]:
+        """Obtain the badges of the chains compressed by the level of detail.
+        Each badge is on the line from the child of the chain to the previous phase.
+
+        Args:
+            store (FlowStore): [store of the positioned nodes]
+
+        Returns:
+            List[Tuple[str, int, int]]: [value and coordinates of each badge]
+        """
+        summary = self.get_summary()
+        if summary is None:
+            return []
+        phase_indexes = store.phase_indexes
+        cx = store.cx
+        cy = store.cy
+        badges = []
+        for parent_id, child_id, hidden_num in summary.badges:
+            row = store.get_row(child_id)
+            parent_row = store.get_row(parent_id)
+            phase_index = phase_indexes[row]
+            if phase_indexes[parent_row] < phase_index-1:
+                parent_row = store.get_row(self.get_dummy_id(parent_id, child_id, phase_index-1))
+            badges.append((f'+{hidden_num}', (cx[parent_row] + cx[row]) // 2, (cy[parent_row] + cy[row]) // 2))
+        return badges
+
+    def iter_svg_badges(self, store:FlowStore)->Iterator[str]:
+        """Generate SVG data of the badges of the chains compressed by the level of detail.
+
+        Args:
+            store (FlowStore): [store of the positioned nodes]
+
+        Yields:
+            str: [SVG badge component]
+        """
+        return self._renderer.iter_svg_badges(self.get_badges(store))
+
+    def get_svg_start_tag(self, width:int, height:int, view_box:Tuple[int, int, int, int]=None)->str:
+        """Obtain the svg start tag.
+
+        Args:
+            width (int): [width of the image]
+            height (int): [height of the image]
+            view_box (Tuple[int, int, int, int], optional): [x, y, width and height of the drawn area]. Defaults to None (whole image).
+
+        Returns:
+            str: [svg start tag]
+        """
+        return self._renderer.get_svg_start_tag(width, height, view_box)
+
+    def get_style(self, phase_num:int)->Optional[SvgStyle]:
+        """Obtain the style sheet of the 'css' style mode.
+
+        Args:
+            phase_num (int): [number of phases]
+
+        Returns:
+            Optional[SvgStyle]: [style sheet. None in the 'inline' style mode]
+        """
+        return self._renderer.get_style(phase_num)
+
+    def iter_svg_frame(self, phase_width:int, body_height:int, phase_indexes:Iterable[int]=None, headers:bool=True, bodies:bool=True)->Iterator[str]:
+        """Generate SVG data of the frame (header + body) according to the style mode.
+
+        Args:
+            phase_width (int): [phase width]
+            body_height (int): [height of the body part]
+            phase_indexes (Iterable[int], optional): [indexes of the drawn phases]. Defaults to None (every phase).
+            headers (bool, optional): [False not to draw the headers]. Defaults to True.
+            bodies (bool, optional): [False not to draw the bodies]. Defaults to True.
+
+        Yields:
+            str: [SVG header or body component]
+        """
+        return self._renderer.iter_svg_frame(self.get_frame(phase_width, body_height), phase_indexes, headers, bodies)
+
+    def iter_phase_svg_nodes(self, store:FlowStore, phase_index:int, start:int=0, stop:int=None)->Iterator[str]:
+        """Generate SVG data of the nodes of a phase according to the style mode.
+
+        Args:
+            store (FlowStore): [store of the positioned nodes]
+            phase_index (int): [phase index]
+            start (int, optional): [index of the first row in the rows of the phase]. Defaults to 0.
+            stop (int, optional): [index after the last row in the rows of the phase]. Defaults to None (last row).
+
+        Yields:
+            str: [SVG node component]
+        """
+        return self._renderer.iter_phase_svg_nodes(store, phase_index, start, stop)
+
+    def iter_phase_svg_labels(self, store:FlowStore, phase_index:int, start:int=0, stop:int=None)->Iterator[str]:
+        """Generate SVG data of the node labels of a phase according to the style mode.
+        Empty labels are not generated in the 'css' style mode.
+
+        Args:
+            store (FlowStore): [store of the positioned nodes]
+            phase_index (int): [phase index]
+            start (int, optional): [index of the first row in the rows of the phase]. Defaults to 0.
+            stop (int, optional): [index after the last row in the rows of the phase]. Defaults to None (last row).
+
+        Yields:
+            str: [SVG node label component]
+        """
+        return self._renderer.iter_phase_svg_labels(store, phase_index, start, stop)
+
+    def get_frame(self, phase_width:int, body_height:int)->Frame:
+        """Obtain the frame (header + body) of the research flow history image.
+
+        Args:
+            phase_width (int): [phase width]
+            body_height (int): [height of the body part]
+
+        Returns:
+            Frame: [frame]
+        """
+        return Frame(phase_list=self._research_flow_status, phase_width=phase_width, header_height=self._header_height, body_height=body_height)
+
+    def iter_svg_lines(self, lines:Iterable[Union[Line, Polyline]])->Iterator[str]:
+        """Generate SVG data of inter-node lines according to the line mode.
+
+        Args:
+            lines (Iterable[Union[Line, Polyline]]): [lines]
+
+        Yields:
+            str: [SVG line or path component]
+        """
+        return self._renderer.iter_svg_lines(lines)
+
+    def iter_row_nodes(self, store:FlowStore)->Iterator[Node]:
+        """Generate the positioned node instances (views of the rows) of every phase.
+
+        Args:
+            store (FlowStore): [store of the positioned nodes]
+
+        Yields:
+            Node: [positioned node]
+        """
+        for index in range(store.phase_num):
+            yield from self.iter_phase_row_nodes(store, index)
+
+    def iter_phase_row_nodes(self, store:FlowStore, phase_index:int, start:int=0, stop:int=None)->Iterator[Node]:
+        """Generate the positioned node instances (views of the rows) of a phase.
+
+        Args:
+            store (FlowStore): [store of the positioned nodes]
+            phase_index (int): [phase index]
+            start (int, optional): [index of the first row in the rows of the phase]. Defaults to 0.
+            stop (int, optional): [index after the last row in the rows of the phase]. Defaults to None (last row).
+
+        Yields:
+            Node: [positioned node. Dummy nodes are not generated in the 'polyline' long edge mode and the 'css' style mode]
+        """
+        return self._renderer.iter_phase_row_nodes(store, phase_index, start, stop)
+
+    def iter_row_lines(self, store:FlowStore)->Iterator[Union[Line, Polyline]]:
+        """Generate the lines between each row and its parent rows in the previous phase.
+
+        Args:
+            store (FlowStore): [store of the positioned nodes]
+
+        Yields:
+            Union[Line, Polyline]: [line between nodes]
+        """
+        return self._renderer.iter_row_lines(store)
+
+    def iter_phase_row_lines(self, store:FlowStore, phase_index:int)->Iterator[Union[Line, Polyline]]:
+        """Generate the lines between each row of a phase and its parent rows in the previous phase.
+
+        In the 'polyline' long edge mode, a chain of dummy rows is drawn as one polyline from the parent row,
+        generated with the lines of the phase of the child row.
+
+        Args:
+            store (FlowStore): [store of the positioned nodes]
+            phase_index (int): [phase index]
+
+        Yields:
+            Union[Line, Polyline]: [line between nodes]
+        """
+        return self._renderer.iter_phase_row_lines(store, phase_index)
+
+    def viewport(self)->FlowViewport:
+        """Lay out the research flow history once to draw windows (tiles) of it.
+
+        Raises:
+            ArgError: [Error if a sub flow ID is duplicated, or a parent ID is not found in the previous phases]
+
+        Returns:
+            FlowViewport: [viewport drawing windows of the research flow history]
+        """
+        store, phase_width, body_height = self.layout_store()
+        return FlowViewport(self, store, phase_width, body_height)
+
+    def draw_bytes(self, encoding:str='utf-8', codec:str=None)->bytes:
+        """Drawing research flow history as an encoded (and compressed) standalone SVG document (see iter_svg_document())
+
+        Args:
+            encoding (str, optional): [encoding of the SVG data]. Defaults to 'utf-8'.
+
+            codec (str, optional): [codec compressing the SVG data (see svg_codec). ex. 'gzip' for .svgz files]. Defaults to None (no compression).
+
+        Raises:
+            ArgError: [Error if the codec is not supported]
+
+        Returns:
+            bytes: [research flow history as SVG data]
+        """
+        return b''.join(self.iter_bytes(encoding=encoding, codec=codec))
+
+    def iter_bytes(self, encoding:str='utf-8', codec:str=None, buffer_size:int=65536)->Iterator[bytes]:
+        """Drawing research flow history as chunks of an encoded (and compressed) standalone SVG document (see iter_svg_document())
+
+        The SVG data is encoded and compressed chunk by chunk, so that the whole uncompressed SVG data is never held in memory.
+
+        Args:
+            encoding (str, optional): [encoding of the SVG data]. Defaults to 'utf-8'.
+
+            codec (str, optional): [codec compressing the SVG data (see svg_codec). ex. 'gzip' for .svgz files]. Defaults to None (no compression).
+
+            buffer_size (int, optional): [number of characters encoded at once]. Defaults to 65536.
+
+        Raises:
+            ArgError: [Error if the codec is not supported]
+
+        Yields:
+            bytes: [chunk of research flow history SVG data]
+        """
+        # Characters which the encoding cannot represent are written as XML character references.
+        chunks = (chunk.encode(encoding, 'xmlcharrefreplace') for chunk in self._iter_chunks(self.iter_svg_document(encoding), buffer_size))
+        if codec is None:
+            yield from chunks
+            return
+
+        for data in iter_compressed(chunks, codec):
+            if self._stats is not None:
+                self._stats.add_count('compressed_bytes', len(data))
+            yield data
+
+    def save(self, path:str, encoding:str='utf-8', codec:str=None)->int:
+        """Write research flow history to a file as a standalone SVG document (see iter_svg_document())
+
+        Args:
+            path (str): [file path. The SVG data is compressed with gzip if the extension is '.svgz' and no codec is given]
+
+            encoding (str, optional): [encoding of the SVG data]. Defaults to 'utf-8'.
+
+            codec (str, optional): [codec compressing the SVG data (see svg_codec)]. Defaults to None.
+
+        Raises:
+            ArgError: [Error if the codec is not supported]
+
+        Returns:
+            int: [number of bytes written]
+        """
+        if codec is None and os.fspath(path).lower().endswith('.svgz'):
+            codec = 'gzip'
+        # The codec is checked before the file is created.
+        chunks = self.iter_bytes(encoding=encoding, codec=codec)
+        first_chunk = next(chunks, b'')
+        written = 0
+        with open(path, 'wb') as f:
+            for data in itertools.chain((first_chunk,), chunks):
+                f.write(data)
+                written += len(data)
+        return written
+
+    def draw_to(self, stream, encoding:str='utf-8', buffer_size:int=65536, codec:str=None)->int:
+        """Write research flow history to a stream as a standalone SVG document (see iter_svg_document())
+
+        Fragments are gathered into chunks of about buffer_size characters before being written,
+        so that the whole SVG data is never held in memory.
+
+        Args:
+            stream : [text file object, binary file object or socket]
+
+            encoding (str, optional): [encoding used for binary file objects and sockets]. Defaults to 'utf-8'.
+
+            buffer_size (int, optional): [number of characters written at once]. Defaults to 65536.
+
+            codec (str, optional): [codec compressing the SVG data written to binary file objects and sockets (see svg_codec)].
+                                   Defaults to None (no compression).
+
+        Raises:
+            ArgError: [Error if the stream type is not supported, a codec is given for a text stream or the codec is not supported]
+
+        Returns:
+            int: [number of characters (text stream) or bytes (binary stream, socket) written. With a codec, number of compressed bytes]
+        """
+        if hasattr(stream, 'write'):
+            if isinstance(stream, io.TextIOBase):
+                write = stream.write
+                encode = False
+            elif isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+                write = stream.write
+                encode = True
+            else:
+                write = stream.write
+                encode = None # Decided by the first write
+        elif hasattr(stream, 'sendall'):
+            write = stream.sendall
+            encode = True
+        else:
+            raise ArgError(f'Unsupported stream type [{type(stream).__name__}]')
+
+        written = 0
+        if codec is not None:
+            if encode is False:
+                raise ArgError(f'Compressed SVG data cannot be written to a text stream [{type(stream).__name__}]')
+            for data in self.iter_bytes(encoding=encoding, codec=codec, buffer_size=buffer_size):
+                write(data)
+                written += len(data)
+            return written
+
+        if encode is False:
+            # The document declares the encoding of the text stream.
+            encoding = getattr(stream, 'encoding', None) or encoding
+        for chunk in self._iter_chunks(self.iter_svg_document(encoding), buffer_size):
+            if encode is None:
+                try:
+                    write(chunk)
+                    encode = False
+                    written += len(chunk)
+                    continue
+                except TypeError:
+                    encode = True
+            if encode:
+                data = chunk.encode(encoding, 'xmlcharrefreplace')
+                write(data)
+                written += len(data)
+            else:
+                write(chunk)
+                written += len(chunk)
+        return written
+
+    def _iter_chunks(self, fragments:Iterable[str], buffer_size:int)->Iterator[str]:
+        """Gather SVG data fragments into chunks of about buffer_size characters.
+
+        Args:
+            fragments (Iterable[str]): [SVG data fragments]
+            buffer_size (int): [size of a chunk (characters)]
+
+        Yields:
+            str: [chunk of research flow history SVG data]
+        """
+        buffer = []
+        buffered_size = 0
+        for fragment in fragments:
+            buffer.append(fragment)
+            buffered_size += len(fragment)
+            if buffered_size >= buffer_size:
+                yield ''.join(buffer)
+                buffer = []
+                buffered_size = 0
+        if buffer:
+            yield ''.join(buffer)
+
+    def layout_store(self, key:str=None)->Tuple[FlowStore, int, int]:
+        """Calculate the drawing position of every node in the research flow history.
+
+        If a cache is set, the layout is obtained from the cache or stored to it.
+
+        Args:
+            key (str, optional): [layout fingerprint (see layout_fingerprint()), if already calculated]. Defaults to None.
+
+        Raises:
+            ArgError: [Error if a sub flow ID is duplicated, or a parent ID is not found in the previous phases]
+
+        Returns:
+            Tuple[FlowStore, int, int]: [store of the positioned nodes, phase width and body height]
+        """
+        if self._cache is not None:
+            if key is None:
+                key = self.layout_fingerprint()
+            layout = self._cache.get_layout(key)
+            if layout is None:
+                layout = self._layout_store()
+                self._cache.put_layout(key, layout)
+            elif self._stats is not None:
+                self._stats.add_count('layout_cache_hits')
+            return layout
+        return self._layout_store()
+
+    def get_summary(self)->Optional[FlowSummary]:
+        """Obtain the research flow status summarized by the level of detail.
+
+        Raises:
+            ArgError: [Error if a sub flow ID is duplicated, or a parent ID is not found in the previous phases]
+
+        Returns:
+            Optional[FlowSummary]: [summary. None without level of detail]
+        """
+        if self._lod is None:
+            return None
+        if self._summary is None:
+            StatusValidator.validate(self._research_flow_status)
+            self._summary = self._lod.summarize(self._research_flow_status)
+        return self._summary
+
+    def _layout_store(self)->Tuple[FlowStore, int, int]:
+        # Check the relations between the sub flows before the layout work, and obtain the index of their IDs.
+        with self._stage('validate'):
+            rows = StatusValidator.validate(self._research_flow_status)
         research_flow_status = self._research_flow_status
 
-        # Calculation of the number of phases
-        phase_num = len(research_flow_status)
+        ## Summarize large phases and linear chains
+        if self._lod is not None:
+            with self._stage('summarize'):
+                if self._summary is None:
+                    self._summary = self._lod.summarize(research_flow_status)
+                research_flow_status = self._summary.research_flow_status
+                rows = None
 
         # Calculation of phase width (rounding down to the nearest whole number)
-        phase_width = math.floor(self._whole_max_width / phase_num)
+        phase_width = math.floor(self._whole_max_width / len(self._research_flow_status))
 
-        # Calculation of horizontal node spacing length
-        between_node_horizontal_length = math.floor(self._whole_max_width / phase_num)
+        # Organize research flow history data
+        ## Obtain the columnar store of the nodes of every phase. Node IDs are indexed by the store.
+        with self._stage('build_store'):
+            store = FlowStore.from_research_flow_status(research_flow_status, rows)
 
+        # fill dumpy node (also in the 'polyline' long edge mode, where dummy rows reserve the positions of the bend points)
+        with self._stage('fill_dummy_rows'):
+            self.fill_dummy_rows(store)
 
+        ## Sort the rows of each phase
+        with self._stage('sort_rows'):
+            self.sort_rows_each_phase(store)
 
-        # Organize research flow history data
-        ## Obtain a list of node information per phase
-        nodes_each_phase = []
-        for phase_status in research_flow_status:
-            nodes_each_phase.append(self.get_nodes(phase_status._sub_flow_data))
+        ## Rearrange the rows of each phase to reduce line crossings
+        if self._ordering != 'parent':
+            with self._stage('order_rows'):
+                self.order_rows(store)
+
+        # Add drawing position information to the rows of each phase.
+        with self._stage('set_locations'):
+            self.set_row_locations(store)
 
-        # fill dumpy node
-        filled_nodes_each_phase = self.fill_dummy_nodes_each_phase(nodes_each_phase)
+            # Calculate the height of the body part.
+            body_height =  self.calculate_body_height(store.phase_rows)
 
-        ## Sort the list of node information by phase
-        sorted_nodes_each_phase = self.sort_nodes_each_phase(filled_nodes_each_phase)
+        if self._stats is not None:
+            self.count_rows(store)
 
-        ## TODO : Rearrange the list of node information per phase
+        return store, phase_width, body_height
 
-        # Add drawing position information to the node information for each phase.
-        positioned_nodes_each_phase:List[List[Node]] = []
-        ## Calculate initial X-coordinates.
-        start_x = math.floor(self._whole_max_width / phase_num / 2)
+    def count_rows(self, store:FlowStore):
+        """Add the numbers of nodes, dummy nodes and lines of the store to the stats.
 
-        for index, nodes in enumerate(sorted_nodes_each_phase):
-            positioned_nodes_each_phase.append(self.set_node_location(nodes=nodes, node_x=start_x, color_index=index))
-            ## Update initial X-coordinates
-            start_x += between_node_horizontal_length
+        Args:
+            store (FlowStore): [store of the nodes]
+        """
+        node_num = 0
+        dummy_node_num = 0
+        line_num = 0
+        for _, row in store.iter_rows():
+            if store.is_dummy(row):
+                dummy_node_num += 1
+                if self._long_edge_mode == 'polyline':
+                    # The line to the parent row is a part of a polyline.
+                    continue
+            else:
+                node_num += 1
+            line_num += len(store.get_layer_parent_rows(row))
+        self._stats.add_count('nodes', node_num)
+        self._stats.add_count('dummy_nodes', dummy_node_num)
+        self._stats.add_count('lines', line_num)
 
-        # Calculate the height of the body part.
-        body_height =  self.calculate_body_height(positioned_nodes_each_phase)
+    def fill_dummy_nodes_each_phase(self, nodes_each_phase:List[List[Node]])->List[List[Node]]:
+        """Fill in dummy nodes between a node and its parent nodes two or more phases before.
 
-        # Building SVG data.
+        Args:
+            nodes_each_phase (List[List[Node]]): [Group of node data divided by phase]
 
-        ## Obtain SVG data for the frame (header + body)
-        frame = Frame(phase_list=research_flow_status, phase_width=phase_width, header_height=self._header_height, body_height=body_height)
-        frame_svg = frame.generate_frame()
+        Raises:
+            Exception: [Error if a parent node is not found in the previous phases]
 
-        ## Obtain SVG data for inter-node lines
-        line_svg = Line.generate_svg_lines(positioned_nodes_each_phase)
+        Returns:
+            List[List[Node]]: [Group of node data divided by phase, including dummy nodes]
+        """
+        store = FlowStore.from_nodes_each_phase(nodes_each_phase)
+        self.fill_dummy_rows(store)
+        return store.get_nodes_each_phase()
 
-        ## Obtain the SVG data of a node.
-        node_svg = ''
-        node_label = ''
-        for nodes in positioned_nodes_each_phase:
-            for node in nodes:
-                node_svg = node_svg + node.generate_svg_component()
-                node_label = node_label + node.get_lable_svg_component()
+    def fill_dummy_rows(self, store:FlowStore):
+        """Fill in dummy rows between a row and its parent rows two or more phases before.
 
-        # Calculate the height of the entire SVG data.
-        svg_height = body_height + self._header_height
+        The dummy rows are appended to the rows of their phases, followed by the rows connected to dummy rows,
+        and the parent rows used for drawing are set to the store.
 
-        # Mature and return as SVG data
-        return self.pack_svg_tag(frame=frame_svg, line=line_svg, node=node_svg, node_label=node_label, height=svg_height, width=(phase_width*phase_num))
+        Args:
+            store (FlowStore): [store of the nodes]
 
-    def fill_dummy_nodes_each_phase(self, nodes_each_phase:List[List[Node]])->List[List[Node]]:
+        Raises:
+            Exception: [Error if a parent node is not found in the previous phases]
+        """
         # If there are two or more open spaces between nodes instead of adjacent phases, fill in dummy nodes.
-        phase_num = len(nodes_each_phase)
+        phase_num = store.phase_num
+        phase_indexes = store.phase_indexes
 
-        copy_nodes_each_phase = deepcopy(nodes_each_phase)
+        layer_parent_rows = {} # parent rows for drawing of the rows connected to dummy rows
+        dummy_rows_each_phase = [[] for _ in range(phase_num)]
+        connected_rows_each_phase = [[] for _ in range(phase_num)]
 
         for index in range(phase_num-1, 0, -1): # Process from the back phase.
-            nodes = nodes_each_phase[index]
-            nodes_in_pre_phase = nodes_each_phase[index-1]
-            for node in nodes:
-                no_exist_ids = self.exist_nodes_in_phase_by_ids(nodes_in_pre_phase, node.parent_ids)
-                if len(no_exist_ids)<=0:
+            for row in store.phase_rows[index]:
+                connected_parent_rows, dummy_rows = self.connect_row_with_dummy_rows(store, index, row)
+                if connected_parent_rows is None:
                     continue # All of the parent IDs of the target Node are included in the previous phase.
-                else:
-                    # At least one of the parent IDs of the target Node is included in the two previous phases
-                    # Identify the parent node in the two previous phases.
-                    parant_ids_stock_last_edit_node = []
-                    for no_exist_id in no_exist_ids:
-                        parent_pahse_index, parent_node = self.get_pahse_index_and_node_with_node_id(nodes_each_phase, index-2, no_exist_id)
-
-                        if index == -1 or parent_node is None:
-                            raise Exception(f'Not Found Parent Nodes [start_last_index] : {index-2}, [no_exist_id] : {no_exist_id}')
-
-                        diff_index_num = index - parent_pahse_index # Difference in number of phases
-                        addition_datetime = math.floor((node.create_datetime - parent_node.create_datetime) / diff_index_num) # UnixTime for addition
-
-                        tmp_node = None
-                        for edit_index in range(parent_pahse_index+1, index+1, 1):
-                            if tmp_node is None:
-                                add_id = f'dummy:{uuid.uuid4()}'
-                                add_node = DummyNode(
-                                                id=add_id,
-                                                parent_ids=[parent_node.id],
-                                                create_datetime=parent_node.create_datetime + addition_datetime,
-                                                node_name=''
-                                            )
-                                tmp_node = add_node
-                                if (edit_index+1) == index:
-                                    parant_ids_stock_last_edit_node.append(add_id)
-                            elif tmp_node is not None and edit_index < index:
-                                add_id = f'dummy:{uuid.uuid4()}'
-                                add_node = DummyNode(
-                                                id=add_id,
-                                                parent_ids=[tmp_node.id],
-                                                create_datetime=tmp_node.create_datetime + addition_datetime,
-                                                node_name=''
-                                            )
-                                tmp_node = add_node
-                                if (edit_index+1) == index:
-                                    parant_ids_stock_last_edit_node.append(add_id)
-                            else:
-                                add_node_parent_ids = []
-                                add_node_parent_ids.extend(parant_ids_stock_last_edit_node)
-
-                                add_node_parent_ids.extend(list(set(node.parent_ids) ^ set(no_exist_ids)))
-
-                                add_node = Node(
-                                                id=node.id,
-                                                parent_ids=add_node_parent_ids,
-                                                create_datetime=node.create_datetime,
-                                                node_name=node.node_name,
-                                                href=node.href
-                                            )
-
-                            for copy_node in copy_nodes_each_phase[edit_index]:
-                                if copy_node.id == add_node.id:
-                                    copy_nodes_each_phase[edit_index].remove(copy_node)
-                            copy_nodes_each_phase[edit_index].append(add_node)
-        return copy_nodes_each_phase
-
-    def get_pahse_index_and_node_with_node_id(self, nodes_each_phase:List[List[Node]], start_last_index:int, id):
-        for index in range(start_last_index, -1, -1):
-            nodes = nodes_each_phase[index]
-            for node in nodes:
-                if node.id == id:
-                    return index, node
-        return -1, None
-
-
-    def exist_nodes_in_phase_by_ids(self, nodes: List[Node], ids:List[str])->List[str]:
-        ids_num = len(ids)
-        exist_count = 0
-        exist_ids = []
-        for id in ids:
-            for node in nodes:
-                if node.id == id:
-                    exist_count += 1
-                    exist_ids.append(id)
-
-        if ids_num == exist_count:
-            return []
-        else:
-            diff_ids = set(ids) ^ set(exist_ids)
-            return list(diff_ids)
+
+                for dummy_row in dummy_rows:
+                    dummy_rows_each_phase[phase_indexes[dummy_row]].append(dummy_row)
+                layer_parent_rows[row] = connected_parent_rows
+                connected_rows_each_phase[index].append(row)
+
+        # The rows connected to dummy rows move to the end of their phase, after the dummy rows.
+        for index in range(phase_num):
+            if len(dummy_rows_each_phase[index]) <= 0 and len(connected_rows_each_phase[index]) <= 0:
+                continue
+            rows = array('l', (row for row in store.phase_rows[index] if row not in layer_parent_rows))
+            rows.extend(dummy_rows_each_phase[index])
+            rows.extend(connected_rows_each_phase[index])
+            store.set_phase_rows(index, rows)
+
+        store.set_layer_parents(layer_parent_rows)
+
+    def connect_row_with_dummy_rows(self, store:FlowStore, phase_index:int, row:int)->Tuple[Optional[List[int]], List[int]]:
+        """Connect a row to its parent rows two or more phases before through chains of dummy rows.
+
+        Dummy rows are added to the store, but not to the rows of their phases.
+
+        Args:
+            store (FlowStore): [store of the nodes]
+            phase_index (int): [index of the phase containing the row]
+            row (int): [row]
+
+        Raises:
+            Exception: [Error if a parent node is not found in the previous phases]
+
+        Returns:
+            Tuple[Optional[List[int]], List[int]]: [parent rows for drawing (None if all parent rows are in the previous phase) and added dummy rows]
+        """
+        phase_indexes = store.phase_indexes
+        create_datetimes = store.create_datetimes
+
+        near_parent_rows = []
+        far_parent_rows = []
+        for parent_row in store.get_parent_rows(row):
+            parent_phase_index = phase_indexes[parent_row]
+            if parent_phase_index == phase_index-1:
+                near_parent_rows.append(parent_row)
+            elif 0 <= parent_phase_index < phase_index-1:
+                far_parent_rows.append(parent_row)
+            else:
+                raise Exception(f'Not Found Parent Nodes [start_last_index] : {phase_index-2}, [no_exist_id] : {store.get_id(parent_row)}')
+
+        if len(far_parent_rows)<=0:
+            return None, []
+
+        # At least one of the parent IDs of the target Node is included in the two previous phases
+        dummy_rows = []
+        parent_rows_stock_last_edit_row = []
+        chain_counts:Dict[int, int] = {}
+        for parent_row in far_parent_rows:
+            # A parent ID given twice gets a second chain of dummy rows with other IDs.
+            chain_index = chain_counts.get(parent_row, 0)
+            chain_counts[parent_row] = chain_index + 1
+            parent_pahse_index = phase_indexes[parent_row]
+            diff_index_num = phase_index - parent_pahse_index # Difference in number of phases
+            addition_datetime = math.floor((create_datetimes[row] - create_datetimes[parent_row]) / diff_index_num) # UnixTime for addition
+
+            tmp_row = parent_row
+            for edit_index in range(parent_pahse_index+1, phase_index, 1):
+                tmp_row = store.add_row(
+                                phase_index=edit_index,
+                                id=self.get_dummy_id(store.get_id(parent_row), store.get_id(row), edit_index, chain_index),
+                                name='',
+                                link='',
+                                parent_rows=[tmp_row],
+                                create_datetime=create_datetimes[tmp_row] + addition_datetime,
+                                dummy=True
+                            )
+                dummy_rows.append(tmp_row)
+            parent_rows_stock_last_edit_row.append(tmp_row)
+
+        return sorted(parent_rows_stock_last_edit_row + near_parent_rows, key=store.get_id), dummy_rows
+
+    def get_dummy_id(self, parent_id:str, child_id:str, phase_index:int, chain_index:int=0)->str:
+        """Obtain the ID of a dummy node on the line between a node and its parent node.
+
+        The ID only depends on the IDs of the ends of the line and the phase of the dummy node,
+        so the same research flow status always gives the same dummy nodes.
+
+        Args:
+            parent_id (str): [ID of the parent node]
+            child_id (str): [ID of the child node]
+            phase_index (int): [index of the phase containing the dummy node]
+            chain_index (int, optional): [index of the chain of dummy nodes if the parent ID is given several times]. Defaults to 0.
+
+        Returns:
+            str: [dummy node ID]
+        """
+        key = [parent_id, child_id, phase_index]
+        if chain_index > 0:
+            key.append(chain_index)
+        digest = hashlib.sha256(json.dumps(key).encode('utf-8')).hexdigest()
+        return f'dummy:{digest[:32]}'
 
     def sort_nodes_each_phase(self, nodes_each_phase:List[List[Node]])->List[List[Node]]:
         """Sort_nodes_each_phase all nodes in the research flow history
@@ -318,23 +1035,51 @@ class FlowDrawer():
         Returns:
             list[list[Node]]: [Data after sorting]
         """
-        sorted_nodes_each_phaselist = []
+        store = FlowStore.from_nodes_each_phase(nodes_each_phase)
+        self.sort_rows_each_phase(store)
 
-        for index, nodes in enumerate(nodes_each_phase):
-            if index == 0 or (len(nodes_each_phase[0])==1 and index==1):
+        nodes = [node for phase_nodes in nodes_each_phase for node in phase_nodes]
+        return [[nodes[row] for row in rows] for rows in store.phase_rows]
 
-                # The most recent phase is sorted in ascending order of node ID.
-                sorted_nodes = self.sort_nodes_by_createdatetime(nodes)
-                sorted_nodes_each_phaselist.append(sorted_nodes)
-            else:
-                sorted_nodes = []
-                # Reorder the node data by looking at the parent ID list according to the order of the previous phase.
-                ## Obtain the node data list (sorted) from the previous phase.
-                pre_phase_nodes = sorted_nodes_each_phaselist[index-1]
-                sorted_nodes = self.sort_nodes_by_pre_phase_nodes(pre_phase_nodes, nodes)
-                sorted_nodes_each_phaselist.append(sorted_nodes)
-        return sorted_nodes_each_phaselist
+    def sort_rows_each_phase(self, store:FlowStore):
+        """Sort the rows of each phase of the store.
+
+        Args:
+            store (FlowStore): [store of the nodes]
+        """
+        for index in range(store.phase_num):
+            self.sort_phase_rows(store, index)
+
+    def sort_phase_rows(self, store:FlowStore, phase_index:int):
+        """Sort the rows of a phase of the store. The rows of the previous phase must be sorted.
+
+        Args:
+            store (FlowStore): [store of the nodes]
+            phase_index (int): [phase index]
+        """
+        phase_rows = store.phase_rows
+        if phase_index == 0 or (len(phase_rows[0])==1 and phase_index==1):
+            # The most recent phase is sorted in ascending order of creation datetime.
+            store.set_phase_rows(phase_index, self.sort_rows_by_createdatetime(store, phase_rows[phase_index]))
+        else:
+            # Reorder the rows by looking at the parent rows according to the order of the previous phase.
+            store.set_phase_rows(phase_index, self.sort_rows_by_pre_phase_rows(store, phase_rows[phase_index-1], phase_rows[phase_index]))
+
+    def order_rows(self, store:FlowStore)->int:
+        """Reorder the sorted rows of each phase with the ordering of the drawer to reduce line crossings.
+
+        Args:
+            store (FlowStore): [store of the nodes, after sort_rows_each_phase()]
+
+        Returns:
+            int: [number of line crossings]
+        """
+        if self._ordering == 'parent':
+            return LayerOrdering(store).count_crossings()
+        return LayerOrdering(store).order(self._ordering, self._ordering_iterations)
 
+    def sort_rows_by_createdatetime(self, store:FlowStore, rows:array)->array:
+        return array('l', sorted(rows, key=store.create_datetimes.__getitem__))
 
     def sort_nodes_by_createdatetime(self, nodes:List[Node])->List[Node]:
         return sorted(nodes, key=lambda x: x.create_datetime)
@@ -349,87 +1094,41 @@ class FlowDrawer():
         Returns:
             list[Node]: [Data after sorting]
         """
-        sorted_nodes = []
-
-        grouped_node = [] # group node list
-        for pre_phase_node in pre_phase_nodes:
-            pre_phase_node_id = pre_phase_node.id # NodeID of previous phase
-            grouping_node = []
-            for target_node in target_nodes:
-                if pre_phase_node_id in target_node.parent_ids and not self.is_contain_id_in_grouped_node(grouped_node, target_node.id):
-                    # Added if the ID of the previous phase is included in the next phase parent ID list and the group node list does not already contain the target node
-                    grouping_node.append(target_node)
-            grouped_node.append(grouping_node)
-
-        for nodes in grouped_node:
-            sorted_nodes.extend(self.sort_nodes_by_createdatetime(nodes))
-
-        return sorted_nodes
-
-    def is_contain_id_in_grouped_node(self, grouped_node:List[List[Node]], target_id)->bool:
-        for nodes in grouped_node:
-            for node in nodes:
-                if node.id == target_id:
-                    return True
-        return False
-
-
-    # TODO : リサーチフロ－来歴図における各ノードの配置を綺麗するためのメソッドを開発する（2023/8/25 時点で優先度：低）
-    # def rearrange_nodes_each_phase(self, nodes_each_phase:list[list[Node]])->list[list[Node]]:
-
-    #     pre_rearranged_nodes_each_phase = list[list[Node]]()
-
-    #     # インデックスリスト（降順）を生成する
-    #     phase_index_list = list[int]()
-    #     for index in  range((len(nodes_each_phase)-1), -1, -1):
-    #         phase_index_list.append(index)
-
-    #     pre_rearranged_nodes_each_phase.append(nodes_each_phase[len(nodes_each_phase)-1])
-
-    #     for phase_index in phase_index_list[1:]:
-    #         # [3,2,1,0]
-    #         print(phase_index)
-    #         new_nodes = list[Node]()
-    #         nodes = nodes_each_phase[phase_index]
-    #         for node in nodes:
-    #             new_nodes.append(node)
-    #             node_id = node.id
-    #             parent_ids = sorted(node.parent_ids)
-    #             if len(parent_ids)>0:
-    #                 priority_parent_id = parent_ids[0]
-    #                 dummy_parent_ids = [priority_parent_id]
-    #             else:
-    #                 dummy_parent_ids = []
-    #             child_node_num = self.get_child_node_num_by_id(node_id, nodes_each_phase[phase_index+1])
-    #             new_nodes.extend(self.generate_dummy_nodes(child_node_num-1, dummy_parent_ids))
-
-    #         pre_rearranged_nodes_each_phase.append(new_nodes)
-
-    #     rearranged_nodes_each_phase = list[list[Node]]()
-    #     for phase_index in phase_index_list:
-    #         rearranged_nodes_each_phase.append(pre_rearranged_nodes_each_phase[phase_index])
-    #     return rearranged_nodes_each_phase
-
-    # def get_child_node_num_by_id(self, target_node_id:int, nodes:List[Node])->int:
-    #     child_node_num = 0
-
-    #     for node in nodes:
-    #         parent_ids = sorted(node.parent_ids)
-    #         priority_parent_id = parent_ids[0]
-    #         if priority_parent_id == target_node_id:
-    #             child_node_num += 1
-
-    #     return child_node_num
-
-    # def generate_dummy_nodes(self, node_num:int, parent_ids:List[int])->List[Node]:
-    #     dummy_nodes = []
-    #     for i in range(node_num):
-    #         dummy_nodes.append(Node(
-    #             id=-1,
-    #             parent_ids=parent_ids,
-    #             start_time=0,
-    #             node_name='',
-    #             status='',
-    #             stroke_width=0
-    #         ))
-    #     return dummy_nodes
+        store = FlowStore.from_nodes_each_phase([pre_phase_nodes, target_nodes])
+        sorted_rows = self.sort_rows_by_pre_phase_rows(store, store.phase_rows[0], store.phase_rows[1])
+
+        nodes = pre_phase_nodes + target_nodes
+        return [nodes[row] for row in sorted_rows]
+
+    def sort_rows_by_pre_phase_rows(self, store:FlowStore, pre_phase_rows:array, target_rows:array)->array:
+        """Reorder the rows by looking at the parent rows according to the order of the previous phase.
+
+        Each target row is grouped under the first row of the previous phase that is one of its parents.
+        Target rows without a parent in the previous phase are placed last.
+
+        Args:
+            store (FlowStore): [store of the nodes]
+            pre_phase_rows (array): [Comparison rows]
+            target_rows (array): [Sorted target rows]
+
+        Returns:
+            array: [rows after sorting]
+        """
+        # Position of each row in the previous phase
+        pre_phase_positions = {}
+        for position, pre_phase_row in enumerate(pre_phase_rows):
+            pre_phase_positions.setdefault(pre_phase_row, position)
+
+        grouped_rows = [[] for _ in range(len(pre_phase_rows) + 1)] # group row list (the last group holds rows without parent in the previous phase)
+        for target_row in target_rows:
+            group_index = len(pre_phase_rows)
+            for parent_row in store.get_layer_parent_rows(target_row):
+                position = pre_phase_positions.get(parent_row)
+                if position is not None and position < group_index:
+                    group_index = position
+            grouped_rows[group_index].append(target_row)
+
+        sorted_rows = array('l')
+        for rows in grouped_rows:
+            sorted_rows.extend(self.sort_rows_by_createdatetime(store, rows))
+        return sorted_rows
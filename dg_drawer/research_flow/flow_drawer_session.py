@@ -0,0 +1,342 @@
+from array import array
+from typing import Dict, Iterator, List, Set, Tuple
+
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow.flow_drawer import FlowDrawer
+from dg_drawer.research_flow.research_flow_status import PhaseStatus, SubFlowStatus
+
+
+class FlowDrawerSession():
+    """FlowDrawerSession class
+
+    This class keeps the layout of a Research Flow Status image (SVG) and updates it
+    when sub flows are added, removed or renamed. Only the phases affected by an operation are sorted
+    and positioned again, and only the SVG data of the changed element groups has to be sent again.
+
+    The SVG data of the session groups its elements in <g> elements with IDs :
+    '<prefix>frame', '<prefix>lines-<phase index>', '<prefix>nodes-<phase index>' and '<prefix>labels-<phase index>'.
+    Apart from the <g> elements, the SVG data is the same as the one of FlowDrawer.draw().
+
+    The operations update the research flow status given to the constructor.
+    """
+
+    def __init__(self, research_flow_status:List[PhaseStatus], element_id_prefix:str='', **drawer_options) -> None:
+        """FlowDrawerSession constructor
+
+        Args:
+            research_flow_status (List[PhaseStatus]): [Research Flow Status Instance]
+
+            element_id_prefix (str, optional): [prefix of the IDs of the element groups]. Defaults to ''.
+
+            drawer_options : [options of FlowDrawer (whole_max_width, header_height, ...)]
+
+        Raises:
+            ArgError: [Error if an option is not supported. The ordering must be 'parent', the long edge mode 'dummy' and there must be no level of detail]
+        """
+        self._research_flow_status = research_flow_status
+        self._element_id_prefix = element_id_prefix
+        self._drawer = FlowDrawer(research_flow_status=research_flow_status, **drawer_options)
+        if drawer_options.get('ordering', 'parent') != 'parent':
+            # Operations sort only the affected phases, which the crossing reduction orderings do not support.
+            raise ArgError(f'Unsupported ordering [{drawer_options["ordering"]}] for a session. Supported orderings : [\'parent\']')
+        if drawer_options.get('long_edge_mode', 'dummy') != 'dummy':
+            # A polyline depends on the positions of the rows of several phases, which the element groups by phase do not follow.
+            raise ArgError(f'Unsupported long edge mode [{drawer_options["long_edge_mode"]}] for a session. Supported long edge modes : [\'dummy\']')
+        if drawer_options.get('lod') is not None:
+            raise ArgError('Level of detail is not supported for a session')
+
+        self._store, self._phase_width, self._body_height = self._drawer.layout_store()
+
+        self._dummy_rows_of:Dict[int, List[int]] = {} # dummy rows connecting each row to its parent rows
+        self._dummy_keys:Dict[int, Tuple[int, int, int]] = {} # creation order of each dummy row
+        self._child_counts:Dict[int, int] = {}
+        for phase_index, row in self._store.iter_rows():
+            if not self._store.is_dummy(row):
+                self._register_row(phase_index, row)
+
+        self._changed_element_ids:Set[str] = set()
+        self._size_changed = False
+
+    def _register_row(self, phase_index:int, row:int):
+        """Register the children and the dummy rows of a (not dummy) row.
+
+        Args:
+            phase_index (int): [index of the phase containing the row]
+            row (int): [row]
+        """
+        store = self._store
+        phase_indexes = store.phase_indexes
+
+        far_parent_positions = {}
+        for parent_row in store.get_parent_rows(row):
+            self._child_counts[parent_row] = self._child_counts.get(parent_row, 0) + 1
+            if phase_indexes[parent_row] < phase_index-1:
+                far_parent_positions[parent_row] = len(far_parent_positions)
+
+        dummy_rows = []
+        for layer_parent_row in store.get_layer_parent_rows(row):
+            chain = []
+            tmp_row = layer_parent_row
+            while store.is_dummy(tmp_row):
+                chain.append(tmp_row)
+                tmp_row = store.get_parent_rows(tmp_row)[0]
+            for dummy_row in chain:
+                # Dummy rows are created from the back phase, in the order of the rows and of their parent IDs.
+                self._dummy_keys[dummy_row] = (-phase_index, row, far_parent_positions[tmp_row])
+            dummy_rows.extend(chain)
+        if len(dummy_rows) > 0:
+            self._dummy_rows_of[row] = dummy_rows
+
+    def _get_unsorted_key(self, row:int)->tuple:
+        """Obtain the key of a row in the order of the rows of a phase before sorting,
+        which is the order given by FlowDrawer.fill_dummy_rows().
+
+        Args:
+            row (int): [row]
+
+        Returns:
+            tuple: [key of the row]
+        """
+        if self._store.is_dummy(row):
+            return (1,) + self._dummy_keys[row]
+        elif row in self._dummy_rows_of:
+            return (2, row)
+        else:
+            return (0, row)
+
+    def add_sub_flow(self, phase_index:int, sub_flow:SubFlowStatus):
+        """Add a sub flow to the end of a phase.
+
+        Args:
+            phase_index (int): [index of the phase]
+
+            sub_flow (SubFlowStatus): [sub flow to add]
+
+        Raises:
+            ArgError: [Error if the phase index is out of range, the ID already exists or a parent ID is not found in the previous phases]
+        """
+        store = self._store
+        if not 0 <= phase_index < store.phase_num:
+            raise ArgError(f'Phase index [{phase_index}] is out of range')
+        if self._get_row(sub_flow._id) >= 0:
+            raise ArgError(f'Sub flow [{sub_flow._id}] already exists')
+
+        parent_rows = []
+        for parent_id in sorted(sub_flow._parent_ids):
+            parent_row = self._get_row(parent_id)
+            if parent_row < 0 or store.phase_indexes[parent_row] >= phase_index:
+                raise ArgError(f'Parent sub flow [{parent_id}] of sub flow [{sub_flow._id}] is not found in the previous phases')
+            parent_rows.append(parent_row)
+
+        self._research_flow_status[phase_index]._sub_flow_data.append(sub_flow)
+
+        row = store.add_row(
+                    phase_index=phase_index,
+                    id=sub_flow._id,
+                    name=sub_flow._name,
+                    link=sub_flow._link,
+                    parent_rows=parent_rows,
+                    create_datetime=sub_flow._create_datetime
+                )
+        layer_parent_rows, dummy_rows = self._drawer.connect_row_with_dummy_rows(store, phase_index, row)
+        store.set_layer_parent_rows(row, layer_parent_rows)
+        self._register_row(phase_index, row)
+
+        changed_phases = {phase_index}
+        store.set_phase_rows(phase_index, store.phase_rows[phase_index] + array('l', [row]))
+        for dummy_row in dummy_rows:
+            dummy_phase_index = store.phase_indexes[dummy_row]
+            store.set_phase_rows(dummy_phase_index, store.phase_rows[dummy_phase_index] + array('l', [dummy_row]))
+            changed_phases.add(dummy_phase_index)
+
+        self._update_phases(changed_phases)
+
+    def remove_sub_flow(self, id:str):
+        """Remove a sub flow.
+
+        Args:
+            id (str): [ID of the sub flow]
+
+        Raises:
+            ArgError: [Error if the sub flow is not found or has child sub flows]
+        """
+        store = self._store
+        row = self._get_row(id)
+        if row < 0:
+            raise ArgError(f'Sub flow [{id}] is not found')
+        if self._child_counts.get(row, 0) > 0:
+            raise ArgError(f'Sub flow [{id}] has child sub flows')
+
+        phase_index = store.phase_indexes[row]
+        sub_flow_data = self._research_flow_status[phase_index]._sub_flow_data
+        sub_flow_data[:] = [sub_flow for sub_flow in sub_flow_data if sub_flow._id != id]
+
+        for parent_row in store.get_parent_rows(row):
+            self._child_counts[parent_row] -= 1
+        self._child_counts.pop(row, None)
+
+        removed_rows_each_phase = {phase_index: {row}}
+        for dummy_row in self._dummy_rows_of.pop(row, []):
+            removed_rows_each_phase.setdefault(store.phase_indexes[dummy_row], set()).add(dummy_row)
+            del self._dummy_keys[dummy_row]
+
+        for removed_phase_index, removed_rows in removed_rows_each_phase.items():
+            store.set_phase_rows(removed_phase_index, array('l', (r for r in store.phase_rows[removed_phase_index] if r not in removed_rows)))
+            for removed_row in removed_rows:
+                store.remove_row(removed_row)
+
+        self._update_phases(set(removed_rows_each_phase.keys()))
+
+    def rename_sub_flow(self, id:str, name:str):
+        """Rename a sub flow.
+
+        Args:
+            id (str): [ID of the sub flow]
+
+            name (str): [new name]
+
+        Raises:
+            ArgError: [Error if the sub flow is not found]
+        """
+        store = self._store
+        row = self._get_row(id)
+        if row < 0:
+            raise ArgError(f'Sub flow [{id}] is not found')
+
+        phase_index = store.phase_indexes[row]
+        for sub_flow in self._research_flow_status[phase_index]._sub_flow_data:
+            if sub_flow._id == id:
+                sub_flow._name = name
+        store.set_name(row, name)
+        self._changed_element_ids.add(self._get_element_id('labels', phase_index))
+
+    def _get_row(self, id:str)->int:
+        row = self._store.get_row(id)
+        if row < 0 or self._store.phase_indexes[row] < 0 or self._store.is_dummy(row):
+            return -1
+        return row
+
+    def _update_phases(self, changed_phases:Set[int]):
+        """Sort and position again the phases whose rows changed, and the following phases whose order depends on them.
+
+        Args:
+            changed_phases (Set[int]): [indexes of the phases whose rows changed]
+        """
+        store = self._store
+        phase_num = store.phase_num
+        sorted_phases = set(changed_phases)
+        if 0 in changed_phases and phase_num > 1:
+            # The rule for sorting the second phase depends on the number of rows of the first phase.
+            sorted_phases.add(1)
+
+        for index in range(min(sorted_phases), phase_num):
+            if index not in sorted_phases:
+                continue
+            previous_rows = store.phase_rows[index]
+            store.set_phase_rows(index, array('l', sorted(previous_rows, key=self._get_unsorted_key)))
+            self._drawer.sort_phase_rows(store, index)
+            sorted_rows = store.phase_rows[index]
+            if index not in changed_phases and sorted_rows == previous_rows:
+                continue
+
+            self._drawer.set_phase_row_locations(store, index)
+            self._changed_element_ids.add(self._get_element_id('nodes', index))
+            self._changed_element_ids.add(self._get_element_id('labels', index))
+            if index > 0:
+                self._changed_element_ids.add(self._get_element_id('lines', index))
+            if index+1 < phase_num:
+                self._changed_element_ids.add(self._get_element_id('lines', index+1))
+                # The next phase is sorted again if the order of the rows kept in this phase changed.
+                previous_row_set = set(previous_rows)
+                sorted_row_set = set(sorted_rows)
+                if [row for row in sorted_rows if row in previous_row_set] != [row for row in previous_rows if row in sorted_row_set]:
+                    sorted_phases.add(index+1)
+
+        body_height = self._drawer.calculate_body_height(store.phase_rows)
+        if body_height != self._body_height:
+            self._body_height = body_height
+            self._size_changed = True
+            self._changed_element_ids.add(self._get_element_id('frame'))
+
+    def _get_element_id(self, name:str, phase_index:int=None)->str:
+        if phase_index is None:
+            return f'{self._element_id_prefix}{name}'
+        return f'{self._element_id_prefix}{name}-{phase_index}'
+
+    def _get_svg_start_tag(self)->str:
+        svg_height = self._body_height + self._drawer._header_height
+        return self._drawer.get_svg_start_tag(self._phase_width*self._store.phase_num, svg_height)
+
+    def _iter_group(self, element_id:str)->Iterator[str]:
+        """Generate the SVG data of an element group.
+
+        Args:
+            element_id (str): [ID of the element group]
+
+        Yields:
+            str: [fragment of the SVG data of the element group]
+        """
+        store = self._store
+        name, _, phase_index = element_id[len(self._element_id_prefix):].partition('-')
+
+        yield f'<g id="{element_id}">'
+        if name == 'frame':
+            yield from self._drawer.iter_svg_frame(self._phase_width, self._body_height)
+        elif name == 'lines':
+            yield from self._drawer.iter_svg_lines(self._drawer.iter_phase_row_lines(store, int(phase_index)))
+        elif name == 'nodes':
+            yield from self._drawer.iter_phase_svg_nodes(store, int(phase_index))
+        elif name == 'labels':
+            yield from self._drawer.iter_phase_svg_labels(store, int(phase_index))
+        yield '</g>'
+
+    def _get_element_ids(self)->List[str]:
+        phase_num = self._store.phase_num
+        element_ids = [self._get_element_id('frame')]
+        element_ids.extend(self._get_element_id('lines', index) for index in range(phase_num-1, 0, -1))
+        element_ids.extend(self._get_element_id('nodes', index) for index in range(phase_num))
+        element_ids.extend(self._get_element_id('labels', index) for index in range(phase_num))
+        return element_ids
+
+    def iter_svg(self)->Iterator[str]:
+        """Drawing the current research flow history as SVG data fragments
+
+        Yields:
+            str: [fragment of research flow history SVG data]
+        """
+        self._changed_element_ids.clear()
+        self._size_changed = False
+
+        yield self._get_svg_start_tag()
+        style = self._drawer.get_style(self._store.phase_num)
+        if style is not None:
+            yield style.generate_svg_component()
+        for element_id in self._get_element_ids():
+            yield from self._iter_group(element_id)
+        yield '</svg>'
+
+    def draw(self)->str:
+        """Drawing the current research flow history as SVG data
+
+        Returns:
+            str: [research flow history as SVG data]
+        """
+        return ''.join(self.iter_svg())
+
+    def draw_changes(self)->Dict[str, str]:
+        """Obtain the SVG data of the element groups changed since the last drawing.
+
+        Returns:
+            Dict[str, str]: [SVG data (<g> element) of each changed element group ID.
+                             If the size of the image changed, the new svg start tag is given with the key 'svg']
+        """
+        changes = {}
+        if self._size_changed:
+            changes['svg'] = self._get_svg_start_tag()
+        for element_id in self._get_element_ids():
+            if element_id in self._changed_element_ids:
+                changes[element_id] = ''.join(self._iter_group(element_id))
+
+        self._changed_element_ids.clear()
+        self._size_changed = False
+        return changes
@@ -0,0 +1,208 @@
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from dg_drawer.research_flow.component.frame import Frame
+from dg_drawer.research_flow.enums.color import ColorType
+from dg_drawer.research_flow.flow_store import FlowStore
+from dg_drawer.research_flow.research_flow_status import PhaseStatus
+
+# Version of the columnar data of a layout. Change it when the keys or the meaning of the columns change.
+LAYOUT_FORMAT_VERSION = 1
+
+
+class FlowLayout():
+    """FlowLayout class
+
+    Result of the layout of a research flow history : coordinates of the nodes, lines between the nodes,
+    frame (header + body) of each phase, colours and badges of the compressed chains.
+    Obtain an instance with FlowDrawer.layout() and draw it with a renderer (SvgRenderer, JsonRenderer)
+    as many times as needed, the layout work is not repeated.
+
+    A layout is not modified after its creation. Renderers read the positioned nodes from its store (see store),
+    which must not be modified either.
+    """
+
+    __slots__ = ('_store', '_phase_list', '_phase_width', '_header_height', '_body_height', '_badges')
+
+    def __init__(self, store:FlowStore, phase_list:List[PhaseStatus], phase_width:int, header_height:int, body_height:int,
+                 badges:Iterable[Tuple[str, int, int]]=()) -> None:
+        """FlowLayout constructor
+
+        Args:
+            store (FlowStore): [store of the positioned nodes. It must not be modified afterwards]
+
+            phase_list (List[PhaseStatus]): [phases]
+
+            phase_width (int): [phase width]
+
+            header_height (int): [height of the header part]
+
+            body_height (int): [height of the body part]
+
+            badges (Iterable[Tuple[str, int, int]], optional): [value and coordinates of each badge]. Defaults to ().
+        """
+        self._store = store
+        self._phase_list = tuple(phase_list)
+        self._phase_width = phase_width
+        self._header_height = header_height
+        self._body_height = body_height
+        self._badges = tuple(badges)
+
+    '''
+    getter
+    '''
+    @property
+    def store(self)->FlowStore:
+        """Store of the positioned nodes, in their drawing order. Read only : it is shared by every drawing of the layout.
+        """
+        return self._store
+
+    @property
+    def phase_num(self)->int:
+        return self._store.phase_num
+
+    @property
+    def phase_width(self)->int:
+        return self._phase_width
+
+    @property
+    def header_height(self)->int:
+        return self._header_height
+
+    @property
+    def body_height(self)->int:
+        return self._body_height
+
+    @property
+    def width(self)->int:
+        return self._phase_width * self._store.phase_num
+
+    @property
+    def height(self)->int:
+        return self._header_height + self._body_height
+
+    @property
+    def phase_names(self)->Tuple[str, ...]:
+        return tuple(phase_status._name for phase_status in self._phase_list)
+
+    @property
+    def badges(self)->Tuple[Tuple[str, int, int], ...]:
+        return self._badges
+
+    def get_frame(self)->Frame:
+        """Obtain the frame (header + body) of the phases.
+
+        Returns:
+            Frame: [frame]
+        """
+        return Frame(phase_list=list(self._phase_list), phase_width=self._phase_width, header_height=self._header_height, body_height=self._body_height)
+
+    def get_palette(self)->List[Tuple[str, str]]:
+        """Obtain the colour codes of the headers and the nodes of each phase.
+
+        Returns:
+            List[Tuple[str, str]]: [header colour and node colour of each phase]
+        """
+        return ColorType.get_palette(self._store.phase_num)
+
+    def iter_nodes(self)->Iterator[Tuple[str, str, str, int, int, int]]:
+        """Generate the nodes in the order of the phases and of their rows. Dummy nodes are not generated.
+
+        Yields:
+            Tuple[str, str, str, int, int, int]: [ID, name, link, phase index and coordinates of the node]
+        """
+        store = self._store
+        cx = store.cx
+        cy = store.cy
+        for phase_index, row in store.iter_rows():
+            if not store.is_dummy(row):
+                yield store.get_id(row), store._names[row], store._links[row], phase_index, cx[row], cy[row]
+
+    def iter_edges(self)->Iterator[Tuple[str, str, List[Tuple[int, int]]]]:
+        """Generate the lines between the nodes in the order of the phases and of the rows of the child nodes.
+        A line to a parent node several phases before is bent at the positions reserved in the phases between.
+
+        Yields:
+            Tuple[str, str, List[Tuple[int, int]]]: [parent ID, child ID and points from the parent node to the child node]
+        """
+        store = self._store
+        for parent_row, row, points in self._iter_edge_rows():
+            yield store.get_id(parent_row), store.get_id(row), points
+
+    def _iter_edge_rows(self)->Iterator[Tuple[int, int, List[Tuple[int, int]]]]:
+        store = self._store
+        phase_indexes = store.phase_indexes
+        cx = store.cx
+        cy = store.cy
+        for phase_index, row in store.iter_rows():
+            if store.is_dummy(row):
+                continue
+            for parent_row in store.get_layer_parent_rows(row):
+                if phase_indexes[parent_row] != phase_index-1:
+                    continue
+                points = [(cx[row], cy[row])]
+                while store.is_dummy(parent_row):
+                    points.append((cx[parent_row], cy[parent_row]))
+                    parent_row = store.get_parent_rows(parent_row)[0]
+                points.append((cx[parent_row], cy[parent_row]))
+                points.reverse()
+                yield parent_row, row, points
+
+    def to_columns(self)->Dict[str, Any]:
+        """Export the layout as columnar JSON serializable data, to draw it on the client side.
+
+        * phases : 'name', 'color' (header) and 'node_color' columns.
+        * nodes : 'id', 'name', 'link', 'phase' (phase index), 'x' and 'y' columns. Dummy nodes are not exported.
+        * edges : 'source' and 'target' (indexes of the parent node and the child node in the nodes),
+          and the bend points of every edge, flattened ('bends' : x and y of each point) with 'bend_offsets'
+          (the bend points of edge i are the points bend_offsets[i] to bend_offsets[i+1]-1).
+        * badges : 'value', 'x' and 'y' columns.
+
+        Returns:
+            Dict[str, Any]: [columnar data of the layout]
+        """
+        store = self._store
+        node_indexes:Dict[int, int] = {}
+        nodes:Dict[str, List[Any]] = {'id': [], 'name': [], 'link': [], 'phase': [], 'x': [], 'y': []}
+        cx = store.cx
+        cy = store.cy
+        for phase_index, row in store.iter_rows():
+            if store.is_dummy(row):
+                continue
+            node_indexes[row] = len(node_indexes)
+            nodes['id'].append(store.get_id(row))
+            nodes['name'].append(store._names[row])
+            nodes['link'].append(store._links[row])
+            nodes['phase'].append(phase_index)
+            nodes['x'].append(cx[row])
+            nodes['y'].append(cy[row])
+
+        edges:Dict[str, List[int]] = {'source': [], 'target': [], 'bend_offsets': [0], 'bends': []}
+        for parent_row, row, points in self._iter_edge_rows():
+            edges['source'].append(node_indexes[parent_row])
+            edges['target'].append(node_indexes[row])
+            for x, y in points[1:-1]:
+                edges['bends'].append(x)
+                edges['bends'].append(y)
+            edges['bend_offsets'].append(len(edges['bends']) // 2)
+
+        palette = self.get_palette()
+        return {
+            'version': LAYOUT_FORMAT_VERSION,
+            'width': self.width,
+            'height': self.height,
+            'phase_width': self._phase_width,
+            'header_height': self._header_height,
+            'body_height': self._body_height,
+            'phases': {
+                'name': list(self.phase_names),
+                'color': [phase_color for phase_color, _ in palette],
+                'node_color': [node_color for _, node_color in palette],
+            },
+            'nodes': nodes,
+            'edges': edges,
+            'badges': {
+                'value': [value for value, _, _ in self._badges],
+                'x': [x for _, x, _ in self._badges],
+                'y': [y for _, _, y in self._badges],
+            },
+        }
@@ -0,0 +1,305 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dg_drawer.research_flow.component.node import Node, DummyNode
+from dg_drawer.research_flow.research_flow_status import PhaseStatus
+
+
+class FlowStore():
+    """FlowStore class
+
+    Columnar store of the nodes of a research flow history.
+
+    Node IDs are interned to integer rows. Phase indexes, creation datetimes and coordinates are held in
+    array columns, and the parent rows of each row in CSR form (offsets and a flat row list).
+    Rows whose parents for drawing differ from their parents (rows connected to dummy rows) hold them separately.
+    Node instances are only created as views of a row when they are drawn.
+
+    Parent IDs that do not belong to any phase are interned as placeholder rows with phase index -1.
+    """
+
+    __slots__ = ('_ids', '_rows', '_names', '_links', '_phase_indexes', '_create_datetimes', '_dummy_flags',
+                 '_parent_offsets', '_parent_rows', '_layer_parent_rows', '_cx', '_cy', '_phase_rows')
+
+    def __init__(self, phase_num:int=0) -> None:
+        """FlowStore constructor
+
+        Args:
+            phase_num (int, optional): [number of phases]. Defaults to 0.
+        """
+        self._ids:List[str] = []
+        self._rows:Dict[str, int] = {}
+        self._names:List[str] = []
+        self._links:List[str] = []
+        self._phase_indexes = array('i')
+        self._create_datetimes = array('q')
+        self._dummy_flags = bytearray()
+        self._parent_offsets = array('l', [0])
+        self._parent_rows = array('l')
+        self._layer_parent_rows:Dict[int, array] = {}
+        self._cx = array('l')
+        self._cy = array('l')
+        self._phase_rows:List[array] = [array('l') for _ in range(phase_num)]
+
+    @classmethod
+    def from_research_flow_status(cls, research_flow_status:List[PhaseStatus], rows:Dict[str, int]=None)->'FlowStore':
+        """Create a store from research flow status.
+
+        Args:
+            research_flow_status (List[PhaseStatus]): [Research Flow Status Instance]
+
+            rows (Dict[str, int], optional): [index of the sub flows by ID obtained by StatusValidator.validate().
+                                              If given, the IDs are not indexed again]. Defaults to None.
+
+        Returns:
+            FlowStore: [store of the sub flows of each phase]
+        """
+        return cls._build([
+            ((sub_flow._id, sub_flow._name, sub_flow._link, sub_flow._parent_ids, sub_flow._create_datetime, False, 0, 0)
+                for sub_flow in phase_status._sub_flow_data)
+            for phase_status in research_flow_status
+        ], rows)
+
+    @classmethod
+    def from_nodes_each_phase(cls, nodes_each_phase:List[List[Node]])->'FlowStore':
+        """Create a store from node lists. Rows are numbered in the order of the nodes.
+
+        Args:
+            nodes_each_phase (List[List[Node]]): [Group of node data divided by phase]
+
+        Returns:
+            FlowStore: [store of the nodes of each phase]
+        """
+        return cls._build([
+            ((node.id, node.node_name, node.href, node.parent_ids, node.create_datetime, type(node) is DummyNode, node.cx, node.cy)
+                for node in nodes)
+            for nodes in nodes_each_phase
+        ])
+
+    @classmethod
+    def _build(cls, entries_each_phase:List[Iterable[tuple]], rows:Dict[str, int]=None)->'FlowStore':
+        """Create a store from node entries (id, name, link, parent_ids, create_datetime, dummy, cx, cy) of each phase.
+
+        Args:
+            entries_each_phase (List[Iterable[tuple]]): [node entries of each phase]
+
+            rows (Dict[str, int], optional): [index of the node IDs in the order of the entries]. Defaults to None.
+
+        Returns:
+            FlowStore: [store of the nodes]
+        """
+        store = cls(len(entries_each_phase))
+        entries_each_phase = [list(entries) for entries in entries_each_phase]
+
+        # Intern the IDs of all nodes first, so that parent IDs are resolved regardless of the order of the nodes.
+        if rows is not None:
+            store._rows = dict(rows)
+            store._ids = list(rows)
+        else:
+            for entries in entries_each_phase:
+                for entry in entries:
+                    store._rows[entry[0]] = len(store._ids)
+                    store._ids.append(entry[0])
+
+        for phase_index, entries in enumerate(entries_each_phase):
+            for id, name, link, parent_ids, create_datetime, dummy, cx, cy in entries:
+                parent_rows = []
+                for parent_id in sorted(parent_ids):
+                    parent_row = store._rows.get(parent_id)
+                    if parent_row is None:
+                        parent_row = len(store._ids)
+                        store._rows[parent_id] = parent_row
+                        store._ids.append(parent_id)
+                    parent_rows.append(parent_row)
+                store._append_columns(phase_index, name, link, parent_rows, create_datetime, dummy, cx, cy)
+
+        # Placeholder rows for parent IDs not belonging to any phase
+        for _ in range(len(store._names), len(store._ids)):
+            store._append_columns(-1, '', '', [], 0, False, 0, 0)
+
+        row = 0
+        for phase_index, entries in enumerate(entries_each_phase):
+            store._phase_rows[phase_index] = array('l', range(row, row + len(entries)))
+            row += len(entries)
+        return store
+
+    def _append_columns(self, phase_index:int, name:str, link:str, parent_rows:List[int], create_datetime:int, dummy:bool, cx:int, cy:int):
+        self._names.append(name)
+        self._links.append(link)
+        self._phase_indexes.append(phase_index)
+        self._create_datetimes.append(create_datetime)
+        self._dummy_flags.append(1 if dummy else 0)
+        self._parent_rows.extend(parent_rows)
+        self._parent_offsets.append(len(self._parent_rows))
+        self._cx.append(cx)
+        self._cy.append(cy)
+
+    def add_row(self, phase_index:int, id:str, name:str, link:str, parent_rows:List[int], create_datetime:int, dummy:bool=False)->int:
+        """Add a node to the end of the store. The node is not added to the rows of the phase.
+
+        Args:
+            phase_index (int): [index of the phase containing the node]
+            id (str): [node ID]
+            name (str): [node name]
+            link (str): [link]
+            parent_rows (List[int]): [rows of the parent nodes]
+            create_datetime (int): [Creation datetime (Unix time)]
+            dummy (bool, optional): [True if the node is a dummy node]. Defaults to False.
+
+        Returns:
+            int: [row of the added node]
+        """
+        row = len(self._ids)
+        self._ids.append(id)
+        self._rows[id] = row
+        self._append_columns(phase_index, name, link, parent_rows, create_datetime, dummy, 0, 0)
+        return row
+
+    def remove_row(self, row:int):
+        """Detach a row from its phase. The row is kept as a placeholder with phase index -1 and its ID is released.
+        The row is not removed from the rows of the phase.
+
+        Args:
+            row (int): [row]
+        """
+        self._phase_indexes[row] = -1
+        if self._rows.get(self._ids[row]) == row:
+            del self._rows[self._ids[row]]
+
+    def set_name(self, row:int, name:str):
+        self._names[row] = name
+
+    def set_layer_parents(self, layer_parent_rows:Dict[int, List[int]]):
+        """Set the parent rows used for drawing (parents in the previous phase) of rows.
+        Other rows keep their parent rows for drawing.
+
+        Args:
+            layer_parent_rows (Dict[int, List[int]]): [parent rows for drawing of each row]
+        """
+        for row, parent_rows in layer_parent_rows.items():
+            self.set_layer_parent_rows(row, parent_rows)
+
+    def set_layer_parent_rows(self, row:int, parent_rows:Optional[List[int]]):
+        """Set the parent rows used for drawing of a row.
+
+        Args:
+            row (int): [row]
+            parent_rows (Optional[List[int]]): [parent rows for drawing. None to use the parent rows]
+        """
+        if parent_rows is None:
+            self._layer_parent_rows.pop(row, None)
+        else:
+            self._layer_parent_rows[row] = array('l', parent_rows)
+
+    def get_parent_rows(self, row:int)->array:
+        """Obtain the rows of the parent nodes.
+
+        Args:
+            row (int): [row of the node]
+
+        Returns:
+            array: [rows of the parent nodes]
+        """
+        return self._parent_rows[self._parent_offsets[row]:self._parent_offsets[row+1]]
+
+    def get_layer_parent_rows(self, row:int)->array:
+        """Obtain the rows of the parent nodes used for drawing.
+
+        Args:
+            row (int): [row of the node]
+
+        Returns:
+            array: [rows of the parent nodes]
+        """
+        parent_rows = self._layer_parent_rows.get(row)
+        if parent_rows is None:
+            return self.get_parent_rows(row)
+        return parent_rows
+
+    def get_id(self, row:int)->str:
+        return self._ids[row]
+
+    def get_row(self, id:str)->int:
+        """Obtain the row of the node ID.
+
+        Args:
+            id (str): [node ID]
+
+        Returns:
+            int: [row. -1 if the ID is not registered]
+        """
+        return self._rows.get(id, -1)
+
+    def is_dummy(self, row:int)->bool:
+        return self._dummy_flags[row] == 1
+
+    def get_node(self, row:int)->Node:
+        """Obtain a node instance as a view of the row.
+
+        Args:
+            row (int): [row of the node]
+
+        Returns:
+            Node: [Node, or DummyNode for dummy rows]
+        """
+        node_class = DummyNode if self._dummy_flags[row] else Node
+        return node_class(
+            id=self._ids[row],
+            parent_ids=[self._ids[parent_row] for parent_row in self.get_layer_parent_rows(row)],
+            create_datetime=self._create_datetimes[row],
+            node_name=self._names[row],
+            href=self._links[row],
+            cx=self._cx[row],
+            cy=self._cy[row],
+        )
+
+    def get_nodes_each_phase(self)->List[List[Node]]:
+        """Obtain node instances of each phase as views of the rows.
+
+        Returns:
+            List[List[Node]]: [Group of node data divided by phase]
+        """
+        return [[self.get_node(row) for row in rows] for rows in self._phase_rows]
+
+    def iter_rows(self)->Iterator[Tuple[int, int]]:
+        """Iterate over the rows of every phase.
+
+        Yields:
+            Tuple[int, int]: [phase index and row]
+        """
+        for phase_index, rows in enumerate(self._phase_rows):
+            for row in rows:
+                yield phase_index, row
+
+    def set_phase_rows(self, phase_index:int, rows:array):
+        self._phase_rows[phase_index] = rows
+
+    '''
+    getter
+    '''
+    @property
+    def phase_num(self)->int:
+        return len(self._phase_rows)
+
+    @property
+    def phase_rows(self)->List[array]:
+        return self._phase_rows
+
+    @property
+    def phase_indexes(self)->array:
+        return self._phase_indexes
+
+    @property
+    def create_datetimes(self)->array:
+        return self._create_datetimes
+
+    @property
+    def cx(self)->array:
+        return self._cx
+
+    @property
+    def cy(self)->array:
+        return self._cy
+
+    def __len__(self)->int:
+        return len(self._ids)
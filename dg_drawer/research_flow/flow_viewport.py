@@ -0,0 +1,263 @@
+from array import array
+from bisect import bisect_left, bisect_right
+import math
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow.component.badge import Badge
+from dg_drawer.research_flow.component.line import Line
+from dg_drawer.research_flow.flow_store import FlowStore
+
+if TYPE_CHECKING:
+    # flow_drawer imports this module
+    from dg_drawer.research_flow.flow_drawer import FlowDrawer
+
+
+class FlowViewport():
+    """FlowViewport class
+
+    Drawing of windows (tiles) of a laid out research flow history image. Obtain an instance with FlowDrawer.viewport().
+
+    A window is a range of phases and a vertical range given in pixels or in rows.
+    Only the frame, the nodes, the labels, the lines and the badges (see LevelOfDetail) inside the window are drawn, with the coordinates of
+    the whole image and a viewBox clipping the lines crossing its edges, so tiles can be placed side by side.
+    The lines between each pair of adjacent phases are indexed by their vertical extent when the instance is created.
+    A window then costs O(log N + K) (N : nodes, K : nodes and lines in the window, plus the lines starting less
+    than the longest line of the pair of phases above the window).
+
+    In the 'polyline' long edge mode, the lines to parent nodes several phases before are drawn phase by phase.
+    """
+
+    # Vertical extent of a node and its label around the center of the node (see FlowDrawer.style_node() and Node.get_lable_svg_component())
+    NODE_EXTENT_ABOVE = 27
+    NODE_EXTENT_BELOW = 10
+
+    def __init__(self, drawer:'FlowDrawer', store:FlowStore, phase_width:int, body_height:int) -> None:
+        """FlowViewport constructor
+
+        Args:
+            drawer (FlowDrawer): [drawer of the research flow history]
+            store (FlowStore): [store of the positioned nodes]
+            phase_width (int): [phase width]
+            body_height (int): [height of the body part]
+        """
+        self._drawer = drawer
+        self._store = store
+        self._phase_width = phase_width
+        self._body_height = body_height
+        # Lines between each phase and the previous phase, in the order of their top
+        self._line_tops:List[array] = [array('l')]
+        self._line_bottoms:List[array] = [array('l')]
+        self._line_points:List[array] = [array('l')]
+        self._max_line_heights:List[int] = [0]
+        for phase_index in range(1, store.phase_num):
+            self._index_lines(phase_index)
+        # Badges of the compressed chains, in the order of their top
+        self._badges = sorted(((Badge(value=value, x=x, y=y).get_box(), value, x, y) for value, x, y in drawer.get_badges(store)),
+                              key=lambda badge : badge[0][1])
+        self._badge_tops = [box[1] for box, _, _, _ in self._badges]
+        self._max_badge_height = max((box[3] for box, _, _, _ in self._badges), default=0)
+
+    def _index_lines(self, phase_index:int):
+        """Index the lines between a phase and the previous phase by their top.
+
+        Args:
+            phase_index (int): [phase index]
+        """
+        store = self._store
+        phase_indexes = store.phase_indexes
+        cx = store.cx
+        cy = store.cy
+        lines = []
+        for row in store.phase_rows[phase_index]:
+            for parent_row in store.get_layer_parent_rows(row):
+                if phase_indexes[parent_row] == phase_index-1:
+                    lines.append((min(cy[parent_row], cy[row]), max(cy[parent_row], cy[row]), cx[parent_row], cy[parent_row], cx[row], cy[row]))
+        lines.sort()
+
+        points = array('l')
+        for line in lines:
+            points.extend(line[2:])
+        self._line_tops.append(array('l', (line[0] for line in lines)))
+        self._line_bottoms.append(array('l', (line[1] for line in lines)))
+        self._line_points.append(points)
+        self._max_line_heights.append(max((line[1] - line[0] for line in lines), default=0))
+
+    @property
+    def width(self)->int:
+        return self._phase_width * self._store.phase_num
+
+    @property
+    def height(self)->int:
+        return self._body_height + self._drawer._header_height
+
+    def get_window(self, phases:Optional[Tuple[int, int]]=None, y_range:Optional[Tuple[int, int]]=None,
+                   rows:Optional[Tuple[int, int]]=None)->Tuple[int, int, int, int]:
+        """Obtain the area of a window in the coordinates of the whole image.
+
+        Args:
+            phases (Optional[Tuple[int, int]], optional): [start and stop indexes of the phases]. Defaults to None (every phase).
+
+            y_range (Optional[Tuple[int, int]], optional): [top and bottom (pixels) of the window]. Defaults to None.
+
+            rows (Optional[Tuple[int, int]], optional): [start and stop indexes of the rows of the phases. The window spans
+                                                        half of the vertical distance between nodes above and below them]. Defaults to None.
+
+        Raises:
+            ArgError: [Error if both y_range and rows are given, or a range is empty]
+
+        Returns:
+            Tuple[int, int, int, int]: [x, y, width and height of the window]
+        """
+        phase_start, phase_stop = self._clip_range(phases, 0, self._store.phase_num, 'phases')
+        if y_range is not None and rows is not None:
+            raise ArgError('Only one of y_range and rows can be given')
+        if rows is not None:
+            row_start, row_stop = rows
+            if row_start >= row_stop:
+                raise ArgError(f'Empty range of rows : {rows}')
+            spacing = self._drawer._between_node_vertical_length
+            first_y = self._drawer._header_height + self._drawer._top_margin
+            y_range = (first_y + row_start * spacing - spacing // 2, first_y + (row_stop - 1) * spacing + spacing - spacing // 2)
+        y_start, y_stop = self._clip_range(y_range, 0, self.height, 'y_range')
+        x_start = phase_start * self._phase_width
+        return (x_start, y_start, phase_stop * self._phase_width - x_start, y_stop - y_start)
+
+    @staticmethod
+    def _clip_range(value_range:Optional[Tuple[int, int]], lower:int, upper:int, name:str)->Tuple[int, int]:
+        if value_range is None:
+            return lower, upper
+        start = max(value_range[0], lower)
+        stop = min(value_range[1], upper)
+        if start >= stop:
+            raise ArgError(f'Empty range of {name} : {value_range}')
+        return start, stop
+
+    def draw(self, phases:Optional[Tuple[int, int]]=None, y_range:Optional[Tuple[int, int]]=None,
+             rows:Optional[Tuple[int, int]]=None)->str:
+        """Drawing a window of the research flow history as SVG data
+
+        Args:
+            phases (Optional[Tuple[int, int]], optional): [start and stop indexes of the phases]. Defaults to None (every phase).
+
+            y_range (Optional[Tuple[int, int]], optional): [top and bottom (pixels) of the window]. Defaults to None.
+
+            rows (Optional[Tuple[int, int]], optional): [start and stop indexes of the rows of the phases]. Defaults to None.
+
+        Raises:
+            ArgError: [Error if both y_range and rows are given, or a range is empty]
+
+        Returns:
+            str: [SVG data of the window]
+        """
+        return ''.join(self.iter_svg(phases, y_range, rows))
+
+    def iter_svg(self, phases:Optional[Tuple[int, int]]=None, y_range:Optional[Tuple[int, int]]=None,
+                 rows:Optional[Tuple[int, int]]=None)->Iterator[str]:
+        """Drawing a window of the research flow history as SVG data fragments
+
+        Args:
+            phases (Optional[Tuple[int, int]], optional): [start and stop indexes of the phases]. Defaults to None (every phase).
+
+            y_range (Optional[Tuple[int, int]], optional): [top and bottom (pixels) of the window]. Defaults to None.
+
+            rows (Optional[Tuple[int, int]], optional): [start and stop indexes of the rows of the phases]. Defaults to None.
+
+        Raises:
+            ArgError: [Error if both y_range and rows are given, or a range is empty]
+
+        Yields:
+            str: [fragment of the SVG data of the window]
+        """
+        drawer = self._drawer
+        store = self._store
+        x, y, width, height = self.get_window(phases, y_range, rows)
+        phase_start = x // self._phase_width
+        phase_stop = (x + width) // self._phase_width
+        y_stop = y + height
+
+        yield drawer.get_svg_start_tag(width, height, (x, y, width, height))
+        style = drawer.get_style(store.phase_num)
+        if style is not None:
+            yield style.generate_svg_component()
+
+        header_height = drawer._header_height
+        yield from drawer.iter_svg_frame(self._phase_width, self._body_height, range(phase_start, phase_stop),
+                                         headers=y < header_height, bodies=y_stop > header_height)
+
+        # Lines from the phase before the window and to the phase after the window cross its sides.
+        lines = []
+        for phase_index in range(max(phase_start, 1), min(phase_stop+1, store.phase_num)):
+            lines.extend(self.iter_window_lines(phase_index, y, y_stop))
+        yield from drawer.iter_svg_lines(lines)
+
+        row_ranges = [(phase_index,) + self.get_row_range(phase_index, y, y_stop) for phase_index in range(phase_start, phase_stop)]
+        for phase_index, start, stop in row_ranges:
+            if start < stop:
+                yield from drawer.iter_phase_svg_nodes(store, phase_index, start, stop)
+        for phase_index, start, stop in row_ranges:
+            if start < stop:
+                yield from drawer.iter_phase_svg_labels(store, phase_index, start, stop)
+        yield from drawer.get_renderer().iter_svg_badges(self.iter_window_badges(x, y, x + width, y_stop))
+
+        yield '</svg>'
+
+    def iter_window_lines(self, phase_index:int, y_start:int, y_stop:int)->Iterator[Line]:
+        """Generate the lines between a phase and the previous phase whose vertical extent overlaps a window.
+
+        Args:
+            phase_index (int): [phase index]
+            y_start (int): [top of the window]
+            y_stop (int): [bottom of the window]
+
+        Yields:
+            Line: [line between nodes]
+        """
+        tops = self._line_tops[phase_index]
+        bottoms = self._line_bottoms[phase_index]
+        points = self._line_points[phase_index]
+        # Lines whose top is more than the longest line above the window end above it.
+        start = bisect_left(tops, y_start - self._max_line_heights[phase_index])
+        stop = bisect_right(tops, y_stop)
+        for index in range(start, stop):
+            if bottoms[index] >= y_start:
+                offset = index * 4
+                yield Line.from_points(points[offset], points[offset+1], points[offset+2], points[offset+3])
+
+    def iter_window_badges(self, x_start:int, y_start:int, x_stop:int, y_stop:int)->Iterator[Tuple[str, int, int]]:
+        """Generate the badges overlapping a window. A badge on a line crossing the side of the window is partly drawn.
+
+        Args:
+            x_start (int): [left of the window]
+            y_start (int): [top of the window]
+            x_stop (int): [right of the window]
+            y_stop (int): [bottom of the window]
+
+        Yields:
+            Tuple[str, int, int]: [value and coordinates of a badge]
+        """
+        start = bisect_left(self._badge_tops, y_start - self._max_badge_height)
+        stop = bisect_left(self._badge_tops, y_stop)
+        for (box_x, box_y, box_width, box_height), value, x, y in self._badges[start:stop]:
+            if box_y + box_height > y_start and box_x < x_stop and box_x + box_width > x_start:
+                yield value, x, y
+
+    def get_row_range(self, phase_index:int, y_start:int, y_stop:int)->Tuple[int, int]:
+        """Obtain the range of the rows of a phase whose node or label overlaps a window.
+
+        Args:
+            phase_index (int): [phase index]
+            y_start (int): [top of the window]
+            y_stop (int): [bottom of the window]
+
+        Returns:
+            Tuple[int, int]: [start and stop indexes in the rows of the phase]
+        """
+        drawer = self._drawer
+        row_num = len(self._store.phase_rows[phase_index])
+        spacing = drawer._between_node_vertical_length
+        first_y = drawer._header_height + drawer._top_margin
+        # The rows of a phase are spaced evenly from the top of the body part (see FlowDrawer.set_phase_row_locations()).
+        start = math.ceil((y_start - self.NODE_EXTENT_BELOW - first_y) / spacing)
+        stop = math.floor((y_stop + self.NODE_EXTENT_ABOVE - first_y) / spacing) + 1
+        return min(max(start, 0), row_num), min(max(stop, 0), row_num)
@@ -0,0 +1,247 @@
+import codecs
+import json
+from typing import Any, Callable, Iterator, Optional, Union
+
+
+class JSONReader():
+    """JSONReader class
+
+    Pull reader of JSON text read in chunks from a file-like object.
+
+    The structure of containers (objects and arrays) is walked token by token with iter_object() and iter_array(),
+    and values are decoded one by one with read_value(). Only the unread part of the current chunk and
+    the value being decoded are held in memory, so large JSON files can be read with little memory.
+    """
+
+    def __init__(self, read:Callable[[int], Union[str, bytes]], chunk_size:int=65536, encoding:str='utf-8-sig') -> None:
+        """JSONReader constructor
+
+        Args:
+            read (Callable[[int], Union[str, bytes]]): [read method of a file-like object. It returns str or bytes]
+
+            chunk_size (int, optional): [number of characters (bytes) read at a time]. Defaults to 65536.
+
+            encoding (str, optional): [encoding of bytes data]. Defaults to 'utf-8-sig' (UTF-8 with or without BOM).
+        """
+        self._read = read
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._decode = json.JSONDecoder().raw_decode
+        self._buffer = ''
+        self._pos = 0
+        self._offset = 0 # position of the buffer in the whole text
+        self._eof = False
+
+    @classmethod
+    def from_text(cls, text:str)->'JSONReader':
+        """Create a reader of JSON text already in memory.
+
+        Args:
+            text (str): [JSON text]
+
+        Returns:
+            JSONReader: [reader]
+        """
+        reader = cls(read=lambda size: '')
+        reader._buffer = text
+        reader._eof = True
+        return reader
+
+    def _fill(self, size:int)->bool:
+        """Read the next chunk into the buffer. The consumed part of the buffer is dropped.
+
+        Args:
+            size (int): [minimum number of characters to read]
+
+        Returns:
+            bool: [False if the end of the data has been reached]
+        """
+        if self._eof:
+            return False
+        self._offset += self._pos
+        buffer = self._buffer[self._pos:]
+        self._pos = 0
+        chunks = [buffer]
+        read_size = 0
+        while read_size < size:
+            data = self._read(self._chunk_size)
+            if isinstance(data, bytes):
+                # A chunk may end in the middle of a multibyte character.
+                chunk = self._decoder.decode(data, final=len(data) == 0)
+            else:
+                chunk = data
+            if len(data) == 0:
+                self._eof = True
+                break
+            chunks.append(chunk)
+            read_size += len(chunk)
+        self._buffer = ''.join(chunks)
+        return read_size > 0
+
+    def peek(self)->str:
+        """Skip whitespaces and obtain the next character without consuming it.
+
+        Returns:
+            str: [next character. '' at the end of the data]
+        """
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            length = len(buffer)
+            while pos < length and buffer[pos] in ' \t\n\r':
+                pos += 1
+            self._pos = pos
+            if pos < length:
+                return buffer[pos]
+            if not self._fill(self._chunk_size):
+                return ''
+
+    def expect(self, char:str):
+        """Consume the next character.
+
+        Args:
+            char (str): [expected character]
+
+        Raises:
+            json.JSONDecodeError: [Error if the next character is not the expected character]
+        """
+        if self.peek() != char:
+            raise self._error(f'Expecting {char!r}')
+        self._pos += 1
+
+    def read_value(self)->Any:
+        """Decode the next value. Containers are decoded whole.
+
+        Returns:
+            Any: [decoded value]
+
+        Raises:
+            json.JSONDecodeError: [Error if the data is not valid JSON]
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # The value may continue in the next chunk.
+                if self._fill(len(self._buffer) - self._pos + self._chunk_size):
+                    continue
+                raise self._error('Expecting value')
+            # A number at the end of the buffer may continue in the next chunk (ex. '12' + '.5').
+            if end < len(self._buffer) and self._buffer[end] not in '.eE+-0123456789' or not self._fill(self._chunk_size):
+                self._pos = end
+                return value
+
+    def iter_object(self)->Iterator[str]:
+        """Iterate over the keys of the next object.
+        The value of each key must be consumed (read_value(), iter_object(), iter_array() or skip_value()) before the next key.
+
+        Yields:
+            str: [key]
+
+        Raises:
+            json.JSONDecodeError: [Error if the data is not a valid JSON object]
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error('Expecting property name enclosed in double quotes')
+            key = self.read_value()
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def iter_array(self)->Iterator[int]:
+        """Iterate over the items of the next array.
+        Each item must be consumed before the next item.
+
+        Yields:
+            int: [index of the item]
+
+        Raises:
+            json.JSONDecodeError: [Error if the data is not a valid JSON array]
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            char = self.peek()
+            self._pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def iter_values(self)->Iterator[Any]:
+        """Iterate over the decoded items of the next array.
+
+        Yields:
+            Any: [decoded item]
+
+        Raises:
+            json.JSONDecodeError: [Error if the data is not a valid JSON array]
+        """
+        for _ in self.iter_array():
+            yield self.read_value()
+
+    def skip_value(self):
+        """Consume the next value without keeping it.
+        """
+        char = self.peek()
+        if char == '{':
+            for _ in self.iter_object():
+                self.skip_value()
+        elif char == '[':
+            for _ in self.iter_array():
+                self.skip_value()
+        else:
+            self.read_value()
+
+    def expect_end(self):
+        """Check that only whitespaces remain.
+
+        Raises:
+            json.JSONDecodeError: [Error if extra data remains]
+        """
+        if self.peek() != '':
+            raise self._error('Extra data')
+
+    @property
+    def position(self)->int:
+        """Position (number of characters) of the reader in the whole text.
+        """
+        return self._offset + self._pos
+
+    def _error(self, msg:str)->json.JSONDecodeError:
+        # The document, the line and the column are relative to the current buffer. The position is made absolute.
+        error = json.JSONDecodeError(msg, self._buffer, self._pos)
+        error.pos = self.position
+        error.args = (f'{msg}: char {self.position}',)
+        return error
+
+
+def get_ijson() -> Optional[Any]:
+    """Obtain the ijson module if it is installed.
+
+    Returns:
+        Optional[Any]: [ijson module. None if it is not installed]
+    """
+    try:
+        import ijson
+    except ImportError:
+        return None
+    return ijson
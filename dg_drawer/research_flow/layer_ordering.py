@@ -0,0 +1,187 @@
+from array import array
+from typing import Callable, Dict, List
+
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow.flow_store import FlowStore
+
+
+class LayerOrdering():
+    """LayerOrdering class
+
+    Reordering of the rows of each phase of a store to reduce the crossings of the lines between adjacent phases.
+
+    Starting from the current order, the phases are swept forward (each row is placed at the barycenter or the median
+    of the positions of its parents in the previous phase) and backward (at the barycenter or the median of
+    the positions of its children in the next phase). Rows without parents (children) keep their positions.
+    Crossings are counted after each sweep and the order with the fewest crossings is kept.
+
+    A sweep takes O(E + N log N) time and counting crossings O(E log N) time (E : lines, N : rows).
+    """
+
+    METHODS = ('barycenter', 'median')
+
+    def __init__(self, store:FlowStore) -> None:
+        """LayerOrdering constructor
+
+        Args:
+            store (FlowStore): [store of the nodes. The parent rows for drawing must be in the previous phase (after FlowDrawer.fill_dummy_rows())]
+        """
+        self._store = store
+        self._positions = array('l', [0]) * len(store)
+        self._parents:Dict[int, array] = {}
+        self._children:Dict[int, List[int]] = {}
+        for phase_index in range(1, store.phase_num):
+            for row in store.phase_rows[phase_index]:
+                parent_rows = store.get_layer_parent_rows(row)
+                self._parents[row] = parent_rows
+                for parent_row in parent_rows:
+                    self._children.setdefault(parent_row, []).append(row)
+        for phase_index in range(store.phase_num):
+            self._update_positions(phase_index)
+
+    def order(self, method:str='barycenter', iterations:int=4)->int:
+        """Reorder the rows of each phase of the store.
+
+        Args:
+            method (str, optional): [position of a row among its neighbors. 'barycenter' or 'median']. Defaults to 'barycenter'.
+
+            iterations (int, optional): [maximum number of forward and backward sweeps]. Defaults to 4.
+
+        Raises:
+            ArgError: [Error if the method is not supported or iterations is negative]
+
+        Returns:
+            int: [number of crossings of the kept order]
+        """
+        if method not in self.METHODS:
+            raise ArgError(f'Unsupported ordering method [{method}]. Supported methods : {list(self.METHODS)}')
+        if iterations < 0:
+            raise ArgError(f'iterations must be 0 or more : {iterations}')
+        get_key = self._get_barycenter if method == 'barycenter' else self._get_median
+
+        store = self._store
+        best_crossings = self.count_crossings()
+        best_phase_rows = list(store.phase_rows)
+        for _ in range(iterations):
+            if best_crossings == 0:
+                break
+            improved = False
+            for phase_indexes, neighbors in (
+                        (range(1, store.phase_num), self._parents),
+                        (range(store.phase_num-2, -1, -1), self._children),
+                    ):
+                for phase_index in phase_indexes:
+                    self._sweep_phase(phase_index, neighbors, get_key)
+                crossings = self.count_crossings()
+                if crossings < best_crossings:
+                    best_crossings = crossings
+                    best_phase_rows = list(store.phase_rows)
+                    improved = True
+            if not improved:
+                break
+
+        for phase_index, rows in enumerate(best_phase_rows):
+            store.set_phase_rows(phase_index, rows)
+            self._update_positions(phase_index)
+        return best_crossings
+
+    def count_crossings(self)->int:
+        """Count the crossings of the lines between adjacent phases in the current order.
+
+        Returns:
+            int: [number of crossings]
+        """
+        store = self._store
+        crossings = 0
+        for phase_index in range(1, store.phase_num):
+            crossings += self._count_phase_crossings(phase_index)
+        return crossings
+
+    def _count_phase_crossings(self, phase_index:int)->int:
+        """Count the crossings of the lines between a phase and the previous phase.
+
+        Two lines cross if the order of their parents and the order of their children are opposite.
+        The lines are sorted by the positions of the children, then the inversions of the positions of
+        the parents are counted with a Fenwick tree.
+
+        Args:
+            phase_index (int): [phase index]
+
+        Returns:
+            int: [number of crossings]
+        """
+        positions = self._positions
+        parents = self._parents
+        pre_phase_num = len(self._store.phase_rows[phase_index-1])
+
+        tree = [0] * (pre_phase_num + 1)
+        inserted = 0
+        crossings = 0
+        # The rows are in the order of their positions.
+        for row in self._store.phase_rows[phase_index]:
+            for parent_row in parents[row]:
+                # Number of inserted lines whose parent is after this parent (lines to the same child do not cross)
+                i = positions[parent_row] + 1
+                not_after = 0
+                while i > 0:
+                    not_after += tree[i]
+                    i -= i & -i
+                crossings += inserted - not_after
+            for parent_row in parents[row]:
+                i = positions[parent_row] + 1
+                while i <= pre_phase_num:
+                    tree[i] += 1
+                    i += i & -i
+                inserted += 1
+        return crossings
+
+    def _sweep_phase(self, phase_index:int, neighbors:Dict[int, List[int]], get_key:Callable[[List[int]], float]):
+        """Reorder the rows of a phase by the positions of their neighbors in the adjacent phase.
+
+        Args:
+            phase_index (int): [phase index]
+            neighbors (Dict[int, List[int]]): [parent rows or child rows of each row]
+            get_key (Callable[[List[int]], float]): [key of a row from the sorted positions of its neighbors]
+        """
+        store = self._store
+        positions = self._positions
+        rows = store.phase_rows[phase_index]
+
+        keyed_rows = []
+        fixed_indexes = []
+        for index, row in enumerate(rows):
+            neighbor_rows = neighbors.get(row)
+            if neighbor_rows:
+                keyed_rows.append((get_key(sorted(positions[neighbor_row] for neighbor_row in neighbor_rows)), index, row))
+            else:
+                fixed_indexes.append(index)
+        if len(keyed_rows) <= 1:
+            return
+        # Ties keep the current order.
+        keyed_rows.sort()
+
+        # Rows without neighbors keep their positions, the other rows fill the remaining positions.
+        sorted_rows = array('l', rows)
+        fixed = set(fixed_indexes)
+        keyed_iter = iter(keyed_rows)
+        for index in range(len(rows)):
+            if index not in fixed:
+                sorted_rows[index] = next(keyed_iter)[2]
+        store.set_phase_rows(phase_index, sorted_rows)
+        self._update_positions(phase_index)
+
+    def _update_positions(self, phase_index:int):
+        positions = self._positions
+        for position, row in enumerate(self._store.phase_rows[phase_index]):
+            positions[row] = position
+
+    @staticmethod
+    def _get_barycenter(sorted_positions:List[int])->float:
+        return sum(sorted_positions) / len(sorted_positions)
+
+    @staticmethod
+    def _get_median(sorted_positions:List[int])->float:
+        middle = len(sorted_positions) // 2
+        if len(sorted_positions) % 2 == 1:
+            return sorted_positions[middle]
+        return (sorted_positions[middle-1] + sorted_positions[middle]) / 2
@@ -0,0 +1,533 @@
+from contextlib import nullcontext
+import hashlib
+import json
+from typing import Callable, ContextManager, Iterable, Iterator, Optional, Tuple, Union
+
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow.component.badge import Badge
+from dg_drawer.research_flow.component.frame import Frame
+from dg_drawer.research_flow.component.line import Line
+from dg_drawer.research_flow.component.node import Node, DummyNode
+from dg_drawer.research_flow.component.polyline import Polyline
+from dg_drawer.research_flow.component.svg_style import SvgStyle
+from dg_drawer.research_flow.enums.color import ColorType
+from dg_drawer.research_flow.flow_layout import FlowLayout
+from dg_drawer.research_flow.flow_store import FlowStore
+
+# Context of the drawing stages without stats
+_NO_STAGE = nullcontext()
+
+
+class SvgRenderer():
+    """SvgRenderer class
+
+    Drawing of a layout (FlowLayout) as SVG data. The same layout can be drawn by several renderers (ex. one per style mode).
+
+    With an element ID prefix, every element has a stable ID derived from the IDs of its sub flows (see get_element_id()),
+    and the elements are grouped in <g> elements with IDs : '<prefix>frame' (style sheet and frame), '<prefix>lines', '<prefix>nodes' and '<prefix>labels'.
+    A client can then apply the patches of FlowDiff to the SVG DOM instead of loading the whole SVG data again.
+    """
+
+    LINE_MODES = ('line', 'path')
+    LONG_EDGE_MODES = ('dummy', 'polyline')
+    STYLE_MODES = ('inline', 'css')
+    # Element groups of the elements with IDs, in drawing order
+    LAYERS = ('lines', 'nodes', 'labels')
+    # Namespace declared by the svg element of a standalone SVG document
+    SVG_NAMESPACE = 'http://www.w3.org/2000/svg'
+
+    __slots__ = ('_line_mode', '_long_edge_mode', '_style_mode', '_element_id_prefix')
+
+    def __init__(self, line_mode:str='line', long_edge_mode:str='dummy', style_mode:str='inline', element_id_prefix:str=None) -> None:
+        """SvgRenderer constructor
+
+        Args:
+            line_mode (str, optional): [Drawing of inter-node lines. 'line' : one line element per line, 'path' : one path element per line style]. Defaults to 'line'.
+
+            long_edge_mode (str, optional): [Drawing of lines to parent nodes two or more phases before. 'dummy' : invisible dummy nodes in the phases between, joined by lines,
+                                            'polyline' : one polyline per line, bent at the reserved positions of the phases between (no dummy node is drawn)]. Defaults to 'dummy'.
+
+            style_mode (str, optional): [Styling of the elements. 'inline' : presentation attributes on every element,
+                                        'css' : compact SVG data with a style sheet of classes, nodes referring to a shared circle and no invisible element (see SvgStyle)].
+                                        Defaults to 'inline'.
+
+            element_id_prefix (str, optional): [prefix of the element IDs]. Defaults to None (no element ID).
+
+        Raises:
+            ArgError: [Error if line_mode, long_edge_mode or style_mode is not supported, or element IDs are given in the 'path' line mode]
+        """
+        if line_mode not in self.LINE_MODES:
+            raise ArgError(f'Unsupported line mode [{line_mode}]. Supported line modes : {list(self.LINE_MODES)}')
+        if long_edge_mode not in self.LONG_EDGE_MODES:
+            raise ArgError(f'Unsupported long edge mode [{long_edge_mode}]. Supported long edge modes : {list(self.LONG_EDGE_MODES)}')
+        if style_mode not in self.STYLE_MODES:
+            raise ArgError(f'Unsupported style mode [{style_mode}]. Supported style modes : {list(self.STYLE_MODES)}')
+        if element_id_prefix is not None and line_mode == 'path':
+            # One path element draws many lines.
+            raise ArgError('Element IDs are not supported in the \'path\' line mode')
+        self._line_mode = line_mode
+        self._long_edge_mode = long_edge_mode
+        self._style_mode = style_mode
+        self._element_id_prefix = element_id_prefix
+
+    @property
+    def element_id_prefix(self)->Optional[str]:
+        return self._element_id_prefix
+
+    def render(self, layout:FlowLayout)->str:
+        """Drawing a layout as SVG data
+
+        Args:
+            layout (FlowLayout): [layout of the research flow history]
+
+        Returns:
+            str: [research flow history as SVG data]
+        """
+        return ''.join(self.iter_svg(layout))
+
+    def iter_svg(self, layout:FlowLayout, stage:Callable[[str], ContextManager]=None)->Iterator[str]:
+        """Drawing a layout as SVG data fragments
+        (svg start tag, style sheet in the 'css' style mode, frame, lines, nodes, node labels, badges and svg end tag).
+
+        Args:
+            layout (FlowLayout): [layout of the research flow history]
+
+            stage (Callable[[str], ContextManager], optional): [function obtaining the context recording a drawing stage
+                                                               ('frame', 'lines', 'nodes' and 'labels') from its name]. Defaults to None.
+
+        Yields:
+            str: [fragment of research flow history SVG data]
+        """
+        if self._element_id_prefix is not None:
+            yield from self._iter_svg_with_element_ids(layout, stage)
+            return
+
+        store = layout.store
+        phase_num = store.phase_num
+
+        yield self.get_svg_start_tag(layout.width, layout.height)
+
+        ## SVG data for the frame (header + body)
+        with _NO_STAGE if stage is None else stage('frame'):
+            style = self.get_style(phase_num)
+            if style is not None:
+                yield style.generate_svg_component()
+            yield from self.iter_svg_frame(layout.get_frame())
+
+        ## SVG data for inter-node lines
+        with _NO_STAGE if stage is None else stage('lines'):
+            yield from self.iter_svg_lines(self.iter_row_lines(store))
+
+        ## SVG data of nodes
+        with _NO_STAGE if stage is None else stage('nodes'):
+            for index in range(phase_num):
+                yield from self.iter_phase_svg_nodes(store, index)
+
+        ## SVG data of node labels
+        with _NO_STAGE if stage is None else stage('labels'):
+            for index in range(phase_num):
+                yield from self.iter_phase_svg_labels(store, index)
+            yield from self.iter_svg_badges(layout.badges)
+
+        yield '</svg>'
+
+    def _iter_svg_with_element_ids(self, layout:FlowLayout, stage:Callable[[str], ContextManager]=None)->Iterator[str]:
+        """Drawing a layout as SVG data fragments, with element IDs and element groups.
+
+        Args:
+            layout (FlowLayout): [layout of the research flow history]
+            stage (Callable[[str], ContextManager], optional): [function obtaining the context recording a drawing stage from its name]. Defaults to None.
+
+        Yields:
+            str: [fragment of research flow history SVG data]
+        """
+        yield self.get_svg_start_tag(layout.width, layout.height)
+        with _NO_STAGE if stage is None else stage('frame'):
+            yield self.get_svg_frame_group(layout)
+        for layer in self.LAYERS:
+            with _NO_STAGE if stage is None else stage(layer):
+                group_id = self.get_element_id(layer)
+                yield f'<g id="{group_id}">'
+                for _, svg in self.iter_layer_elements(layout, layer):
+                    yield svg
+                yield '</g>'
+        yield '</svg>'
+
+    def get_element_id(self, kind:str, *ids)->str:
+        """Obtain the ID of an element. The ID only depends on the prefix, the kind and the given IDs,
+        so an element keeps its ID in every version of the research flow history.
+
+        Args:
+            kind (str): [kind of element. 'frame', 'lines', 'nodes' or 'labels' for the element groups,
+                        'n' (node), 't' (node label), 'e' (line between nodes) or 'bd' (badge)]
+            ids : [IDs of the sub flows (parent and child for a line) or coordinates (badge) identifying the element]
+
+        Returns:
+            str: [element ID]
+        """
+        prefix = '' if self._element_id_prefix is None else self._element_id_prefix
+        if len(ids) == 0:
+            return f'{prefix}{kind}'
+        # Sub flow IDs may contain any character, so they are hashed into characters valid in an ID.
+        digest = hashlib.sha256('\x1f'.join(map(str, ids)).encode('utf-8')).hexdigest()[:20]
+        return f'{prefix}{kind}-{digest}'
+
+    @staticmethod
+    def set_element_id(svg:str, element_id:str)->str:
+        """Set the ID of an SVG component as the first attribute of its element.
+
+        Args:
+            svg (str): [SVG component of one element]
+            element_id (str): [element ID]
+
+        Returns:
+            str: [SVG component with the ID]
+        """
+        index = svg.find(' ')
+        if index < 0 or svg.find('>') < index:
+            # element without attributes
+            index = svg.index('>')
+        return f'{svg[:index]} id="{element_id}"{svg[index:]}'
+
+    def get_svg_frame_group(self, layout:FlowLayout)->str:
+        """Obtain the element group of the style sheet and the frame (header + body).
+
+        Args:
+            layout (FlowLayout): [layout of the research flow history]
+
+        Returns:
+            str: [SVG g component]
+        """
+        style = self.get_style(layout.phase_num)
+        fragments = [] if style is None else [style.generate_svg_component()]
+        fragments.extend(self.iter_svg_frame(layout.get_frame()))
+        frame = ''.join(fragments)
+        group_id = self.get_element_id('frame')
+        return f'<g id="{group_id}">{frame}</g>'
+
+    def iter_layer_elements(self, layout:FlowLayout, layer:str)->Iterator[Tuple[str, str]]:
+        """Generate the elements of an element group with their IDs.
+
+        Args:
+            layout (FlowLayout): [layout of the research flow history]
+            layer (str): [element group. 'lines', 'nodes' or 'labels' (with the badges)]
+
+        Raises:
+            ArgError: [Error if the element group is not supported]
+
+        Yields:
+            Tuple[str, str]: [element ID and SVG component with the ID]
+        """
+        for key, svg in self.iter_layer_components(layout, layer):
+            element_id = self.get_element_id(*key)
+            yield element_id, self.set_element_id(svg, element_id)
+
+    def iter_layer_components(self, layout:FlowLayout, layer:str)->Iterator[Tuple[tuple, str]]:
+        """Generate the elements of an element group with the keys of their IDs, without the IDs.
+
+        Args:
+            layout (FlowLayout): [layout of the research flow history]
+            layer (str): [element group. 'lines', 'nodes' or 'labels' (with the badges)]
+
+        Raises:
+            ArgError: [Error if the element group is not supported]
+
+        Yields:
+            Tuple[tuple, str]: [arguments of get_element_id() (kind and IDs) and SVG component]
+        """
+        store = layout.store
+        css = self._style_mode == 'css'
+        if layer == 'lines':
+            for index in range(store.phase_num-1, 0, -1):
+                for parent_row, row, line in self._iter_phase_keyed_lines(store, index):
+                    svg = line.generate_classed_svg_component(SvgStyle.LINE_CLASS) if css else line.generate_svg_component()
+                    yield ('e', store.get_id(parent_row), store.get_id(row)), svg
+        elif layer == 'nodes':
+            for index in range(store.phase_num):
+                class_name = SvgStyle.get_node_class(index)
+                for node in self.iter_phase_row_nodes(store, index):
+                    svg = node.generate_svg_use_component(SvgStyle.NODE_ID, class_name) if css else node.generate_svg_component()
+                    yield ('n', node.id), svg
+        elif layer == 'labels':
+            for index in range(store.phase_num):
+                for node in self.iter_phase_row_nodes(store, index):
+                    if css and len(node.node_name) == 0:
+                        continue
+                    svg = node.get_lable_svg_component(SvgStyle.LABEL_CLASS) if css else node.get_lable_svg_component()
+                    yield ('t', node.id), svg
+            for badge, (_, x, y) in zip(self.iter_svg_badges(layout.badges), layout.badges):
+                # A badge has two elements.
+                yield ('bd', x, y), f'<g>{badge}</g>'
+        else:
+            raise ArgError(f'Unsupported element group [{layer}]. Supported element groups : {list(self.LAYERS)}')
+
+    def get_svg_start_tag(self, width:int, height:int, view_box:Tuple[int, int, int, int]=None)->str:
+        """Obtain the svg start tag.
+
+        Args:
+            width (int): [width of the image]
+            height (int): [height of the image]
+            view_box (Tuple[int, int, int, int], optional): [x, y, width and height of the drawn area]. Defaults to None (whole image).
+
+        Returns:
+            str: [svg start tag]
+        """
+        attributes = f'width="{width}" height="{height}"'
+        if view_box is not None:
+            attributes += ' viewBox="{} {} {} {}"'.format(*view_box)
+        if self._style_mode == 'css':
+            return f'<svg class="{SvgStyle.ROOT_CLASS}" {attributes}>'
+        return f'<svg {attributes}>'
+
+    @classmethod
+    def add_namespace(cls, svg:str)->str:
+        """Declare the SVG namespace in the svg start tag at the beginning of SVG data, to make it a standalone SVG document.
+        SVG data embedded in HTML does not need it. The nodes link with the SVG 2 href attribute, so no xlink namespace is needed.
+
+        Args:
+            svg (str): [SVG data, or its first fragment (svg start tag)]
+
+        Raises:
+            ArgError: [Error if the data does not start with an svg start tag]
+
+        Returns:
+            str: [SVG data with the namespace]
+        """
+        if not svg.startswith('<svg '):
+            raise ArgError('SVG data must start with an svg start tag')
+        return f'<svg xmlns="{cls.SVG_NAMESPACE}" {svg[5:]}'
+
+    def get_style(self, phase_num:int)->Optional[SvgStyle]:
+        """Obtain the style sheet of the 'css' style mode.
+
+        Args:
+            phase_num (int): [number of phases]
+
+        Returns:
+            Optional[SvgStyle]: [style sheet. None in the 'inline' style mode]
+        """
+        if self._style_mode == 'css':
+            return SvgStyle(phase_num=phase_num)
+        return None
+
+    def iter_svg_frame(self, frame:Frame, phase_indexes:Iterable[int]=None, headers:bool=True, bodies:bool=True)->Iterator[str]:
+        """Generate SVG data of the frame (header + body) according to the style mode.
+
+        Args:
+            frame (Frame): [frame]
+            phase_indexes (Iterable[int], optional): [indexes of the drawn phases]. Defaults to None (every phase).
+            headers (bool, optional): [False not to draw the headers]. Defaults to True.
+            bodies (bool, optional): [False not to draw the bodies]. Defaults to True.
+
+        Yields:
+            str: [SVG header or body component]
+        """
+        return frame.iter_frame(self.get_style(len(frame._phase_list)), phase_indexes, headers, bodies)
+
+    def iter_phase_svg_nodes(self, store:FlowStore, phase_index:int, start:int=0, stop:int=None)->Iterator[str]:
+        """Generate SVG data of the nodes of a phase according to the style mode.
+
+        Args:
+            store (FlowStore): [store of the positioned nodes]
+            phase_index (int): [phase index]
+            start (int, optional): [index of the first row in the rows of the phase]. Defaults to 0.
+            stop (int, optional): [index after the last row in the rows of the phase]. Defaults to None (last row).
+
+        Yields:
+            str: [SVG node component]
+        """
+        if self._style_mode == 'css':
+            class_name = SvgStyle.get_node_class(phase_index)
+            for node in self.iter_phase_row_nodes(store, phase_index, start, stop):
+                yield node.generate_svg_use_component(SvgStyle.NODE_ID, class_name)
+        else:
+            for node in self.iter_phase_row_nodes(store, phase_index, start, stop):
+                yield node.generate_svg_component()
+
+    def iter_phase_svg_labels(self, store:FlowStore, phase_index:int, start:int=0, stop:int=None)->Iterator[str]:
+        """Generate SVG data of the node labels of a phase according to the style mode.
+        Empty labels are not generated in the 'css' style mode.
+
+        Args:
+            store (FlowStore): [store of the positioned nodes]
+            phase_index (int): [phase index]
+            start (int, optional): [index of the first row in the rows of the phase]. Defaults to 0.
+            stop (int, optional): [index after the last row in the rows of the phase]. Defaults to None (last row).
+
+        Yields:
+            str: [SVG node label component]
+        """
+        if self._style_mode == 'css':
+            for node in self.iter_phase_row_nodes(store, phase_index, start, stop):
+                if len(node.node_name) > 0:
+                    yield node.get_lable_svg_component(SvgStyle.LABEL_CLASS)
+        else:
+            for node in self.iter_phase_row_nodes(store, phase_index, start, stop):
+                yield node.get_lable_svg_component()
+
+    def iter_svg_badges(self, badges:Iterable[Tuple[str, int, int]])->Iterator[str]:
+        """Generate SVG data of badges according to the style mode.
+
+        Args:
+            badges (Iterable[Tuple[str, int, int]]): [value and coordinates of each badge]
+
+        Yields:
+            str: [SVG badge component]
+        """
+        for value, x, y in badges:
+            badge = Badge(value=value, x=x, y=y)
+            if self._style_mode == 'css':
+                yield badge.generate_classed_svg_component(SvgStyle.BADGE_CLASS)
+            else:
+                yield badge.generate_svg_component()
+
+    def iter_svg_lines(self, lines:Iterable[Union[Line, Polyline]])->Iterator[str]:
+        """Generate SVG data of inter-node lines according to the line mode.
+
+        Args:
+            lines (Iterable[Union[Line, Polyline]]): [lines]
+
+        Yields:
+            str: [SVG line or path component]
+        """
+        class_name = SvgStyle.LINE_CLASS if self._style_mode == 'css' else None
+        if self._line_mode == 'path':
+            yield from Line.iter_merged_svg_paths(lines, class_name)
+        elif class_name is not None:
+            for line in lines:
+                yield line.generate_classed_svg_component(class_name)
+        else:
+            for line in lines:
+                yield line.generate_svg_component()
+
+    @staticmethod
+    def style_node(node:Node, color_index:int, node_r:int=10)->Node:
+        """Set the radius and colour of a node. Dummy nodes are made invisible.
+
+        Args:
+            node (Node): [node]
+            color_index (int): [color index of the node being drawn.]
+            node_r (int, optional): [node radius]. Defaults to 10.
+
+        Returns:
+            Node: [Updated node]
+        """
+        node.cr = node_r
+        if type(node) is DummyNode:
+            node.fill = 'none'
+            node._stroke = 'none'
+            node._stroke_width = 0
+        else:
+            # Set color
+            node.fill = ColorType.get_phase_node_by_index(color_index)
+        return node
+
+    def iter_phase_row_nodes(self, store:FlowStore, phase_index:int, start:int=0, stop:int=None)->Iterator[Node]:
+        """Generate the positioned node instances (views of the rows) of a phase.
+
+        Args:
+            store (FlowStore): [store of the positioned nodes]
+            phase_index (int): [phase index]
+            start (int, optional): [index of the first row in the rows of the phase]. Defaults to 0.
+            stop (int, optional): [index after the last row in the rows of the phase]. Defaults to None (last row).
+
+        Yields:
+            Node: [positioned node. Dummy nodes are not generated in the 'polyline' long edge mode and the 'css' style mode]
+        """
+        skip_dummy = self._long_edge_mode == 'polyline' or self._style_mode == 'css'
+        rows = store.phase_rows[phase_index]
+        if start > 0 or stop is not None:
+            rows = rows[start:stop]
+        for row in rows:
+            if skip_dummy and store.is_dummy(row):
+                continue
+            yield self.style_node(node=store.get_node(row), color_index=phase_index)
+
+    def iter_row_lines(self, store:FlowStore)->Iterator[Union[Line, Polyline]]:
+        """Generate the lines between each row and its parent rows in the previous phase.
+
+        Args:
+            store (FlowStore): [store of the positioned nodes]
+
+        Yields:
+            Union[Line, Polyline]: [line between nodes]
+        """
+        for index in range(store.phase_num-1, 0, -1):
+            yield from self.iter_phase_row_lines(store, index)
+
+    def iter_phase_row_lines(self, store:FlowStore, phase_index:int)->Iterator[Union[Line, Polyline]]:
+        """Generate the lines between each row of a phase and its parent rows in the previous phase.
+
+        In the 'polyline' long edge mode, a chain of dummy rows is drawn as one polyline from the parent row,
+        generated with the lines of the phase of the child row.
+
+        Args:
+            store (FlowStore): [store of the positioned nodes]
+            phase_index (int): [phase index]
+
+        Yields:
+            Union[Line, Polyline]: [line between nodes]
+        """
+        for _, _, line in self._iter_phase_keyed_lines(store, phase_index):
+            yield line
+
+    def _iter_phase_keyed_lines(self, store:FlowStore, phase_index:int)->Iterator[Tuple[int, int, Union[Line, Polyline]]]:
+        """Generate the lines between each row of a phase and its parent rows in the previous phase, with the rows they join.
+
+        Args:
+            store (FlowStore): [store of the positioned nodes]
+            phase_index (int): [phase index]
+
+        Yields:
+            Tuple[int, int, Union[Line, Polyline]]: [parent row in the previous phase (last dummy row of a polyline), row and line between them]
+        """
+        phase_indexes = store.phase_indexes
+        cx = store.cx
+        cy = store.cy
+        polyline = self._long_edge_mode == 'polyline'
+        for row in store.phase_rows[phase_index]:
+            if polyline and store.is_dummy(row):
+                continue
+            for layer_parent_row in store.get_layer_parent_rows(row):
+                if phase_indexes[layer_parent_row] != phase_index-1:
+                    continue
+                parent_row = layer_parent_row
+                if polyline and store.is_dummy(parent_row):
+                    points = [(cx[row], cy[row])]
+                    while store.is_dummy(parent_row):
+                        points.append((cx[parent_row], cy[parent_row]))
+                        parent_row = store.get_parent_rows(parent_row)[0]
+                    points.append((cx[parent_row], cy[parent_row]))
+                    points.reverse()
+                    yield layer_parent_row, row, Polyline(points)
+                else:
+                    yield layer_parent_row, row, Line.from_points(cx[parent_row], cy[parent_row], cx[row], cy[row])
+
+
+class JsonRenderer():
+    """JsonRenderer class
+
+    Export of a layout (FlowLayout) as columnar JSON data (see FlowLayout.to_columns()), for front ends drawing the research flow history themselves.
+    """
+
+    __slots__ = ('_indent',)
+
+    def __init__(self, indent:int=None) -> None:
+        """JsonRenderer constructor
+
+        Args:
+            indent (int, optional): [indent of the JSON data]. Defaults to None (compact JSON data).
+        """
+        self._indent = indent
+
+    def render(self, layout:FlowLayout)->str:
+        """Export a layout as JSON data
+
+        Args:
+            layout (FlowLayout): [layout of the research flow history]
+
+        Returns:
+            str: [JSON data]
+        """
+        separators = (',', ':') if self._indent is None else None
+        return json.dumps(layout.to_columns(), ensure_ascii=False, indent=self._indent, separators=separators)
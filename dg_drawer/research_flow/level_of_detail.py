@@ -0,0 +1,241 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow.research_flow_status import PhaseStatus, SubFlowStatus
+
+
+class FlowSummary():
+    """FlowSummary class
+
+    Research flow status summarized by LevelOfDetail.summarize().
+    """
+
+    __slots__ = ('_research_flow_status', '_groups', '_badges')
+
+    def __init__(self, research_flow_status:List[PhaseStatus], groups:Dict[str, List[str]], badges:List[Tuple[str, str, int]]) -> None:
+        """FlowSummary constructor
+
+        Args:
+            research_flow_status (List[PhaseStatus]): [summarized research flow status]
+            groups (Dict[str, List[str]]): [IDs of the hidden sub flows by group ID]
+            badges (List[Tuple[str, str, int]]): [parent ID, child ID and number of hidden sub flows of each compressed chain]
+        """
+        self._research_flow_status = research_flow_status
+        self._groups = groups
+        self._badges = badges
+
+    @property
+    def research_flow_status(self)->List[PhaseStatus]:
+        return self._research_flow_status
+
+    @property
+    def groups(self)->Dict[str, List[str]]:
+        return self._groups
+
+    @property
+    def badges(self)->List[Tuple[str, str, int]]:
+        return self._badges
+
+
+class LevelOfDetail():
+    """LevelOfDetail class
+
+    Level of detail of the drawing of large research flow histories. Give an instance to FlowDrawer to draw a summary :
+
+    * Phases with more than max_phase_nodes sub flows show the max_phase_nodes-1 first created sub flows and
+      one aggregate node (group 'lod:phase:<phase index>') labeled with the number of the other sub flows.
+    * Linear chains (sub flows with one parent and one child) are compressed into one line between the ends of the chain,
+      with a badge giving the number of hidden sub flows (group 'lod:chain:<parent ID>:<child ID>').
+    * Labels are cut to max_label_length characters.
+
+    Groups are drawn in full again with expand().
+    """
+
+    PHASE_GROUP_PREFIX = 'lod:phase:'
+    CHAIN_GROUP_PREFIX = 'lod:chain:'
+
+    def __init__(self, max_phase_nodes:int=None, compress_chains:bool=False, max_label_length:int=None,
+                 expanded:Iterable[str]=(), group_link:str=None) -> None:
+        """LevelOfDetail constructor
+
+        Args:
+            max_phase_nodes (int, optional): [maximum number of nodes of a phase, including the aggregate node]. Defaults to None (no limit).
+
+            compress_chains (bool, optional): [True to compress linear chains of sub flows]. Defaults to False.
+
+            max_label_length (int, optional): [maximum number of characters of a label]. Defaults to None (no limit).
+
+            expanded (Iterable[str], optional): [IDs of the groups drawn in full]. Defaults to ().
+
+            group_link (str, optional): [link of aggregate nodes, formatted with the group ID. ex. '?expand={group}']. Defaults to None (no link).
+
+        Raises:
+            ArgError: [Error if max_phase_nodes or max_label_length is less than 1]
+        """
+        if max_phase_nodes is not None and max_phase_nodes < 1:
+            raise ArgError(f'max_phase_nodes must be 1 or more : {max_phase_nodes}')
+        if max_label_length is not None and max_label_length < 1:
+            raise ArgError(f'max_label_length must be 1 or more : {max_label_length}')
+        self._max_phase_nodes = max_phase_nodes
+        self._compress_chains = compress_chains
+        self._max_label_length = max_label_length
+        self._expanded = frozenset(expanded)
+        self._group_link = group_link
+
+    def expand(self, group_id:str)->'LevelOfDetail':
+        """Obtain the level of detail drawing a group in full.
+
+        Args:
+            group_id (str): [group ID]
+
+        Returns:
+            LevelOfDetail: [level of detail with the group expanded]
+        """
+        return LevelOfDetail(self._max_phase_nodes, self._compress_chains, self._max_label_length,
+                             self._expanded | {group_id}, self._group_link)
+
+    def get_options(self)->Dict[str, Any]:
+        """Obtain the options as JSON serializable data.
+
+        Returns:
+            Dict[str, Any]: [options]
+        """
+        return {
+            'max_phase_nodes': self._max_phase_nodes,
+            'compress_chains': self._compress_chains,
+            'max_label_length': self._max_label_length,
+            'expanded': sorted(self._expanded),
+            'group_link': self._group_link,
+        }
+
+    def summarize(self, research_flow_status:List[PhaseStatus])->FlowSummary:
+        """Summarize research flow status. The given research flow status is not modified.
+
+        The relations between the sub flows must be valid (see StatusValidator.validate()).
+
+        Args:
+            research_flow_status (List[PhaseStatus]): [Research Flow Status Instance]
+
+        Returns:
+            FlowSummary: [summarized research flow status, hidden sub flows and badges]
+        """
+        groups:Dict[str, List[str]] = {}
+        # ID replacing each hidden sub flow in the parent IDs of the shown sub flows
+        replaced_ids:Dict[str, str] = {}
+        chains:List[Tuple[str, str, int]] = []
+        if self._compress_chains:
+            chains = self._find_chains(research_flow_status, groups, replaced_ids)
+
+        aggregates:Dict[int, SubFlowStatus] = {}
+        shown_each_phase:List[List[SubFlowStatus]] = []
+        for phase_index, phase_status in enumerate(research_flow_status):
+            sub_flows = [sub_flow for sub_flow in phase_status._sub_flow_data if sub_flow._id not in replaced_ids]
+            group_id = f'{self.PHASE_GROUP_PREFIX}{phase_index}'
+            if self._max_phase_nodes is not None and len(sub_flows) > self._max_phase_nodes and group_id not in self._expanded:
+                order = sorted(range(len(sub_flows)), key=lambda index: (sub_flows[index]._create_datetime, index))
+                shown = set(order[:self._max_phase_nodes-1])
+                hidden = [sub_flow for index, sub_flow in enumerate(sub_flows) if index not in shown]
+                sub_flows = [sub_flow for index, sub_flow in enumerate(sub_flows) if index in shown]
+                groups[group_id] = [sub_flow._id for sub_flow in hidden]
+                for sub_flow in hidden:
+                    replaced_ids[sub_flow._id] = group_id
+                aggregates[phase_index] = SubFlowStatus(
+                    id=group_id,
+                    name=f'+{len(hidden)} sub flows',
+                    link='' if self._group_link is None else self._group_link.format(group=group_id),
+                    parent_ids=[parent_id for sub_flow in hidden for parent_id in sub_flow._parent_ids],
+                    create_datetime=min(sub_flow._create_datetime for sub_flow in hidden),
+                )
+            shown_each_phase.append(sub_flows)
+
+        def resolve(id:str)->str:
+            # A hidden chain end may itself be in an aggregate node.
+            while id in replaced_ids:
+                id = replaced_ids[id]
+            return id
+
+        summarized_status = []
+        for phase_index, phase_status in enumerate(research_flow_status):
+            sub_flows = shown_each_phase[phase_index]
+            if phase_index in aggregates:
+                sub_flows = sub_flows + [aggregates[phase_index]]
+            summarized_status.append(PhaseStatus(
+                seq_number=phase_status._seq_number,
+                name=phase_status._name,
+                sub_flow_data=[self._summarize_sub_flow(sub_flow, resolve) for sub_flow in sub_flows],
+            ))
+
+        badge_counts:Dict[Tuple[str, str], int] = {}
+        for parent_id, child_id, hidden_num in chains:
+            if resolve(child_id) != child_id:
+                # The line ends at an aggregate node.
+                continue
+            key = (resolve(parent_id), child_id)
+            badge_counts[key] = badge_counts.get(key, 0) + hidden_num
+        badges = [(parent_id, child_id, hidden_num) for (parent_id, child_id), hidden_num in badge_counts.items()]
+        return FlowSummary(summarized_status, groups, badges)
+
+    def _find_chains(self, research_flow_status:List[PhaseStatus], groups:Dict[str, List[str]],
+                     replaced_ids:Dict[str, str])->List[Tuple[str, str, int]]:
+        """Find the linear chains of sub flows and hide their inner sub flows.
+
+        Args:
+            research_flow_status (List[PhaseStatus]): [Research Flow Status Instance]
+            groups (Dict[str, List[str]]): [IDs of the hidden sub flows by group ID. The groups of the chains are added]
+            replaced_ids (Dict[str, str]): [ID replacing each hidden sub flow. The last inner sub flow of each chain is replaced by the parent of the chain]
+
+        Returns:
+            List[Tuple[str, str, int]]: [parent ID, child ID and number of inner sub flows of each chain]
+        """
+        children:Dict[str, List[str]] = {}
+        parents:Dict[str, List[str]] = {}
+        for phase_status in research_flow_status:
+            for sub_flow in phase_status._sub_flow_data:
+                parent_ids = list(dict.fromkeys(sub_flow._parent_ids))
+                parents[sub_flow._id] = parent_ids
+                for parent_id in parent_ids:
+                    children.setdefault(parent_id, []).append(sub_flow._id)
+
+        def is_inner(id:str)->bool:
+            return len(parents[id]) == 1 and len(children.get(id, ())) == 1
+
+        chains = []
+        # Parents are in previous phases, so the first inner sub flow of a chain is found before the others.
+        for phase_status in research_flow_status:
+            for sub_flow in phase_status._sub_flow_data:
+                id = sub_flow._id
+                if not is_inner(id) or is_inner(parents[id][0]):
+                    continue
+                parent_id = parents[id][0]
+                inner_ids = [id]
+                child_id = children[id][0]
+                while is_inner(child_id):
+                    inner_ids.append(child_id)
+                    child_id = children[child_id][0]
+
+                group_id = f'{self.CHAIN_GROUP_PREFIX}{parent_id}:{child_id}'
+                if group_id in self._expanded:
+                    continue
+                groups.setdefault(group_id, []).extend(inner_ids)
+                for inner_id in inner_ids:
+                    replaced_ids[inner_id] = parent_id
+                chains.append((parent_id, child_id, len(inner_ids)))
+        return chains
+
+    def _summarize_sub_flow(self, sub_flow:SubFlowStatus, resolve)->SubFlowStatus:
+        """Replace the hidden parents of a sub flow and cut its name.
+
+        Args:
+            sub_flow (SubFlowStatus): [shown sub flow]
+            resolve (Callable[[str], str]): [function obtaining the shown sub flow replacing a sub flow]
+
+        Returns:
+            SubFlowStatus: [the sub flow, or a changed copy]
+        """
+        parent_ids = list(dict.fromkeys(resolve(parent_id) for parent_id in sub_flow._parent_ids))
+        name = sub_flow._name
+        if self._max_label_length is not None and len(name) > self._max_label_length:
+            name = name[:self._max_label_length-1] + '…'
+        if parent_ids == sub_flow._parent_ids and name == sub_flow._name:
+            return sub_flow
+        return SubFlowStatus(id=sub_flow._id, name=name, link=sub_flow._link, parent_ids=parent_ids, create_datetime=sub_flow._create_datetime)
@@ -0,0 +1,179 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+from dg_drawer.research_flow.research_flow_status import PhaseStatus
+
+# Version of the drawing result. Change it when the layout or the SVG data of the same input changes,
+# so that results cached by a previous version are not used.
+RENDER_VERSION = 2
+
+
+def get_fingerprint(research_flow_status:List[PhaseStatus], options:Dict[str, Any])->str:
+    """Calculate a stable fingerprint of research flow status and drawing options.
+
+    The fingerprint does not depend on the process (hash seed) or on the order of the parent IDs of a sub flow.
+
+    Args:
+        research_flow_status (List[PhaseStatus]): [Research Flow Status Instance]
+
+        options (Dict[str, Any]): [drawing options (JSON serializable values)]
+
+    Returns:
+        str: [fingerprint (SHA-256 hex digest)]
+    """
+    sha256 = hashlib.sha256()
+    sha256.update(json.dumps([RENDER_VERSION, options], sort_keys=True, separators=(',', ':')).encode('utf-8'))
+    for phase_status in research_flow_status:
+        sha256.update(b'\x1e')
+        sha256.update(json.dumps([phase_status._seq_number, phase_status._name], separators=(',', ':')).encode('utf-8'))
+        for sub_flow in phase_status._sub_flow_data:
+            sha256.update(b'\x1f')
+            sha256.update(json.dumps(
+                    [sub_flow._id, sub_flow._name, sub_flow._link, sorted(sub_flow._parent_ids), sub_flow._create_datetime],
+                    separators=(',', ':')
+                ).encode('utf-8'))
+    return sha256.hexdigest()
+
+
+class RenderCache():
+    """RenderCache class
+
+    Cache of drawing results (layout and SVG data) keyed by fingerprint.
+
+    Results are held in memory and evicted in least recently used order when the total size exceeds max_bytes.
+    If a directory is given, results are also written to it and read from it when they are not in memory,
+    so that they survive restarts. The files of the directory are not evicted.
+    The directory must only be writable by trusted users (layouts are stored with pickle).
+    """
+
+    def __init__(self, max_bytes:int=64*1024*1024, directory:str=None) -> None:
+        """RenderCache constructor
+
+        Args:
+            max_bytes (int, optional): [maximum total size (bytes) of the results held in memory]. Defaults to 64MiB.
+
+            directory (str, optional): [directory of the on-disk cache]. Defaults to None.
+        """
+        self._max_bytes = max_bytes
+        self._directory = directory
+        self._entries:'OrderedDict[str, bytes]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get_svg(self, key:str)->Optional[str]:
+        """Obtain cached SVG data.
+
+        Args:
+            key (str): [fingerprint]
+
+        Returns:
+            Optional[str]: [SVG data. None if not cached]
+        """
+        data = self._get(key, 'svg')
+        return None if data is None else data.decode('utf-8')
+
+    def put_svg(self, key:str, svg:str):
+        """Cache SVG data.
+
+        Args:
+            key (str): [fingerprint]
+
+            svg (str): [SVG data]
+        """
+        self._put(key, 'svg', svg.encode('utf-8'))
+
+    def get_layout(self, key:str)->Optional[Any]:
+        """Obtain a cached layout.
+
+        Args:
+            key (str): [fingerprint]
+
+        Returns:
+            Optional[Any]: [layout. None if not cached]
+        """
+        data = self._get(key, 'layout')
+        return None if data is None else pickle.loads(data)
+
+    def put_layout(self, key:str, layout:Any):
+        """Cache a layout.
+
+        Args:
+            key (str): [fingerprint]
+
+            layout (Any): [layout (picklable)]
+        """
+        self._put(key, 'layout', pickle.dumps(layout, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def clear(self):
+        """Remove all results held in memory. The files of the on-disk cache are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size(self)->int:
+        return self._size
+
+    def __len__(self)->int:
+        return len(self._entries)
+
+    def _get(self, key:str, kind:str)->Optional[bytes]:
+        entry_key = f'{key}.{kind}'
+        with self._lock:
+            data = self._entries.get(entry_key)
+            if data is not None:
+                self._entries.move_to_end(entry_key)
+                return data
+
+        if self._directory is None:
+            return None
+        try:
+            with open(self._get_path(entry_key), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        self._put_memory(entry_key, data)
+        return data
+
+    def _put(self, key:str, kind:str, data:bytes):
+        entry_key = f'{key}.{kind}'
+        self._put_memory(entry_key, data)
+
+        if self._directory is None:
+            return
+        path = self._get_path(entry_key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file and rename it, so that a partially written file is never read.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _put_memory(self, entry_key:str, data:bytes):
+        with self._lock:
+            previous_data = self._entries.pop(entry_key, None)
+            if previous_data is not None:
+                self._size -= len(previous_data)
+            if len(data) > self._max_bytes:
+                return
+            self._entries[entry_key] = data
+            self._size += len(data)
+            while self._size > self._max_bytes:
+                _, evicted_data = self._entries.popitem(last=False)
+                self._size -= len(evicted_data)
+
+    def _get_path(self, entry_key:str)->str:
+        return os.path.join(self._directory, entry_key[:2], entry_key)
@@ -0,0 +1,368 @@
+import argparse
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor
+import functools
+import os
+import sys
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow.flow_drawer import FlowDrawer
+from dg_drawer.research_flow.render_server import QUERY_OPTIONS
+from dg_drawer.research_flow.research_flow_status import ResearchFlowStatus
+
+# Extensions of the output files. '.svgz' files are compressed with gzip.
+OUTPUT_SUFFIXES = ('.svg', '.svgz')
+
+
+class FileResult():
+    """FileResult class
+
+    Result of rendering one research flow status file.
+    """
+
+    __slots__ = ('_input_path', '_output_path', '_error')
+
+    def __init__(self, input_path:str, output_path:str, error:Optional[BaseException]=None) -> None:
+        """FileResult constructor
+
+        Args:
+            input_path (str): [path of the research flow status file (JSON)]
+
+            output_path (str): [path of the SVG file]
+
+            error (Optional[BaseException], optional): [error raised while loading, drawing or writing]. Defaults to None.
+        """
+        self._input_path = input_path
+        self._output_path = output_path
+        self._error = error
+
+    @property
+    def input_path(self)->str:
+        return self._input_path
+
+    @property
+    def output_path(self)->str:
+        return self._output_path
+
+    @property
+    def error(self)->Optional[BaseException]:
+        return self._error
+
+    @property
+    def ok(self)->bool:
+        return self._error is None
+
+    def __repr__(self)->str:
+        return f'FileResult(input_path={self._input_path!r}, ok={self.ok})'
+
+
+class RenderReport():
+    """RenderReport class
+
+    Results of one pass of BatchRenderer.render().
+    """
+
+    def __init__(self, results:List[FileResult], skipped_num:int) -> None:
+        """RenderReport constructor
+
+        Args:
+            results (List[FileResult]): [results of the rendered files]
+
+            skipped_num (int): [number of the files not rendered (output up to date, or failed and not changed since)]
+        """
+        self._results = results
+        self._skipped_num = skipped_num
+
+    @property
+    def results(self)->List[FileResult]:
+        return self._results
+
+    @property
+    def skipped_num(self)->int:
+        return self._skipped_num
+
+    @property
+    def failed(self)->List[FileResult]:
+        return [result for result in self._results if not result.ok]
+
+
+def _render_file(drawer_options:Dict[str, Any], job:Tuple[str, str])->Optional[BaseException]:
+    """Render a research flow status file into an SVG file. Run in a worker.
+
+    The SVG data is written to a temporary file replacing the output file when it is complete,
+    so that a reader never sees a partial file.
+
+    Args:
+        drawer_options (Dict[str, Any]): [options of FlowDrawer]
+        job (Tuple[str, str]): [input path and output path]
+
+    Returns:
+        Optional[BaseException]: [error raised while loading, drawing or writing. None if the file is rendered]
+    """
+    input_path, output_path = job
+    temporary_path = f'{output_path}.{os.getpid()}.tmp'
+    try:
+        drawer = FlowDrawer(ResearchFlowStatus.load_from_json(input_path), **drawer_options)
+        output_dir = os.path.dirname(output_path)
+        if output_dir != '':
+            os.makedirs(output_dir, exist_ok=True)
+        codec = 'gzip' if output_path.lower().endswith('.svgz') else None
+        drawer.save(temporary_path, codec=codec)
+        os.replace(temporary_path, output_path)
+    except Exception as e:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        return e
+    return None
+
+
+class BatchRenderer():
+    """BatchRenderer class
+
+    Rendering of research flow status files (JSON) and directories of them into SVG files, in a process pool.
+
+    * An input is rendered only if its output does not exist or is older than the input (unless force is set),
+      so a pass over thousands of rendered files only costs their stat calls.
+    * An input which failed is not rendered again until it changes.
+    * watch() polls the inputs and renders the changed and new ones.
+    * If the pool breaks (ex. a worker process killed), the inputs it did not render are reported as failed with the BrokenExecutor error,
+      and rendered again at the next pass. watch() replaces a broken pool it started with a new one.
+
+    The output of a file of a directory is at the same relative path in output_dir (or next to the file without output_dir),
+    with the extension replaced by suffix.
+    """
+
+    def __init__(self, paths:Iterable[str], output_dir:str=None, suffix:str='.svg', max_workers:int=None, chunksize:int=8,
+                 force:bool=False, executor:Executor=None, **drawer_options) -> None:
+        """BatchRenderer constructor
+
+        Args:
+            paths (Iterable[str]): [research flow status files and directories. Directories are searched recursively for '.json' files]
+
+            output_dir (str, optional): [directory of the SVG files]. Defaults to None (next to the inputs).
+
+            suffix (str, optional): [extension of the SVG files ('.svg' or '.svgz')]. Defaults to '.svg'.
+
+            max_workers (int, optional): [number of worker processes]. Defaults to None (number of CPUs).
+
+            chunksize (int, optional): [number of files rendered by a worker at a time]. Defaults to 8.
+
+            force (bool, optional): [True to render the inputs whose output is up to date]. Defaults to False.
+
+            executor (Executor, optional): [executor used instead of a new process pool. It is not shut down]. Defaults to None.
+
+            drawer_options : [options of FlowDrawer (whole_max_width, line_mode, ...). They must be picklable]
+
+        Raises:
+            ArgError: [Error if suffix is not supported, max_workers or chunksize is less than 1, or a drawer option is not valid]
+        """
+        if suffix not in OUTPUT_SUFFIXES:
+            raise ArgError(f'Unsupported suffix [{suffix}]. Supported suffixes : {list(OUTPUT_SUFFIXES)}')
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers < 1:
+            raise ArgError(f'max_workers must be 1 or more : {max_workers}')
+        if chunksize < 1:
+            raise ArgError(f'chunksize must be 1 or more : {chunksize}')
+        # The options are checked once, before any worker is started.
+        FlowDrawer([], **drawer_options)
+        self._paths = list(paths)
+        self._output_dir = output_dir
+        self._suffix = suffix
+        self._max_workers = max_workers
+        self._chunksize = chunksize
+        self._force = force
+        self._executor = executor
+        self._drawer_options = drawer_options
+        # mtime (ns) of the inputs which failed
+        self._failed:Dict[str, int] = {}
+
+    def find_jobs(self)->List[Tuple[str, str]]:
+        """Find the input files and their output paths.
+
+        Returns:
+            List[Tuple[str, str]]: [input path and output path of each input file]
+        """
+        jobs = []
+        for path in self._paths:
+            if not os.path.isdir(path):
+                jobs.append((path, self.get_output_path(path, os.path.dirname(path) or os.curdir)))
+                continue
+            for dir_path, dir_names, file_names in os.walk(path):
+                dir_names.sort()
+                for file_name in sorted(file_names):
+                    if file_name.lower().endswith('.json'):
+                        input_path = os.path.join(dir_path, file_name)
+                        jobs.append((input_path, self.get_output_path(input_path, path)))
+        return jobs
+
+    def get_output_path(self, input_path:str, root:str)->str:
+        """Obtain the output path of an input file.
+
+        Args:
+            input_path (str): [path of the input file]
+            root (str): [directory given in the paths and containing the input file]
+
+        Returns:
+            str: [path of the SVG file]
+        """
+        if self._output_dir is None:
+            base = input_path
+        else:
+            base = os.path.join(self._output_dir, os.path.relpath(input_path, root))
+        return os.path.splitext(base)[0] + self._suffix
+
+    def is_stale(self, input_path:str, output_path:str)->bool:
+        """Check whether an input must be rendered.
+
+        Args:
+            input_path (str): [path of the input file]
+            output_path (str): [path of the SVG file]
+
+        Returns:
+            bool: [True if the output does not exist or is older than the input, and the input did not fail in its current version]
+        """
+        try:
+            input_mtime = os.stat(input_path).st_mtime_ns
+        except OSError:
+            # A missing input is rendered, so that its error is reported.
+            return input_path not in self._failed
+        if self._failed.get(input_path) == input_mtime:
+            return False
+        if self._force:
+            return True
+        try:
+            return os.stat(output_path).st_mtime_ns < input_mtime
+        except OSError:
+            return True
+
+    def render(self, callback:Callable[[FileResult], Any]=None)->RenderReport:
+        """Render the inputs whose output is missing or out of date.
+
+        Args:
+            callback (Callable[[FileResult], Any], optional): [function called with the result of each rendered file]. Defaults to None.
+
+        Returns:
+            RenderReport: [results of the rendered files and number of the skipped files]
+        """
+        if self._executor is not None:
+            return self._render(self._executor, callback)
+        with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+            return self._render(executor, callback)
+
+    def watch(self, interval:float=1.0, stop:threading.Event=None, callback:Callable[[FileResult], Any]=None):
+        """Render the inputs, then poll them and render the changed and new ones until stop is set.
+
+        The worker processes are kept between the polls. A pool started by the watch is replaced when it breaks.
+
+        Args:
+            interval (float, optional): [seconds between the polls]. Defaults to 1.0.
+
+            stop (threading.Event, optional): [event stopping the watch]. Defaults to None (watch until interrupted).
+
+            callback (Callable[[FileResult], Any], optional): [function called with the result of each rendered file]. Defaults to None.
+        """
+        if stop is None:
+            stop = threading.Event()
+        executor = self._executor
+        force = self._force
+        try:
+            while True:
+                if executor is None:
+                    executor = ProcessPoolExecutor(max_workers=self._max_workers)
+                report = self._render(executor, callback)
+                # After the first pass, only changed inputs are rendered.
+                self._force = False
+                if executor is not self._executor and any(isinstance(result.error, BrokenExecutor) for result in report.failed):
+                    # A new pool is started at the next poll.
+                    executor.shutdown()
+                    executor = None
+                if stop.wait(interval):
+                    return
+        finally:
+            self._force = force
+            if executor is not None and executor is not self._executor:
+                executor.shutdown()
+
+    def _render(self, executor:Executor, callback:Optional[Callable[[FileResult], Any]])->RenderReport:
+        jobs = self.find_jobs()
+        stale_jobs = [job for job in jobs if self.is_stale(*job)]
+        results = []
+        if len(stale_jobs) > 0:
+            render_file = functools.partial(_render_file, self._drawer_options)
+            try:
+                for job, error in zip(stale_jobs, executor.map(render_file, stale_jobs, chunksize=self._chunksize)):
+                    self._add_result(results, job, error, callback)
+            except BrokenExecutor as e:
+                # The remaining inputs are not remembered as failed, so they are rendered again at the next pass.
+                for job in stale_jobs[len(results):]:
+                    self._add_result(results, job, e, callback)
+        return RenderReport(results, len(jobs) - len(stale_jobs))
+
+    def _add_result(self, results:List[FileResult], job:Tuple[str, str], error:Optional[BaseException],
+                    callback:Optional[Callable[[FileResult], Any]]):
+        input_path, output_path = job
+        if error is None:
+            self._failed.pop(input_path, None)
+        elif not isinstance(error, BrokenExecutor):
+            try:
+                self._failed[input_path] = os.stat(input_path).st_mtime_ns
+            except OSError:
+                self._failed[input_path] = -1
+        result = FileResult(input_path, output_path, error)
+        results.append(result)
+        if callback is not None:
+            callback(result)
+
+
+def main(argv:List[str]=None)->int:
+    """Render research flow status files into SVG files. ex. dg-drawer-render ./status --output-dir ./svg --watch
+
+    Args:
+        argv (List[str], optional): [command line arguments]. Defaults to None (sys.argv).
+
+    Returns:
+        int: [exit status. 1 if a file failed]
+    """
+    parser = argparse.ArgumentParser(description='Render research flow status files (JSON) into SVG files.')
+    parser.add_argument('paths', nargs='+', help='research flow status files, or directories searched for .json files')
+    parser.add_argument('-o', '--output-dir', default=None, help='directory of the SVG files (default: next to the inputs)')
+    parser.add_argument('--suffix', choices=OUTPUT_SUFFIXES, default='.svg', help='extension of the SVG files (default: .svg)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('--force', action='store_true', help='render the inputs whose output is up to date')
+    parser.add_argument('--watch', action='store_true', help='poll the inputs and render the changed ones until interrupted')
+    parser.add_argument('--interval', type=float, default=1.0, help='seconds between the polls of the watch mode (default: 1.0)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='only report errors')
+    for name, option_type in QUERY_OPTIONS.items():
+        parser.add_argument('--' + name.replace('_', '-'), dest=name, type=option_type, default=None, help='option of FlowDrawer')
+    args = parser.parse_args(argv)
+    drawer_options = {name: getattr(args, name) for name in QUERY_OPTIONS if getattr(args, name) is not None}
+
+    def report(result:FileResult):
+        if not result.ok:
+            print(f'error: {result.input_path}: {result.error}', file=sys.stderr)
+        elif not args.quiet:
+            print(f'{result.input_path} -> {result.output_path}')
+
+    try:
+        renderer = BatchRenderer(args.paths, output_dir=args.output_dir, suffix=args.suffix, max_workers=args.workers,
+                                 force=args.force, **drawer_options)
+    except ArgError as e:
+        parser.error(str(e))
+    if args.watch:
+        try:
+            renderer.watch(args.interval, callback=report)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    render_report = renderer.render(callback=report)
+    if not args.quiet:
+        print(f'{len(render_report.results) - len(render_report.failed)} rendered, {render_report.skipped_num} skipped, '
+              f'{len(render_report.failed)} failed')
+    return 1 if len(render_report.failed) > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,420 @@
+import argparse
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import multiprocessing
+import threading
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from dg_drawer.error.error import ArgError, JSONDataError
+from dg_drawer.research_flow.flow_drawer import FlowDrawer
+from dg_drawer.research_flow.layout_renderer import JsonRenderer
+from dg_drawer.research_flow.render_cache import RENDER_VERSION, RenderCache
+from dg_drawer.research_flow.research_flow_status import ResearchFlowStatus
+from dg_drawer.research_flow.svg_codec import iter_compressed
+
+
+# Options of FlowDrawer accepted in the query string, with their types
+QUERY_OPTIONS = {
+    'whole_max_width': int,
+    'header_height': int,
+    'top_margin': int,
+    'bottom_margin': int,
+    'between_node_vertical_length': int,
+    'line_mode': str,
+    'long_edge_mode': str,
+    'style_mode': str,
+    'ordering': str,
+    'ordering_iterations': int,
+}
+
+# Output formats : content type of each format
+FORMATS = {
+    'svg': 'image/svg+xml; charset=utf-8',
+    'layout': 'application/json',
+}
+
+
+class RequestTooLargeError(ArgError):
+    """Error of a request exceeding a size limit of the render service.
+    """
+    pass
+
+
+def _warm_up()->int:
+    return 0
+
+
+def _render(body:bytes, options:Dict[str, Any], output_format:str, max_sub_flows:Optional[int])->str:
+    """Load research flow status data and draw it. Run in a worker of the render service.
+
+    Args:
+        body (bytes): [research flow status data (JSON)]
+        options (Dict[str, Any]): [options of FlowDrawer]
+        output_format (str): ['svg' or 'layout']
+        max_sub_flows (Optional[int]): [maximum number of sub flows]
+
+    Raises:
+        RequestTooLargeError: [Error if there are more sub flows than max_sub_flows]
+
+    Returns:
+        str: [SVG document (see FlowDrawer.iter_svg_document()), or JSON data of the layout]
+    """
+    research_flow_status = ResearchFlowStatus.load(body)
+    if max_sub_flows is not None:
+        sub_flow_num = sum(len(phase_status._sub_flow_data) for phase_status in research_flow_status)
+        if sub_flow_num > max_sub_flows:
+            raise RequestTooLargeError(f'Too many sub flows : {sub_flow_num} (maximum {max_sub_flows})')
+    drawer = FlowDrawer(research_flow_status, **options)
+    if output_format == 'layout':
+        return JsonRenderer().render(drawer.layout())
+    # The response is a standalone SVG document, so its svg element declares the SVG namespace.
+    return ''.join(drawer.iter_svg_document())
+
+
+class RenderService():
+    """RenderService class
+
+    Drawing of research flow status data (JSON) in a pool of worker processes, for a long-running render service.
+
+    * The worker processes are started (forked where possible) when the service starts, so they share the loaded modules
+      with the service and no request pays their start.
+    * Identical requests (same data, options and format) in flight at the same time are drawn once, and all of them get the result.
+    * The size of the data and the number of sub flows of a request are limited.
+    * The ETag of a result is derived from the request, as the drawing of the same request always gives the same result.
+    """
+
+    def __init__(self, max_workers:int=None, max_body_bytes:int=16*1024*1024, max_sub_flows:int=None,
+                 cache:RenderCache=None, executor:Executor=None) -> None:
+        """RenderService constructor
+
+        Args:
+            max_workers (int, optional): [number of worker processes]. Defaults to None (number of CPUs).
+
+            max_body_bytes (int, optional): [maximum size (bytes) of the data of a request]. Defaults to 16MiB.
+
+            max_sub_flows (int, optional): [maximum number of sub flows of a request]. Defaults to None (no limit).
+
+            cache (RenderCache, optional): [cache of the results, keyed by ETag]. Defaults to None.
+
+            executor (Executor, optional): [executor used instead of a new process pool. It is not shut down]. Defaults to None.
+
+        Raises:
+            ArgError: [Error if max_workers, max_body_bytes or max_sub_flows is less than 1]
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ArgError(f'max_workers must be 1 or more : {max_workers}')
+        if max_body_bytes < 1:
+            raise ArgError(f'max_body_bytes must be 1 or more : {max_body_bytes}')
+        if max_sub_flows is not None and max_sub_flows < 1:
+            raise ArgError(f'max_sub_flows must be 1 or more : {max_sub_flows}')
+        self._max_workers = max_workers or multiprocessing.cpu_count()
+        self._max_body_bytes = max_body_bytes
+        self._max_sub_flows = max_sub_flows
+        self._cache = cache
+        self._executor = executor
+        self._own_executor = executor is None
+        self._in_flight:Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._coalesced_num = 0
+
+    def start(self):
+        """Start the worker processes. Call it before the threads of the server are started, so that the workers are forked without them.
+        """
+        if self._executor is not None:
+            return
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        else:
+            context = multiprocessing.get_context()
+        self._executor = ProcessPoolExecutor(max_workers=self._max_workers, mp_context=context)
+        # The pool starts its processes on demand.
+        for future in [self._executor.submit(_warm_up) for _ in range(self._max_workers)]:
+            future.result()
+
+    def close(self):
+        """Shut down the worker processes started by the service.
+        """
+        if self._own_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self)->'RenderService':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_etag(self, body:bytes, options:Dict[str, Any], output_format:str='svg')->str:
+        """Calculate the ETag of a request.
+
+        Args:
+            body (bytes): [research flow status data (JSON)]
+            options (Dict[str, Any]): [options of FlowDrawer]
+            output_format (str, optional): ['svg' or 'layout']. Defaults to 'svg'.
+
+        Returns:
+            str: [ETag (quoted SHA-256 hex digest)]
+        """
+        sha256 = hashlib.sha256()
+        sha256.update(json.dumps([RENDER_VERSION, output_format, options], sort_keys=True, separators=(',', ':')).encode('utf-8'))
+        sha256.update(body)
+        return f'"{sha256.hexdigest()}"'
+
+    def render(self, body:bytes, options:Dict[str, Any], output_format:str='svg')->Tuple[str, str]:
+        """Draw research flow status data, sharing the drawing of identical requests in flight.
+
+        Args:
+            body (bytes): [research flow status data (JSON)]
+            options (Dict[str, Any]): [options of FlowDrawer]
+            output_format (str, optional): ['svg' (SVG data) or 'layout' (JSON data of the layout, see JsonRenderer)]. Defaults to 'svg'.
+
+        Raises:
+            RequestTooLargeError: [Error if the data or the number of sub flows exceeds the limits]
+            ArgError: [Error if an option or the format is not supported]
+            JSONDataError: [Error if the research flow status data is not valid]
+
+        Returns:
+            Tuple[str, str]: [ETag and result]
+        """
+        if len(body) > self._max_body_bytes:
+            raise RequestTooLargeError(f'Too large data : {len(body)} bytes (maximum {self._max_body_bytes} bytes)')
+        if output_format not in FORMATS:
+            raise ArgError(f'Unsupported format [{output_format}]. Supported formats : {list(FORMATS)}')
+        if self._executor is None:
+            raise ArgError('The render service is not started')
+
+        etag = self.get_etag(body, options, output_format)
+        if self._cache is not None:
+            result = self._cache.get_svg(etag)
+            if result is not None:
+                return etag, result
+
+        submitted = False
+        with self._lock:
+            future = self._in_flight.get(etag)
+            if future is None:
+                future = self._executor.submit(_render, body, options, output_format, self._max_sub_flows)
+                self._in_flight[etag] = future
+                submitted = True
+            else:
+                self._coalesced_num += 1
+        if submitted:
+            # Outside the lock, as the callback is called at once if the drawing is already finished.
+            future.add_done_callback(lambda _: self._remove_in_flight(etag))
+        result = future.result()
+        if self._cache is not None:
+            self._cache.put_svg(etag, result)
+        return etag, result
+
+    def _remove_in_flight(self, etag:str):
+        with self._lock:
+            self._in_flight.pop(etag, None)
+
+    @property
+    def max_body_bytes(self)->int:
+        return self._max_body_bytes
+
+    @property
+    def coalesced_num(self)->int:
+        return self._coalesced_num
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """RenderRequestHandler class
+
+    HTTP interface of the render service :
+
+    * POST /render : research flow status data (JSON) in the body, SVG data in the response.
+    * POST /layout : research flow status data (JSON) in the body, JSON data of the layout in the response (see JsonRenderer).
+    * GET /health : 'ok' while the service runs.
+
+    Options of FlowDrawer are given in the query string (see QUERY_OPTIONS). ex. POST /render?style_mode=css&whole_max_width=1200
+    Responses have an ETag, a request with a matching If-None-Match header gets 304, and results are compressed with gzip
+    if the client accepts it.
+    """
+
+    server_version = 'dg-drawer'
+    protocol_version = 'HTTP/1.1'
+    # Output format of each path
+    PATHS = {'/render': 'svg', '/layout': 'layout'}
+
+    def do_GET(self):
+        if urlsplit(self.path).path == '/health':
+            self._send(200, b'ok', 'text/plain; charset=utf-8')
+        else:
+            self._send_error(404, 'Not found')
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        output_format = self.PATHS.get(url.path)
+        if output_format is None:
+            # The connection is closed, as the body is not read.
+            self.close_connection = True
+            self._send_error(404, 'Not found')
+            return
+        service:RenderService = self.server.service
+        try:
+            body = self._read_body(service.max_body_bytes)
+            options = self.parse_options(url.query)
+            etag = service.get_etag(body, options, output_format)
+            if etag in self._get_if_none_match():
+                self._send(304, b'', None, etag)
+                return
+            etag, result = service.render(body, options, output_format)
+        except RequestTooLargeError as e:
+            self._send_error(413, str(e))
+            return
+        except (ArgError, JSONDataError, ValueError) as e:
+            # json.JSONDecodeError and UnicodeDecodeError are ValueError.
+            self._send_error(400, str(e))
+            return
+        except BrokenExecutor:
+            self._send_error(503, 'The worker processes stopped')
+            return
+        except Exception:
+            # Any other error (ex. RecursionError of deeply nested data) is answered, so the client is not left without a response.
+            self.log_error('Drawing failed for %s\n%s', self.path, traceback.format_exc())
+            self._send_error(500, 'Internal server error')
+            return
+        self._send(200, result.encode('utf-8'), FORMATS[output_format], etag)
+
+    @staticmethod
+    def parse_options(query:str)->Dict[str, Any]:
+        """Parse the options of FlowDrawer in a query string.
+
+        Args:
+            query (str): [query string]
+
+        Raises:
+            ArgError: [Error if an option is not supported or its value is not valid]
+
+        Returns:
+            Dict[str, Any]: [options of FlowDrawer]
+        """
+        options:Dict[str, Any] = {}
+        for name, value in parse_qsl(query, keep_blank_values=True):
+            option_type = QUERY_OPTIONS.get(name)
+            if option_type is None:
+                raise ArgError(f'Unsupported option [{name}]. Supported options : {list(QUERY_OPTIONS)}')
+            try:
+                options[name] = option_type(value)
+            except ValueError:
+                raise ArgError(f'Invalid value of option [{name}] : {value}') from None
+        return options
+
+    def _read_body(self, max_body_bytes:int)->bytes:
+        length = self.headers.get('Content-Length')
+        if length is None or not length.isdigit():
+            # The connection is closed, as the body can not be skipped.
+            self.close_connection = True
+            raise ArgError('The request needs a Content-Length header')
+        length = int(length)
+        if length > max_body_bytes:
+            self.close_connection = True
+            raise RequestTooLargeError(f'Too large data : {length} bytes (maximum {max_body_bytes} bytes)')
+        return self.rfile.read(length)
+
+    def _get_if_none_match(self)->List[str]:
+        value = self.headers.get('If-None-Match')
+        if value is None:
+            return []
+        return [tag.strip() for tag in value.split(',')]
+
+    def _accepts_gzip(self)->bool:
+        value = self.headers.get('Accept-Encoding', '')
+        for coding in value.split(','):
+            name, _, params = coding.strip().partition(';')
+            if name.strip() == 'gzip' and params.replace(' ', '') not in ('q=0', 'q=0.0'):
+                return True
+        return False
+
+    def _send(self, status:int, data:bytes, content_type:Optional[str], etag:str=None):
+        if status == 200 and self._accepts_gzip():
+            data = b''.join(iter_compressed([data], 'gzip'))
+            encoding = 'gzip'
+        else:
+            encoding = None
+        self.send_response(status)
+        if content_type is not None:
+            self.send_header('Content-Type', content_type)
+        if encoding is not None:
+            self.send_header('Content-Encoding', encoding)
+        if etag is not None:
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+        if status != 304:
+            self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(data)
+
+    def _send_error(self, status:int, message:str):
+        self._send(status, message.encode('utf-8'), 'text/plain; charset=utf-8')
+
+    def log_message(self, format:str, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def log_error(self, format:str, *args):
+        # Errors are logged even if the server is not verbose.
+        super().log_message(format, *args)
+
+
+class RenderServer(ThreadingHTTPServer):
+    """RenderServer class
+
+    HTTP server of a render service (see RenderRequestHandler). Each connection is handled in a thread,
+    and the drawing is done in the worker processes of the service.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address:Tuple[str, int], service:RenderService, verbose:bool=False) -> None:
+        """RenderServer constructor
+
+        Args:
+            address (Tuple[str, int]): [host and port. Port 0 selects a free port]
+
+            service (RenderService): [render service. It is started if needed]
+
+            verbose (bool, optional): [True to log the requests to stderr]. Defaults to False.
+        """
+        # The workers are forked before the server has threads.
+        service.start()
+        self.service = service
+        self.verbose = verbose
+        super().__init__(address, RenderRequestHandler)
+
+
+def main(argv:List[str]=None):
+    """Run a render server until it is interrupted. ex. python -m dg_drawer.research_flow.render_server --port 8080
+
+    Args:
+        argv (List[str], optional): [command line arguments]. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description='Render service drawing research flow status data (JSON) as SVG data.')
+    parser.add_argument('--host', default='127.0.0.1', help='host of the server (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='port of the server (default: 8080)')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('--max-body-bytes', type=int, default=16*1024*1024, help='maximum size of the data of a request (default: 16MiB)')
+    parser.add_argument('--max-sub-flows', type=int, default=None, help='maximum number of sub flows of a request (default: no limit)')
+    parser.add_argument('--cache-bytes', type=int, default=0, help='size of the in-memory cache of the results (default: no cache)')
+    parser.add_argument('--verbose', action='store_true', help='log the requests')
+    args = parser.parse_args(argv)
+
+    cache = RenderCache(max_bytes=args.cache_bytes) if args.cache_bytes > 0 else None
+    with RenderService(max_workers=args.workers, max_body_bytes=args.max_body_bytes, max_sub_flows=args.max_sub_flows, cache=cache) as service:
+        with RenderServer((args.host, args.port), service, verbose=args.verbose) as server:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+from contextlib import contextmanager
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from dg_drawer.error.error import ArgError
+
+# tracemalloc is global to the process. Only one stage at a time traces the allocations.
+_ALLOCATION_TRACING_LOCK = threading.Lock()
+
+
+class StageRecord():
+    """StageRecord class
+
+    Record of a run of a drawing stage.
+    """
+
+    __slots__ = ('_name', '_start', '_seconds', '_allocated_bytes', '_peak_bytes', '_thread_id')
+
+    def __init__(self, name:str, start:float, seconds:float, allocated_bytes:Optional[int], peak_bytes:Optional[int], thread_id:int) -> None:
+        """StageRecord constructor
+
+        Args:
+            name (str): [stage name]
+            start (float): [start time (seconds from the creation of the stats)]
+            seconds (float): [duration (seconds)]
+            allocated_bytes (Optional[int]): [memory allocated and not freed by the stage. None if allocations are not traced]
+            peak_bytes (Optional[int]): [peak of the memory allocated by the stage. None if allocations are not traced]
+            thread_id (int): [ID of the thread running the stage]
+        """
+        self._name = name
+        self._start = start
+        self._seconds = seconds
+        self._allocated_bytes = allocated_bytes
+        self._peak_bytes = peak_bytes
+        self._thread_id = thread_id
+
+    @property
+    def name(self)->str:
+        return self._name
+
+    @property
+    def start(self)->float:
+        return self._start
+
+    @property
+    def seconds(self)->float:
+        return self._seconds
+
+    @property
+    def allocated_bytes(self)->Optional[int]:
+        return self._allocated_bytes
+
+    @property
+    def peak_bytes(self)->Optional[int]:
+        return self._peak_bytes
+
+    @property
+    def thread_id(self)->int:
+        return self._thread_id
+
+
+class RenderStats():
+    """RenderStats class
+
+    Statistics of drawing research flow histories. Give an instance to FlowDrawer to record
+    the duration (and optionally the memory allocations) of each drawing stage and the numbers of
+    nodes, dummy nodes, lines and output bytes. Without an instance, nothing is recorded.
+
+    Stages : 'fingerprint', 'validate', 'summarize' (with a level of detail), 'build_store', 'fill_dummy_rows', 'sort_rows',
+    'order_rows' (with an ordering other than 'parent'), 'set_locations', 'frame', 'lines', 'nodes' and 'labels'.
+    The SVG data is emitted piece by piece, so the durations of the emission stages ('frame', 'lines', 'nodes' and 'labels')
+    include the time the caller spends between the pieces (ex. writing to a stream with FlowDrawer.draw_to()).
+
+    An instance may be shared by several drawings. Its records and counts are then accumulated.
+    The allocations are traced with tracemalloc, which is global to the process, so a stage tracing them cannot run while
+    another one does (in any instance). Drawings with allocation tracing must not run concurrently.
+    """
+
+    def __init__(self, trace_allocations:bool=False, callback:Callable[[StageRecord], Any]=None) -> None:
+        """RenderStats constructor
+
+        Args:
+            trace_allocations (bool, optional): [True to trace the memory allocations of each stage with tracemalloc (slow, not for concurrent drawings)].
+                                                Defaults to False.
+
+            callback (Callable[[StageRecord], Any], optional): [function called with the record of each stage when it ends]. Defaults to None.
+        """
+        self._trace_allocations = trace_allocations
+        self._callback = callback
+        self._origin = time.perf_counter()
+        self._records:List[StageRecord] = []
+        self._counts:Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name:str)->Iterator[None]:
+        """Record the run of a stage.
+
+        Args:
+            name (str): [stage name]
+
+        Raises:
+            ArgError: [Error if the allocations are traced and another stage tracing them is running]
+        """
+        started_tracing = False
+        if self._trace_allocations:
+            # The peak would be reset by a concurrent stage, and tracing stopped by the stage which started it.
+            if not _ALLOCATION_TRACING_LOCK.acquire(blocking=False):
+                raise ArgError(f'Allocation tracing cannot be used by concurrent drawings : stage [{name}] started while another stage is traced')
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            base_bytes = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            allocated_bytes = None
+            peak_bytes = None
+            if self._trace_allocations:
+                current_bytes, traced_peak_bytes = tracemalloc.get_traced_memory()
+                allocated_bytes = current_bytes - base_bytes
+                # Before Python 3.9, the peak cannot be reset and is only valid if tracing started with the stage.
+                if started_tracing or hasattr(tracemalloc, 'reset_peak'):
+                    peak_bytes = traced_peak_bytes - base_bytes
+                if started_tracing:
+                    tracemalloc.stop()
+                _ALLOCATION_TRACING_LOCK.release()
+
+            record = StageRecord(name, start - self._origin, seconds, allocated_bytes, peak_bytes, threading.get_ident())
+            with self._lock:
+                self._records.append(record)
+            if self._callback is not None:
+                self._callback(record)
+
+    def add_count(self, name:str, num:int=1):
+        """Add to a count.
+
+        Args:
+            name (str): [count name. ex. 'nodes', 'dummy_nodes', 'lines', 'output_bytes']
+
+            num (int, optional): [number to add]. Defaults to 1.
+        """
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + num
+
+    def get_durations(self)->Dict[str, float]:
+        """Obtain the total duration of each stage.
+
+        Returns:
+            Dict[str, float]: [total duration (seconds) by stage name]
+        """
+        durations:Dict[str, float] = {}
+        for record in self._records:
+            durations[record.name] = durations.get(record.name, 0.0) + record.seconds
+        return durations
+
+    def to_dict(self)->Dict[str, Any]:
+        """Obtain the statistics as JSON serializable data.
+
+        Returns:
+            Dict[str, Any]: [durations by stage name, counts and records of the stages]
+        """
+        return {
+            'durations': self.get_durations(),
+            'counts': dict(self._counts),
+            'records': [
+                {
+                    'name': record.name,
+                    'start': record.start,
+                    'seconds': record.seconds,
+                    'allocated_bytes': record.allocated_bytes,
+                    'peak_bytes': record.peak_bytes,
+                }
+                for record in self._records
+            ],
+        }
+
+    def to_chrome_trace(self)->Dict[str, Any]:
+        """Obtain the records as Chrome trace event data, which can be opened with chrome://tracing or Perfetto.
+
+        Returns:
+            Dict[str, Any]: [trace event data]
+        """
+        pid = os.getpid()
+        events = []
+        end = 0.0
+        for record in self._records:
+            args = {}
+            if record.allocated_bytes is not None:
+                args['allocated_bytes'] = record.allocated_bytes
+            if record.peak_bytes is not None:
+                args['peak_bytes'] = record.peak_bytes
+            events.append({
+                'name': record.name,
+                'cat': 'dg_drawer',
+                'ph': 'X',
+                'ts': record.start * 1e6,
+                'dur': record.seconds * 1e6,
+                'pid': pid,
+                'tid': record.thread_id,
+                'args': args,
+            })
+            end = max(end, record.start + record.seconds)
+        if len(self._counts) > 0:
+            events.append({'name': 'counts', 'cat': 'dg_drawer', 'ph': 'C', 'ts': end * 1e6, 'pid': pid, 'args': dict(self._counts)})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save_chrome_trace(self, path:str):
+        """Save the records as a Chrome trace event file.
+
+        Args:
+            path (str): [file path]
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    @property
+    def records(self)->List[StageRecord]:
+        return list(self._records)
+
+    @property
+    def counts(self)->Dict[str, int]:
+        return dict(self._counts)
@@ -1,8 +1,20 @@
 
-from typing import List
+import asyncio
+from concurrent.futures import Executor
+import io
 import json
+import os
+import pathlib
+from typing import IO, Any, Dict, List, Optional, Union
+
+from dg_drawer.error.error import JSONDataError
+from dg_drawer.research_flow.json_reader import JSONReader, get_ijson
+from dg_drawer.research_flow.status_validator import StatusValidator
 
 class SubFlowStatus():
+
+    __slots__ = ('_id', '_name', '_link', '_parent_ids', '_create_datetime')
+
     def __init__(self, id:str, name:str, link:str, parent_ids:List[str], create_datetime:int) -> None:
         self._id = id
         self._name = name
@@ -13,6 +25,8 @@ class SubFlowStatus():
 
 class PhaseStatus():
 
+    __slots__ = ('_seq_number', '_name', '_sub_flow_data')
+
     def __init__(self, seq_number:int, name:str, sub_flow_data: List[SubFlowStatus]) -> None:
         self._seq_number = seq_number
         self._name = name
@@ -31,32 +45,262 @@ class ResearchFlowStatus():
         Args:
             json_path (str): [Research flow status file path]
 
+        Raises:
+            JSONDataError: [Error if a key is missing, a value has a wrong type, a sub flow ID is duplicated,
+                            or a parent ID is not found in the previous phases]
+
         Returns:
             List[PhaseStatus]: [Research Flow Status Instance]
         """
+        return cls.load(pathlib.Path(json_path))
 
-        with open(json_path, 'r') as f:
-            loaded_json = json.load(f)
+    @classmethod
+    def load(cls, source:Union[str, bytes, os.PathLike, IO])->List[PhaseStatus]:
+        """Load research flow status data (JSON) to obtain an instance
+
+        The data is read in chunks and each sub flow is created as soon as it is read,
+        so the whole JSON data is never held in memory as dicts and lists.
+        If ijson is installed, it is used to parse binary data.
+        Files and bytes data in the binary research flow status format (see binary_status) are also loaded.
 
-        ## TODO : check property : key and type
+        Args:
+            source (Union[str, bytes, os.PathLike, IO]): [Research flow status data.
+                                                         JSON text (str starting with '{'), file path (str or path-like object),
+                                                         bytes data or file-like object opened in text or binary mode]
 
-        ## get phase status list from ['research_flow_pahse_data']
-        phase_list = loaded_json['research_flow_pahse_data']
+        Raises:
+            JSONDataError: [Error if a key is missing, a value has a wrong type, a sub flow ID is duplicated,
+                            or a parent ID is not found in the previous phases]
+            BinaryDataError: [Error if binary data is not valid (subclass of JSONDataError)]
+            json.JSONDecodeError: [Error if the data is not valid JSON]
 
-        research_flow_status = []
-        for phase in phase_list:
-            sub_flow_data = []
-            for sub_flow in phase['sub_flow_data']:
-                sfs = SubFlowStatus(
-                        sub_flow['id'],
-                        sub_flow['name'],
-                        sub_flow['link'],
-                        sub_flow['parent_ids'],
-                        sub_flow['create_datetime']
-                    )
-                sub_flow_data.append(sfs)
-            ps = PhaseStatus(phase['seq_number'], phase['name'], sub_flow_data)
-            research_flow_status.append(ps)
+        Returns:
+            List[PhaseStatus]: [Research Flow Status Instance]
+        """
+        if isinstance(source, str) and source.lstrip().startswith('{'):
+            research_flow_status = cls._load_from_reader(JSONReader.from_text(source))
+        elif isinstance(source, (str, os.PathLike)):
+            # Imported here, as the binary format module builds instances of this module.
+            from dg_drawer.research_flow import binary_status
+            with open(source, 'rb') as f:
+                binary = binary_status.is_binary_status(f.read(len(binary_status.BINARY_MAGIC)))
+                if not binary:
+                    f.seek(0)
+                    research_flow_status = cls._load_from_file(f)
+            if binary:
+                return binary_status.load_binary_status(source)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            from dg_drawer.research_flow import binary_status
+            if binary_status.is_binary_status(source):
+                return binary_status.load_binary_status(source)
+            research_flow_status = cls._load_from_file(io.BytesIO(source))
+        else:
+            research_flow_status = cls._load_from_file(source)
 
         sorted_research_flow_status = sorted(research_flow_status, key=lambda x : x._seq_number)
+        StatusValidator.validate(sorted_research_flow_status, error_class=JSONDataError)
         return sorted_research_flow_status
+
+    @classmethod
+    async def aload(cls, source:Union[str, bytes, os.PathLike, IO], executor:Executor=None)->List[PhaseStatus]:
+        """Load research flow status data (JSON) in an executor, without blocking the event loop
+
+        The file is also read in the executor.
+
+        Args:
+            source (Union[str, bytes, os.PathLike, IO]): [Research flow status data. See load()]
+
+            executor (Executor, optional): [executor running load(). With a process pool, the source must be picklable (no file-like object)].
+                                           Defaults to None (default executor of the event loop).
+
+        Returns:
+            List[PhaseStatus]: [Research Flow Status Instance]
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, cls.load, source)
+
+    @classmethod
+    def _load_from_file(cls, f:IO)->List[PhaseStatus]:
+        ijson = get_ijson()
+        if ijson is not None and isinstance(f.read(0), bytes):
+            return cls._load_with_ijson(ijson, f)
+        return cls._load_from_reader(JSONReader(f.read))
+
+    @classmethod
+    def _load_from_reader(cls, reader:JSONReader)->List[PhaseStatus]:
+        """Load research flow status data with JSONReader.
+
+        Args:
+            reader (JSONReader): [reader of research flow status data]
+
+        Returns:
+            List[PhaseStatus]: [Research Flow Status Instance (not sorted)]
+        """
+        ids:Dict[str, str] = {}
+        research_flow_status = []
+        found = False
+        cls._expect_json_container(reader, '{', '(root)')
+        for key in reader.iter_object():
+            if key != 'research_flow_pahse_data':
+                reader.skip_value()
+                continue
+            found = True
+            cls._expect_json_container(reader, '[', key)
+            for phase_number in reader.iter_array():
+                phase_location = f'research_flow_pahse_data[{phase_number}]'
+                cls._expect_json_container(reader, '{', phase_location)
+                phase = {}
+                sub_flow_data = None
+                for phase_key in reader.iter_object():
+                    if phase_key == 'sub_flow_data':
+                        cls._expect_json_container(reader, '[', f'{phase_location}.sub_flow_data')
+                        sub_flow_data = []
+                        for sub_flow_number, sub_flow in enumerate(reader.iter_values()):
+                            sub_flow_data.append(cls._create_sub_flow(sub_flow, ids, f'{phase_location}.sub_flow_data[{sub_flow_number}]'))
+                    else:
+                        phase[phase_key] = reader.read_value()
+                research_flow_status.append(cls._create_phase(phase, sub_flow_data, phase_location))
+        reader.expect_end()
+
+        if not found:
+            raise JSONDataError('Missing key [research_flow_pahse_data] at (root)')
+        return research_flow_status
+
+    @classmethod
+    def _expect_json_container(cls, reader:JSONReader, char:str, location:str):
+        """Check that the next value is an object ('{') or an array ('[').
+
+        Raises:
+            JSONDataError: [Error if the next value is not the expected container]
+        """
+        if reader.peek() != char:
+            raise JSONDataError(f'Invalid type at {location} : expected {"object" if char == "{" else "array"}')
+
+    @classmethod
+    def _load_with_ijson(cls, ijson:Any, f:IO)->List[PhaseStatus]:
+        """Load research flow status data with ijson.
+
+        Args:
+            ijson (Any): [ijson module]
+
+            f (IO): [file-like object opened in binary mode]
+
+        Raises:
+            json.JSONDecodeError: [Error if the data is not valid JSON, as with JSONReader]
+
+        Returns:
+            List[PhaseStatus]: [Research Flow Status Instance (not sorted)]
+        """
+        phase_prefix = 'research_flow_pahse_data.item'
+        sub_flow_prefix = 'research_flow_pahse_data.item.sub_flow_data.item'
+
+        ids:Dict[str, str] = {}
+        research_flow_status = []
+        found = False
+        builder = None
+        phase_location = ''
+        for prefix, event, value in cls._iter_ijson_events(ijson, f):
+            if builder is not None:
+                if prefix == sub_flow_prefix and event == 'end_map':
+                    sub_flow_data.append(cls._create_sub_flow(builder.value, ids, f'{phase_location}.sub_flow_data[{len(sub_flow_data)}]'))
+                    builder = None
+                else:
+                    builder.event(event, value)
+            elif prefix == sub_flow_prefix:
+                if event == 'start_map':
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                elif event != 'end_array':
+                    # Not an object. An array item only gives start_array and end_array here, as its own items have another prefix.
+                    StatusValidator.validate_sub_flow_json([] if event == 'start_array' else value,
+                                                           f'{phase_location}.sub_flow_data[{len(sub_flow_data)}]')
+            elif prefix == 'research_flow_pahse_data':
+                if event not in ('start_array', 'end_array'):
+                    raise JSONDataError('Invalid type at research_flow_pahse_data : expected array')
+                found = True
+            elif prefix == phase_prefix:
+                if event == 'start_map':
+                    phase_location = f'research_flow_pahse_data[{len(research_flow_status)}]'
+                    phase = {}
+                    sub_flow_data = None
+                elif event == 'end_map':
+                    research_flow_status.append(cls._create_phase(phase, sub_flow_data, phase_location))
+                elif event != 'map_key':
+                    raise JSONDataError(f'Invalid type at research_flow_pahse_data[{len(research_flow_status)}] : expected object')
+            elif prefix == phase_prefix + '.sub_flow_data':
+                if event == 'start_array':
+                    sub_flow_data = []
+                elif event != 'end_array':
+                    raise JSONDataError(f'Invalid type at {phase_location}.sub_flow_data : expected array')
+            elif prefix in (phase_prefix + '.seq_number', phase_prefix + '.name'):
+                # An object or an array is kept as an empty one, so the validation reports its type as JSONReader does.
+                if event == 'start_map':
+                    phase[prefix[len(phase_prefix)+1:]] = {}
+                elif event == 'start_array':
+                    phase[prefix[len(phase_prefix)+1:]] = []
+                elif event not in ('map_key', 'end_map', 'end_array'):
+                    phase[prefix[len(phase_prefix)+1:]] = value
+
+        if not found:
+            raise JSONDataError('Missing key [research_flow_pahse_data] at (root)')
+        return research_flow_status
+
+    @classmethod
+    def _iter_ijson_events(cls, ijson:Any, f:IO):
+        # Parse errors of ijson are raised as json.JSONDecodeError, like the errors of JSONReader.
+        try:
+            yield from ijson.parse(f, use_float=True)
+        except ijson.JSONError as e:
+            error = json.JSONDecodeError(str(e), '', 0)
+            error.args = (str(e),)
+            raise error from e
+
+    @classmethod
+    def _create_phase(cls, phase:Dict[str, Any], sub_flow_data:Optional[List[SubFlowStatus]], location:str)->PhaseStatus:
+        """Create a phase from its JSON data.
+
+        Args:
+            phase (Dict[str, Any]): [JSON data of a phase, except sub_flow_data]
+
+            sub_flow_data (Optional[List[SubFlowStatus]]): [sub flows of the phase. None if sub_flow_data is missing]
+
+            location (str): [location of the phase in the JSON data]
+
+        Raises:
+            JSONDataError: [Error if a key is missing or a value has a wrong type]
+
+        Returns:
+            PhaseStatus: [phase]
+        """
+        StatusValidator.validate_phase_json(phase, location)
+        if sub_flow_data is None:
+            raise JSONDataError(f'Missing key [sub_flow_data] at {location}')
+        return PhaseStatus(phase['seq_number'], phase['name'], sub_flow_data)
+
+    @classmethod
+    def _create_sub_flow(cls, sub_flow:Dict[str, Any], ids:Dict[str, str], location:str)->SubFlowStatus:
+        """Create a sub flow from its JSON data.
+        Parent IDs share the string of the ID of the parent sub flow already read.
+
+        Args:
+            sub_flow (Dict[str, Any]): [JSON data of a sub flow]
+
+            ids (Dict[str, str]): [IDs of the sub flows already read]
+
+            location (str): [location of the sub flow in the JSON data]
+
+        Raises:
+            JSONDataError: [Error if a key is missing or a value has a wrong type]
+
+        Returns:
+            SubFlowStatus: [sub flow]
+        """
+        StatusValidator.validate_sub_flow_json(sub_flow, location)
+        id = ids.setdefault(sub_flow['id'], sub_flow['id'])
+        return SubFlowStatus(
+                id,
+                sub_flow['name'],
+                sub_flow['link'],
+                [ids.get(parent_id, parent_id) for parent_id in sub_flow['parent_ids']],
+                sub_flow['create_datetime']
+            )
@@ -0,0 +1,292 @@
+import os
+import sqlite3
+from typing import IO, Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow.research_flow_status import PhaseStatus, ResearchFlowStatus, SubFlowStatus
+from dg_drawer.research_flow.status_validator import StatusValidator
+
+# Version of the database schema. Change it when the tables or their meaning change.
+SCHEMA_VERSION = 1
+
+# Sub flows are numbered by row in the order of the phases and the sub flows (see StatusValidator.validate()),
+# and the parents are stored as rows, so a parent row is always lower than the row of its child.
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS phase (
+    project TEXT NOT NULL,
+    seq_number INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (project, seq_number)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sub_flow (
+    project TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    seq_number INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    link TEXT NOT NULL,
+    create_datetime INTEGER NOT NULL,
+    PRIMARY KEY (project, row)
+) WITHOUT ROWID;
+CREATE UNIQUE INDEX IF NOT EXISTS sub_flow_id ON sub_flow (project, id);
+CREATE INDEX IF NOT EXISTS sub_flow_phase ON sub_flow (project, seq_number, row);
+CREATE INDEX IF NOT EXISTS sub_flow_create_datetime ON sub_flow (project, create_datetime);
+CREATE TABLE IF NOT EXISTS parent (
+    project TEXT NOT NULL,
+    child_row INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    parent_row INTEGER NOT NULL,
+    PRIMARY KEY (project, child_row, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS parent_parent_row ON parent (project, parent_row);
+'''
+
+
+class StatusDatabase():
+    """StatusDatabase class
+
+    Research flow status of many projects in a local SQLite database, indexed by project, phase, creation datetime and parent relations.
+    A query reads only the rows of the selected sub flows, and builds the research flow status instance while the rows are read.
+
+    * load() : sub flows of some phases or created in a period.
+    * load_lineage() : ancestors and descendants of a sub flow.
+
+    Parents which are not selected by a query are left out, so the result can be drawn as is.
+    """
+
+    def __init__(self, path:Union[str, os.PathLike]=':memory:') -> None:
+        """StatusDatabase constructor. The tables are created if needed.
+
+        Args:
+            path (Union[str, os.PathLike], optional): [path of the database file]. Defaults to ':memory:' (database in memory).
+
+        Raises:
+            ArgError: [Error if the database was created by another version of the schema]
+        """
+        self._connection = sqlite3.connect(path)
+        try:
+            version = self._connection.execute('PRAGMA user_version').fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                raise ArgError(f'Unsupported schema version of the status database : {version} (supported {SCHEMA_VERSION})')
+            if os.fspath(path) != ':memory:':
+                # Readers are not blocked while a project is imported.
+                self._connection.execute('PRAGMA journal_mode=WAL')
+            with self._connection:
+                self._connection.executescript(_SCHEMA)
+                self._connection.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+        except BaseException:
+            self._connection.close()
+            raise
+
+    def close(self):
+        """Close the database.
+        """
+        self._connection.close()
+
+    def __enter__(self)->'StatusDatabase':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def import_research_flow_status(self, project:str, research_flow_status:List[PhaseStatus]):
+        """Store the research flow status of a project, replacing the stored one.
+
+        Args:
+            project (str): [project name]
+
+            research_flow_status (List[PhaseStatus]): [Research Flow Status Instance]
+
+        Raises:
+            ArgError: [Error if the research flow status is not valid]
+        """
+        research_flow_status = sorted(research_flow_status, key=lambda x : x._seq_number)
+        rows = StatusValidator.validate(research_flow_status)
+        sub_flows = [(phase_status._seq_number, sub_flow) for phase_status in research_flow_status for sub_flow in phase_status._sub_flow_data]
+        with self._connection:
+            self._delete(project)
+            self._connection.executemany(
+                'INSERT INTO phase (project, seq_number, name) VALUES (?, ?, ?)',
+                ((project, phase_status._seq_number, phase_status._name) for phase_status in research_flow_status)
+            )
+            self._connection.executemany(
+                'INSERT INTO sub_flow (project, row, seq_number, id, name, link, create_datetime) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                ((project, row, seq_number, sub_flow._id, sub_flow._name, sub_flow._link, sub_flow._create_datetime)
+                 for row, (seq_number, sub_flow) in enumerate(sub_flows))
+            )
+            self._connection.executemany(
+                'INSERT INTO parent (project, child_row, position, parent_row) VALUES (?, ?, ?, ?)',
+                ((project, row, position, rows[parent_id])
+                 for row, (_, sub_flow) in enumerate(sub_flows) for position, parent_id in enumerate(sub_flow._parent_ids))
+            )
+
+    def import_json(self, project:str, source:Union[str, bytes, os.PathLike, IO]):
+        """Load research flow status data and store it as the research flow status of a project, replacing the stored one.
+
+        Args:
+            project (str): [project name]
+
+            source (Union[str, bytes, os.PathLike, IO]): [research flow status data (see ResearchFlowStatus.load())]
+
+        Raises:
+            JSONDataError: [Error if the data is not valid research flow status data]
+        """
+        self.import_research_flow_status(project, ResearchFlowStatus.load(source))
+
+    def delete_project(self, project:str):
+        """Delete the research flow status of a project.
+
+        Args:
+            project (str): [project name]
+        """
+        with self._connection:
+            self._delete(project)
+
+    def _delete(self, project:str):
+        for table in ('parent', 'sub_flow', 'phase'):
+            self._connection.execute(f'DELETE FROM {table} WHERE project = ?', (project,))
+
+    def get_projects(self)->List[str]:
+        """Obtain the stored projects.
+
+        Returns:
+            List[str]: [project names]
+        """
+        return [project for project, in self._connection.execute('SELECT DISTINCT project FROM phase ORDER BY project')]
+
+    def load(self, project:str, seq_numbers:Iterable[int]=None, created_from:int=None, created_to:int=None)->List[PhaseStatus]:
+        """Load the research flow status of a project, or the sub flows of some phases or created in a period.
+
+        Args:
+            project (str): [project name]
+
+            seq_numbers (Iterable[int], optional): [sequence numbers of the phases to load]. Defaults to None (all the phases).
+
+            created_from (int, optional): [minimum creation datetime of the sub flows]. Defaults to None.
+
+            created_to (int, optional): [maximum creation datetime of the sub flows (inclusive)]. Defaults to None.
+
+        Raises:
+            ArgError: [Error if the project is not found]
+
+        Returns:
+            List[PhaseStatus]: [Research Flow Status Instance]
+        """
+        params:Dict[str, Any] = {'project': project}
+        conditions = []
+        if seq_numbers is not None:
+            seq_numbers = list(seq_numbers)
+            names = []
+            for index, seq_number in enumerate(seq_numbers):
+                params[f'seq_number_{index}'] = seq_number
+                names.append(f':seq_number_{index}')
+            conditions.append(f'c.seq_number IN ({", ".join(names)})')
+        if created_from is not None:
+            params['created_from'] = created_from
+            conditions.append('c.create_datetime >= :created_from')
+        if created_to is not None:
+            params['created_to'] = created_to
+            conditions.append('c.create_datetime <= :created_to')
+        return self._load(project, '', conditions, params, seq_numbers)
+
+    def load_lineage(self, project:str, sub_flow_id:str, ancestors:bool=True, descendants:bool=True)->List[PhaseStatus]:
+        """Load a sub flow with its ancestors and descendants. The relations are followed in the database with the parent indexes.
+
+        Args:
+            project (str): [project name]
+
+            sub_flow_id (str): [sub flow ID]
+
+            ancestors (bool, optional): [True to load the ancestors]. Defaults to True.
+
+            descendants (bool, optional): [True to load the descendants]. Defaults to True.
+
+        Raises:
+            ArgError: [Error if the project or the sub flow is not found]
+
+        Returns:
+            List[PhaseStatus]: [Research Flow Status Instance with all the phases of the project]
+        """
+        params = {'project': project, 'sub_flow_id': sub_flow_id}
+        if self._connection.execute('SELECT 1 FROM sub_flow WHERE project = :project AND id = :sub_flow_id', params).fetchone() is None:
+            raise ArgError(f'Sub flow [{sub_flow_id}] is not found in project [{project}]')
+        ancestors_sql = 'SELECT row FROM start'
+        if ancestors:
+            ancestors_sql += ' UNION SELECT p.parent_row FROM parent p JOIN ancestors a ON p.project = :project AND p.child_row = a.row'
+        descendants_sql = 'SELECT row FROM start'
+        if descendants:
+            descendants_sql += ' UNION SELECT p.child_row FROM parent p JOIN descendants d ON p.project = :project AND p.parent_row = d.row'
+        with_sql = (
+            'WITH RECURSIVE '
+            'start(row) AS (SELECT row FROM sub_flow WHERE project = :project AND id = :sub_flow_id), '
+            f'ancestors(row) AS ({ancestors_sql}), '
+            f'descendants(row) AS ({descendants_sql}), '
+            'lineage(row) AS (SELECT row FROM ancestors UNION SELECT row FROM descendants) '
+        )
+        return self._load(project, with_sql, ['c.row IN lineage'], params, None)
+
+    def _load(self, project:str, with_sql:str, conditions:List[str], params:Dict[str, Any], seq_numbers:List[int])->List[PhaseStatus]:
+        """Load the selected sub flows of a project.
+
+        Args:
+            project (str): [project name]
+            with_sql (str): [WITH clause of the queries]
+            conditions (List[str]): [conditions selecting the sub flows (alias c)]
+            params (Dict[str, Any]): [parameters of the queries]
+            seq_numbers (List[int]): [sequence numbers of the loaded phases. None for all the phases]
+
+        Raises:
+            ArgError: [Error if the project is not found]
+
+        Returns:
+            List[PhaseStatus]: [Research Flow Status Instance]
+        """
+        phases = self._connection.execute('SELECT seq_number, name FROM phase WHERE project = ? ORDER BY seq_number', (project,)).fetchall()
+        if len(phases) == 0:
+            raise ArgError(f'Project [{project}] is not found')
+        if seq_numbers is not None:
+            selected = set(seq_numbers)
+            phases = [phase for phase in phases if phase[0] in selected]
+        research_flow_status = [PhaseStatus(seq_number, name, []) for seq_number, name in phases]
+        sub_flow_data = {phase_status._seq_number: phase_status._sub_flow_data for phase_status in research_flow_status}
+
+        for seq_number, sub_flow in self._iter_sub_flows(with_sql, ' AND '.join(['c.project = :project'] + conditions), params):
+            sub_flow_data[seq_number].append(sub_flow)
+        return research_flow_status
+
+    def _iter_sub_flows(self, with_sql:str, where_sql:str, params:Dict[str, Any])->Iterator[Tuple[int, SubFlowStatus]]:
+        """Read the selected sub flows and their parents. Both are read in the order of the rows, and joined as they are read.
+
+        Args:
+            with_sql (str): [WITH clause of the queries]
+            where_sql (str): [condition selecting the sub flows (alias c)]
+            params (Dict[str, Any]): [parameters of the queries]
+
+        Yields:
+            Tuple[int, SubFlowStatus]: [sequence number of the phase and sub flow]
+        """
+        sub_flows = self._connection.execute(
+            f'{with_sql}SELECT c.row, c.seq_number, c.id, c.name, c.link, c.create_datetime FROM sub_flow c WHERE {where_sql} ORDER BY c.row',
+            params
+        )
+        if where_sql == 'c.project = :project':
+            # All the sub flows are loaded, so the parents are read in the order of their primary key without the join.
+            parents = self._connection.execute('SELECT child_row, parent_row FROM parent WHERE project = :project ORDER BY child_row, position', params)
+        else:
+            parents = self._connection.execute(
+                # CROSS JOIN makes SQLite select the sub flows with their indexes first, then look up their parents.
+                f'{with_sql}SELECT p.child_row, p.parent_row FROM sub_flow c CROSS JOIN parent p ON p.project = c.project AND p.child_row = c.row '
+                f'WHERE {where_sql} ORDER BY p.child_row, p.position',
+                params
+            )
+        # ID of the loaded sub flows by row. Parents are loaded before their children, and parents which are not loaded are left out.
+        ids:Dict[int, str] = {}
+        parent = next(parents, None)
+        for row, seq_number, id, name, link, create_datetime in sub_flows:
+            parent_ids = []
+            while parent is not None and parent[0] <= row:
+                if parent[0] == row and parent[1] in ids:
+                    parent_ids.append(ids[parent[1]])
+                parent = next(parents, None)
+            ids[row] = id
+            yield seq_number, SubFlowStatus(id, name, link, parent_ids, create_datetime)
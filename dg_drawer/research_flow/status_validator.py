@@ -0,0 +1,117 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Type
+
+from dg_drawer.error.error import ArgError, JSONDataError
+
+if TYPE_CHECKING:
+    # research_flow_status imports this module
+    from dg_drawer.research_flow.research_flow_status import PhaseStatus
+
+
+class StatusValidator():
+    """StatusValidator class
+
+    Validation of research flow status.
+
+    The JSON data of phases and sub flows is checked (keys and types) while it is loaded,
+    and the relations between sub flows are checked in a single pass over the loaded instance,
+    before any layout work is done.
+    """
+
+    # Keys and types of the JSON data of a phase and a sub flow
+    PHASE_SCHEMA = (('seq_number', int), ('name', str))
+    SUB_FLOW_SCHEMA = (('id', str), ('name', str), ('link', str), ('parent_ids', list), ('create_datetime', int))
+
+    @classmethod
+    def validate_phase_json(cls, phase:Any, location:str):
+        """Check the keys and the types of the JSON data of a phase (except sub_flow_data).
+
+        Args:
+            phase (Any): [JSON data of a phase]
+
+            location (str): [location of the phase in the JSON data. ex. 'research_flow_pahse_data[0]']
+
+        Raises:
+            JSONDataError: [Error if a key is missing or a value has a wrong type]
+        """
+        cls._validate_json_object(phase, location, cls.PHASE_SCHEMA)
+
+    @classmethod
+    def validate_sub_flow_json(cls, sub_flow:Any, location:str):
+        """Check the keys and the types of the JSON data of a sub flow.
+
+        Args:
+            sub_flow (Any): [JSON data of a sub flow]
+
+            location (str): [location of the sub flow in the JSON data. ex. 'research_flow_pahse_data[0].sub_flow_data[1]']
+
+        Raises:
+            JSONDataError: [Error if a key is missing or a value has a wrong type]
+        """
+        cls._validate_json_object(sub_flow, location, cls.SUB_FLOW_SCHEMA)
+        for index, parent_id in enumerate(sub_flow['parent_ids']):
+            if type(parent_id) is not str:
+                raise JSONDataError(f'Invalid type at {location}.parent_ids[{index}] : expected str, got {type(parent_id).__name__}')
+
+    @classmethod
+    def _validate_json_object(cls, data:Any, location:str, schema:tuple):
+        if type(data) is not dict:
+            raise JSONDataError(f'Invalid type at {location} : expected object, got {type(data).__name__}')
+        for key, value_type in schema:
+            if key not in data:
+                raise JSONDataError(f'Missing key [{key}] at {location}')
+            # bool is a subclass of int, but true and false are not accepted as numbers.
+            if type(data[key]) is not value_type:
+                raise JSONDataError(f'Invalid type at {location}.{key} : expected {value_type.__name__}, got {type(data[key]).__name__}')
+
+    @classmethod
+    def validate(cls, research_flow_status:List['PhaseStatus'], error_class:Type[Exception]=ArgError)->Dict[str, int]:
+        """Check the relations between the sub flows and obtain the index of the sub flow IDs.
+
+        Sub flow IDs must be unique, and the parents of a sub flow must be in the previous phases.
+        Since every parent is in a previous phase, the relations have no cycle.
+
+        Args:
+            research_flow_status (List[PhaseStatus]): [Research Flow Status Instance]
+
+            error_class (Type[Exception], optional): [class of the raised error]. Defaults to ArgError.
+
+        Raises:
+            error_class: [Error if an ID is duplicated, or a parent ID is not found or is not in a previous phase]
+
+        Returns:
+            Dict[str, int]: [index of the sub flows (row) by ID. Rows are numbered in the order of the phases and the sub flows]
+        """
+        index:Dict[str, int] = {}
+        phase_indexes:List[int] = []
+        for phase_index, phase_status in enumerate(research_flow_status):
+            for sub_flow_index, sub_flow in enumerate(phase_status._sub_flow_data):
+                if sub_flow._id in index:
+                    row = index[sub_flow._id]
+                    raise error_class(
+                        f'Duplicate sub flow ID [{sub_flow._id}] at {cls._get_location(research_flow_status, phase_index, sub_flow_index)}, '
+                        f'already used in phase [{research_flow_status[phase_indexes[row]]._seq_number}]'
+                    )
+                index[sub_flow._id] = len(phase_indexes)
+                phase_indexes.append(phase_index)
+
+        for phase_index, phase_status in enumerate(research_flow_status):
+            for sub_flow_index, sub_flow in enumerate(phase_status._sub_flow_data):
+                for parent_id in sub_flow._parent_ids:
+                    row = index.get(parent_id)
+                    if row is None:
+                        raise error_class(
+                            f'Parent ID [{parent_id}] of sub flow [{sub_flow._id}] is not found '
+                            f'at {cls._get_location(research_flow_status, phase_index, sub_flow_index)}'
+                        )
+                    if phase_indexes[row] >= phase_index:
+                        raise error_class(
+                            f'Parent ID [{parent_id}] of sub flow [{sub_flow._id}] is not in a previous phase '
+                            f'at {cls._get_location(research_flow_status, phase_index, sub_flow_index)}, '
+                            f'found in phase [{research_flow_status[phase_indexes[row]]._seq_number}]'
+                        )
+        return index
+
+    @classmethod
+    def _get_location(cls, research_flow_status:List['PhaseStatus'], phase_index:int, sub_flow_index:int)->str:
+        phase_status = research_flow_status[phase_index]
+        return f'phase [{phase_status._seq_number}] ({phase_status._name}) sub flow [{sub_flow_index}]'
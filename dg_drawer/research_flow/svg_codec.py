@@ -0,0 +1,111 @@
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+import zlib
+
+from dg_drawer.error.error import ArgError
+
+# Factory of a compressor. A compressor has the methods compress(data:bytes)->bytes and flush()->bytes
+# (as zlib compression objects), flush() ending the compressed data.
+CompressorFactory = Callable[[], Any]
+
+
+class _BrotliCompressor():
+    """Adapter of a brotli compressor to the interface of zlib compression objects.
+    """
+
+    __slots__ = ('_compressor',)
+
+    def __init__(self, brotli:Any) -> None:
+        self._compressor = brotli.Compressor()
+
+    def compress(self, data:bytes)->bytes:
+        return self._compressor.process(data)
+
+    def flush(self)->bytes:
+        return self._compressor.finish()
+
+
+def _create_brotli_compressor()->_BrotliCompressor:
+    try:
+        import brotli
+    except ImportError:
+        raise ArgError('The brotli codec needs the brotli package') from None
+    return _BrotliCompressor(brotli)
+
+
+# gzip data (the format of .svgz files) has no file name and a zero modification time, so the same SVG data gives the same bytes.
+_CODECS:Dict[str, CompressorFactory] = {
+    'gzip': lambda: zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, 16 + zlib.MAX_WBITS),
+    'deflate': lambda: zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION),
+    'br': _create_brotli_compressor,
+}
+_CODECS_LOCK = threading.Lock()
+
+
+def register_codec(name:str, factory:CompressorFactory, overwrite:bool=False):
+    """Register a codec for compressed SVG data.
+
+    Args:
+        name (str): [codec name. ex. 'zstd']
+
+        factory (CompressorFactory): [function creating a compressor. A compressor has the methods compress(data:bytes)->bytes and flush()->bytes]
+
+        overwrite (bool, optional): [True to replace a registered codec]. Defaults to False.
+
+    Raises:
+        ArgError: [Error if the codec is already registered]
+    """
+    with _CODECS_LOCK:
+        if name in _CODECS and not overwrite:
+            raise ArgError(f'Codec [{name}] is already registered')
+        _CODECS[name] = factory
+
+
+def get_codecs()->List[str]:
+    """Obtain the names of the registered codecs.
+
+    Returns:
+        List[str]: [codec names. 'br' needs the brotli package]
+    """
+    return list(_CODECS)
+
+
+def create_compressor(name:str)->Any:
+    """Create a compressor of a codec.
+
+    Args:
+        name (str): [codec name. 'gzip', 'deflate', 'br' or a registered codec]
+
+    Raises:
+        ArgError: [Error if the codec is not registered or its package is not installed]
+
+    Returns:
+        Any: [compressor]
+    """
+    factory = _CODECS.get(name)
+    if factory is None:
+        raise ArgError(f'Unsupported codec [{name}]. Supported codecs : {get_codecs()}')
+    return factory()
+
+
+def iter_compressed(chunks:Iterable[bytes], name:str)->Iterator[bytes]:
+    """Compress data chunk by chunk.
+
+    Args:
+        chunks (Iterable[bytes]): [chunks of the data]
+        name (str): [codec name]
+
+    Raises:
+        ArgError: [Error if the codec is not registered or its package is not installed]
+
+    Yields:
+        bytes: [chunk of the compressed data. Empty chunks are not yielded]
+    """
+    compressor = create_compressor(name)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    data = compressor.flush()
+    if data:
+        yield data
@@ -17,6 +17,11 @@ setuptools.setup(
     url="https://fea",
     python_requires=">=3.8",
     packages=setuptools.find_packages(),
+    entry_points={
+        "console_scripts": [
+            "dg-drawer-render=dg_drawer.research_flow.render_cli:main",
+        ],
+    },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Programming Language :: Python :: 3",
@@ -94,3 +94,40 @@ class TestLabel(TestCase):
         expected_value = f'<line x1="{p_cx}" y1="{p_cy}" x2="{c_cx}" y2="{c_cy}" stroke="{stroke}" stroke-width="{stroke_width}" />'
 
         self.assertEqual(expected_value,result)
+
+    def test_generate_path_data(self):
+        p_node = Node(id='101', parent_ids=[], create_datetime=1234, node_name='node A', cx=11, cy=12, cr=13)
+        c_node = Node(id='200', parent_ids=['101'], create_datetime=1234, node_name='node B', cx=21, cy=22, cr=23)
+
+        line = Line(parent_node=p_node, child_node=c_node)
+
+        self.assertEqual('M11 12L21 22', line.generate_path_data())
+        self.assertEqual(('gray', 1), line.style)
+
+    def test_generate_svg_lines(self):
+        node_1 = Node(id='1', parent_ids=[], create_datetime=0, node_name='node 1', cx=10, cy=10)
+        node_2 = Node(id='2', parent_ids=['1'], create_datetime=0, node_name='node 2', cx=20, cy=10)
+        node_3 = Node(id='3', parent_ids=['1'], create_datetime=0, node_name='node 3', cx=20, cy=20)
+        nodes_each_phase = [[node_1], [node_2, node_3]]
+
+        result = Line.generate_svg_lines(nodes_each_phase)
+        expected_value = '<line x1="10" y1="10" x2="20" y2="10" stroke="gray" stroke-width="1" /><line x1="10" y1="10" x2="20" y2="20" stroke="gray" stroke-width="1" />'
+
+        self.assertEqual(expected_value, result)
+        self.assertEqual(['1'], [node.id for node in nodes_each_phase[0]])
+
+        ## only the parents in the previous phase are connected (from the last phase)
+        nodes_each_phase.append([Node(id='4', parent_ids=['1', '100', '3'], create_datetime=0, node_name='node 4', cx=30, cy=30)])
+        self.assertEqual('<line x1="20" y1="20" x2="30" y2="30" stroke="gray" stroke-width="1" />' + expected_value,
+                         Line.generate_svg_lines(nodes_each_phase))
+
+    def test_generate_svg_paths(self):
+        node_1 = Node(id='1', parent_ids=[], create_datetime=0, node_name='node 1', cx=10, cy=10)
+        node_2 = Node(id='2', parent_ids=['1'], create_datetime=0, node_name='node 2', cx=20, cy=10)
+        node_3 = Node(id='3', parent_ids=['1'], create_datetime=0, node_name='node 3', cx=20, cy=20)
+        nodes_each_phase = [[node_1], [node_2, node_3]]
+
+        result = Line.generate_svg_paths(nodes_each_phase)
+        expected_value = '<path d="M10 10L20 10M10 10L20 20" fill="none" stroke="gray" stroke-width="1" />'
+
+        self.assertEqual(expected_value, result)
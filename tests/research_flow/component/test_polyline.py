@@ -0,0 +1,25 @@
+from unittest import TestCase
+from dg_drawer.research_flow.component.line import Line
+from dg_drawer.research_flow.component.polyline import Polyline
+from dg_drawer.error.error import ArgError
+
+
+class TestPolyline(TestCase):
+    # test exec : python -m unittest tests.research_flow.component.test_polyline
+
+    def test_generate_svg_component(self):
+        polyline = Polyline(points=[(10, 20), (30, 40), (50, 20)], stroke='red', stroke_width=2)
+
+        self.assertEqual('<polyline points="10,20 30,40 50,20" fill="none" stroke="red" stroke-width="2" />', polyline.generate_svg_component())
+        self.assertEqual('M10 20L30 40L50 20', polyline.generate_path_data())
+        self.assertEqual([(10, 20), (30, 40), (50, 20)], polyline.points)
+        self.assertEqual(('red', 2), polyline.style)
+
+    def test_merged_svg_paths(self):
+        lines = [Line.from_points(1, 2, 3, 4), Polyline(points=[(5, 6), (7, 8), (9, 10)])]
+
+        self.assertEqual(['<path d="M1 2L3 4M5 6L7 8L9 10" fill="none" stroke="gray" stroke-width="1" />'], list(Line.iter_merged_svg_paths(lines)))
+
+    def test_constructor_err(self):
+        with self.assertRaises(ArgError):
+            Polyline(points=[(10, 20)])
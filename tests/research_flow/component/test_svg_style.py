@@ -0,0 +1,41 @@
+from unittest import TestCase
+from dg_drawer.research_flow.component.svg_style import SvgStyle
+from dg_drawer.research_flow.enums import color
+from dg_drawer.research_flow.enums.color import ColorType
+from dg_drawer.error.error import EnumValueError
+
+
+class TestSvgStyle(TestCase):
+    # test exec : python -m unittest tests.research_flow.component.test_svg_style
+
+    def test_generate_svg_component(self):
+        svg = SvgStyle(phase_num=2, node_r=8).generate_svg_component()
+
+        self.assertTrue(svg.startswith('<style>'))
+        self.assertIn('.dg-rf .h0{fill:#616161}', svg)
+        self.assertIn('.dg-rf .n1{fill:#B2DFDB}', svg)
+        self.assertNotIn('.h2{', svg)
+        self.assertTrue(svg.endswith('<defs><circle id="dg-rf-node" r="8"/></defs>'))
+
+    def test_palette(self):
+        palette = ColorType.get_palette(30)
+
+        self.assertEqual(30, len(palette))
+        self.assertEqual(('#616161', '#BDBDBD'), palette[0])
+        self.assertEqual(('#512DA8', '#D1C4E9'), palette[8])
+        for index, (phase_color, node_color) in enumerate(palette):
+            self.assertRegex(phase_color, r'^#[0-9A-F]{6}$')
+            self.assertRegex(node_color, r'^#[0-9A-F]{6}$')
+            self.assertEqual(phase_color, ColorType.get_phase_color_by_index(index))
+            self.assertEqual(node_color, ColorType.get_phase_node_by_index(index))
+        # Adjacent phases have different colours.
+        for index in range(1, 30):
+            self.assertNotEqual(palette[index-1], palette[index])
+
+        ## colours of phases beyond the palette are generated on demand, without extending the palette
+        self.assertRegex(ColorType.get_phase_color_by_index(10**9), r'^#[0-9A-F]{6}$')
+        self.assertEqual(ColorType.get_palette(101)[100], (ColorType.get_phase_color_by_index(100), ColorType.get_phase_node_by_index(100)))
+        self.assertLess(len(color._PALETTE), 10**3)
+
+        with self.assertRaises(EnumValueError):
+            ColorType.get_phase_color_by_index(-1)
@@ -0,0 +1,66 @@
+from unittest import IsolatedAsyncioTestCase
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import time
+
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow.async_renderer import AsyncRenderer
+from dg_drawer.research_flow.flow_drawer import FlowDrawer
+from dg_drawer.research_flow.research_flow_status import ResearchFlowStatus
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+class CountingExecutor(ThreadPoolExecutor):
+
+    def __init__(self, max_workers:int) -> None:
+        super().__init__(max_workers=max_workers)
+        self.running = 0
+        self.max_running = 0
+        self._count_lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        def run():
+            with self._count_lock:
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+            try:
+                time.sleep(0.05)
+                return fn(*args, **kwargs)
+            finally:
+                with self._count_lock:
+                    self.running -= 1
+        return super().submit(run)
+
+
+class TestAsyncRenderer(IsolatedAsyncioTestCase):
+    # test exec : python -m unittest tests.research_flow.test_async_renderer
+
+    async def test_aload_adraw(self):
+        research_flow_status = await ResearchFlowStatus.aload(test_data_path)
+        expected = FlowDrawer(ResearchFlowStatus.load_from_json(test_data_path)).draw()
+        self.assertEqual(expected, await FlowDrawer(research_flow_status).adraw())
+
+        renderer = AsyncRenderer()
+        self.assertEqual(expected, await renderer.adraw(await renderer.aload(test_data_path)))
+
+    async def test_max_concurrency(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(test_data_path)
+        with CountingExecutor(max_workers=4) as executor:
+            renderer = AsyncRenderer(executor=executor, max_concurrency=2)
+
+            ## the event loop is not blocked while drawing
+            ticks = []
+            async def tick():
+                for _ in range(5):
+                    ticks.append(len(ticks))
+                    await asyncio.sleep(0.01)
+            results = await asyncio.gather(tick(), *[renderer.adraw(research_flow_status, line_mode='path') for _ in range(6)])
+
+        self.assertEqual(2, executor.max_running)
+        self.assertEqual(5, len(ticks))
+        self.assertEqual(1, len(set(results[1:])))
+
+    def test_max_concurrency_error(self):
+        with self.assertRaises(ArgError):
+            AsyncRenderer(max_concurrency=0)
@@ -0,0 +1,54 @@
+from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
+
+from dg_drawer.error.error import ArgError, JSONDataError
+from dg_drawer.research_flow.batch_drawer import DrawResult, draw_many
+from dg_drawer.research_flow.flow_drawer import FlowDrawer
+from dg_drawer.research_flow.research_flow_status import PhaseStatus, ResearchFlowStatus, SubFlowStatus
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+class TestBatchDrawer(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_batch_drawer
+
+    def test_draw_many(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(test_data_path)
+        invalid_research_flow_status = [PhaseStatus(1, 'phase_1', [SubFlowStatus('1', 'sf_1', '', ['100'], 1)])]
+        inputs = [research_flow_status, test_data_path, invalid_research_flow_status, './tests/test_data/not_found.json', '{"a": 1}']
+
+        results = {result.key: result for result in draw_many(inputs, max_workers=2, chunksize=2, line_mode='path')}
+
+        self.assertEqual([0, 1, 2, 3, 4], sorted(results.keys()))
+        expected = FlowDrawer(research_flow_status, line_mode='path').draw()
+        self.assertTrue(results[0].ok)
+        self.assertEqual(expected, results[0].svg)
+        self.assertEqual(expected, results[1].svg)
+
+        ## errors are reported for each input
+        self.assertFalse(results[2].ok)
+        self.assertIsNone(results[2].svg)
+        self.assertIsInstance(results[2].error, ArgError)
+        self.assertIsInstance(results[3].error, FileNotFoundError)
+        self.assertIsInstance(results[4].error, JSONDataError)
+
+    def test_draw_many_mapping(self):
+        inputs = {f'project_{i}': test_data_path for i in range(5)}
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(draw_many(inputs, max_workers=2, chunksize=3, executor=executor))
+
+        self.assertEqual(sorted(inputs.keys()), sorted(result.key for result in results))
+        self.assertTrue(all(isinstance(result, DrawResult) and result.ok for result in results))
+
+    def test_draw_many_error(self):
+        with self.assertRaises(ArgError):
+            list(draw_many([], max_workers=0))
+        with self.assertRaises(ArgError):
+            list(draw_many([], chunksize=0))
+
+        ## the arguments are checked by the call, without iterating the results
+        with self.assertRaises(ArgError):
+            draw_many([], chunksize=0)
+        with self.assertRaises(ArgError):
+            draw_many([], max_workers=0)
+        with self.assertRaises(ArgError):
+            draw_many([], line_mode='curve')
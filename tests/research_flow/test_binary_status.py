@@ -0,0 +1,136 @@
+from unittest import TestCase
+import os
+import shutil
+import tempfile
+from dg_drawer.error.error import ArgError, BinaryDataError, JSONDataError
+from dg_drawer.research_flow import FlowDrawer, PhaseStatus, ResearchFlowStatus, SubFlowStatus
+from dg_drawer.research_flow.binary_status import BinaryStatusFile, convert_json_to_binary, load_binary_status, main, write_binary_status
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+
+class TestBinaryStatus(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_binary_status
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.binary_path = os.path.join(self.dir, 'status.dgrf')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def dump(self, research_flow_status):
+        return [(phase._seq_number, phase._name, [(sub_flow._id, sub_flow._name, sub_flow._link, sub_flow._parent_ids, sub_flow._create_datetime)
+                                                  for sub_flow in phase._sub_flow_data])
+                for phase in research_flow_status]
+
+    def get_binary_data(self, research_flow_status)->bytearray:
+        write_binary_status(research_flow_status, self.binary_path)
+        with open(self.binary_path, 'rb') as f:
+            return bytearray(f.read())
+
+    def test_convert(self):
+        size = convert_json_to_binary(test_data_path, self.binary_path)
+
+        self.assertEqual(os.path.getsize(self.binary_path), size)
+        expected = ResearchFlowStatus.load_from_json(test_data_path)
+        research_flow_status = load_binary_status(self.binary_path)
+        self.assertEqual(self.dump(expected), self.dump(research_flow_status))
+        self.assertEqual(FlowDrawer(expected).draw(), FlowDrawer(research_flow_status).draw())
+
+        ## load() detects the binary format
+        self.assertEqual(self.dump(expected), self.dump(ResearchFlowStatus.load(self.binary_path)))
+        self.assertEqual(self.dump(expected), self.dump(ResearchFlowStatus.load_from_json(self.binary_path)))
+        with open(self.binary_path, 'rb') as f:
+            self.assertEqual(self.dump(expected), self.dump(ResearchFlowStatus.load(f.read())))
+
+    def test_write(self):
+        research_flow_status = [
+            PhaseStatus(20, 'phase 2', [SubFlowStatus('b', 'データ\0名', 'link', ['a', 'c'], -1), SubFlowStatus('d', 'd', '', [], 2**63-1)]),
+            PhaseStatus(10, 'phase 1', [SubFlowStatus('a', '', '', [], 0), SubFlowStatus('c', 'a', 'a', [], 1)]),
+            PhaseStatus(30, 'phase 3', []),
+        ]
+        write_binary_status(research_flow_status, self.binary_path)
+
+        loaded = load_binary_status(self.binary_path)
+
+        ## the phases are sorted, and the parent IDs share the strings of the IDs
+        self.assertEqual(self.dump(sorted(research_flow_status, key=lambda x : x._seq_number)), self.dump(loaded))
+        self.assertIs(loaded[0]._sub_flow_data[0]._id, loaded[1]._sub_flow_data[0]._parent_ids[0])
+
+        with BinaryStatusFile(self.binary_path) as binary_status_file:
+            self.assertEqual((3, 4), (binary_status_file.phase_num, binary_status_file.sub_flow_num))
+            ## each distinct string is stored once
+            self.assertEqual(10, binary_status_file.string_num)
+            self.assertEqual([0, 1, -1, 2**63-1], binary_status_file.get_column('create_datetimes').tolist())
+            self.assertEqual([0, 0, 0, 2, 2], binary_status_file.get_column('parent_offsets').tolist())
+            self.assertEqual([0, 1], binary_status_file.get_column('parent_rows').tolist())
+            with self.assertRaises(ArgError):
+                binary_status_file.get_column('parents')
+
+    def test_write_err(self):
+        with self.assertRaises(ArgError):
+            write_binary_status([PhaseStatus(1, 'phase', [SubFlowStatus('a', '', '', ['b'], 0)])], self.binary_path)
+        with self.assertRaises(ArgError):
+            write_binary_status([PhaseStatus(1, 'phase', [SubFlowStatus('a', '', '', [], 2**63)])], self.binary_path)
+
+    def test_load_err(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(test_data_path)
+        data = self.get_binary_data(research_flow_status)
+
+        with self.assertRaises(BinaryDataError):
+            load_binary_status(b'DGRF')
+        with self.assertRaises(BinaryDataError):
+            load_binary_status(b'DGRX' + bytes(data[4:]))
+        with self.assertRaises(BinaryDataError):
+            load_binary_status(data[:4] + b'\x09\x00' + data[6:])
+        with self.assertRaises(BinaryDataError):
+            load_binary_status(data[:-1])
+        ## BinaryDataError is a JSONDataError
+        with self.assertRaises(JSONDataError):
+            ResearchFlowStatus.load(bytes(data[:-1]))
+
+    def test_load_invalid_rows(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(test_data_path)
+
+        ## parent in the same phase
+        data = self.get_binary_data(research_flow_status)
+        with BinaryStatusFile(data) as binary_status_file:
+            binary_status_file.get_column('parent_rows')[-1] = binary_status_file.sub_flow_num - 1
+        with self.assertRaises(BinaryDataError):
+            load_binary_status(data)
+        ## not checked without validation
+        load_binary_status(data, validate=False)
+
+        ## duplicate ID
+        data = self.get_binary_data(research_flow_status)
+        with BinaryStatusFile(data) as binary_status_file:
+            ids = binary_status_file.get_column('ids')
+            ids[-1] = ids[-2]
+        with self.assertRaisesRegex(BinaryDataError, 'Duplicate sub flow ID'):
+            load_binary_status(data)
+
+        ## string index out of range
+        data = self.get_binary_data(research_flow_status)
+        with BinaryStatusFile(data) as binary_status_file:
+            binary_status_file.get_column('names')[0] = binary_status_file.string_num
+        with self.assertRaises(BinaryDataError):
+            load_binary_status(data)
+
+    def test_load_invalid_phase_name(self):
+        research_flow_status = [PhaseStatus(index, f'phase {index}', [SubFlowStatus(f'{index}', '', '', [], 0)]) for index in range(4)]
+        data = self.get_binary_data(research_flow_status)
+        with BinaryStatusFile(data) as binary_status_file:
+            binary_status_file.get_column('phase_names')[3] = binary_status_file.string_num
+
+        with self.assertRaises(BinaryDataError):
+            load_binary_status(data)
+        with self.assertRaises(BinaryDataError):
+            load_binary_status(data, validate=False)
+        with self.assertRaises(JSONDataError):
+            ResearchFlowStatus.load(bytes(data))
+
+    def test_main(self):
+        main([test_data_path, self.binary_path])
+
+        self.assertEqual(self.dump(ResearchFlowStatus.load_from_json(test_data_path)), self.dump(load_binary_status(self.binary_path)))
@@ -0,0 +1,154 @@
+from unittest import TestCase
+import copy
+import json
+import os
+import random
+import xml.etree.ElementTree as ET
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow import FlowDrawer, PhaseStatus, SubFlowStatus, ResearchFlowStatus
+from dg_drawer.research_flow.flow_diff import FlowDiff
+from dg_drawer.research_flow.layout_renderer import SvgRenderer
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+class TestFlowDiff(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_flow_diff
+
+    def get_research_flow_status(self, seed:int=0):
+        rand = random.Random(seed)
+        phases = []
+        for phase_index in range(4):
+            sub_flows = []
+            for index in range(rand.randint(3, 8)):
+                parent_ids = []
+                if phase_index > 0:
+                    parent_phase_index = rand.randint(max(phase_index-2, 0), phase_index-1)
+                    parent_ids.append(rand.choice(phases[parent_phase_index]._sub_flow_data)._id)
+                sub_flows.append(SubFlowStatus(id=f'{phase_index}-{index}', name=f'name {phase_index}-{index}', link='',
+                                               parent_ids=parent_ids, create_datetime=1672498800+phase_index*1000+index))
+            phases.append(PhaseStatus(seq_number=phase_index+1, name=f'phase {phase_index}', sub_flow_data=sub_flows))
+        return phases
+
+    def apply_patch(self, svg:str, patch:dict)->ET.Element:
+        root = ET.fromstring(svg)
+        parents = {child: parent for parent in root.iter() for child in parent}
+        elements = {element.get('id'): element for element in root.iter() if element.get('id') is not None}
+        if 'width' in patch:
+            root.set('width', str(patch['width']))
+            root.set('height', str(patch['height']))
+        for element_id in patch['remove']:
+            parents[elements[element_id]].remove(elements[element_id])
+        for element_id, component in patch['replace'].items():
+            parent = parents[elements[element_id]]
+            index = list(parent).index(elements[element_id])
+            parent.remove(elements[element_id])
+            parent.insert(index, ET.fromstring(component))
+        for group_id, component in patch['add']:
+            elements[group_id].append(ET.fromstring(component))
+        return root
+
+    def get_elements(self, root:ET.Element):
+        # Elements of each group, the order of the elements in a group does not change the image.
+        attributes = dict(root.attrib)
+        groups = {group.get('id'): sorted(ET.tostring(element, encoding='unicode') for element in group) for group in root}
+        return attributes, groups
+
+    def assert_patch(self, old_status, new_status, renderer:SvgRenderer=None, **drawer_options):
+        renderer = SvgRenderer(element_id_prefix='') if renderer is None else renderer
+        old_layout = FlowDrawer(old_status, **drawer_options).layout()
+        new_layout = FlowDrawer(new_status, **drawer_options).layout()
+        diff = FlowDiff(old_layout, new_layout, renderer)
+        patch = json.loads(json.dumps(diff.get_patch()))
+
+        patched = self.apply_patch(renderer.render(old_layout), patch)
+        self.assertEqual(self.get_elements(ET.fromstring(renderer.render(new_layout))), self.get_elements(patched))
+        return diff, patch
+
+    def test_render_element_ids(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        layout = FlowDrawer(research_flow_status).layout()
+        renderer = SvgRenderer(element_id_prefix='rf-')
+
+        root = ET.fromstring(renderer.render(layout))
+
+        self.assertEqual(['rf-frame', 'rf-lines', 'rf-nodes', 'rf-labels'], [group.get('id') for group in root])
+        ids = [element.get('id') for group in root[1:] for element in group]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertIn(renderer.get_element_id('n', 'ex_sf_2'), ids)
+        self.assertIn(renderer.get_element_id('e', 'ex_sf_2', 'pw_sf_1'), ids)
+        ## the IDs do not change between versions
+        self.assertEqual(renderer.get_element_id('n', 'ex_sf_2'), SvgRenderer(element_id_prefix='rf-').get_element_id('n', 'ex_sf_2'))
+        ## 7 lines, 7 nodes and 7 labels (with the invisible dummy node and its empty label)
+        self.assertEqual(7 + 7 + 7, len(ids))
+
+    def test_render_element_ids_err(self):
+        with self.assertRaises(ArgError):
+            SvgRenderer(line_mode='path', element_id_prefix='')
+        layout = FlowDrawer(self.get_research_flow_status()).layout()
+        with self.assertRaises(ArgError):
+            FlowDiff(layout, layout, SvgRenderer())
+
+    def test_diff_same(self):
+        research_flow_status = self.get_research_flow_status()
+        diff, patch = self.assert_patch(research_flow_status, self.get_research_flow_status())
+
+        self.assertEqual({'version': 1, 'remove': [], 'replace': {}, 'add': []}, patch)
+        self.assertEqual(([], [], [], []), (diff.added_nodes, diff.removed_nodes, diff.moved_nodes, diff.changed_nodes))
+        self.assertFalse(diff.frame_changed)
+
+    def test_diff_add_sub_flow(self):
+        old_status = self.get_research_flow_status()
+        new_status = copy.deepcopy(old_status)
+        new_status[1]._sub_flow_data.append(SubFlowStatus(id='new', name='new', link='', parent_ids=['0-0'], create_datetime=1672500000))
+
+        diff, patch = self.assert_patch(old_status, new_status)
+
+        self.assertEqual(['new'], diff.added_nodes)
+        self.assertIn(('0-0', 'new'), diff.added_edges)
+        self.assertEqual([], diff.removed_nodes)
+        ## only the elements of the changed part are sent
+        self.assertLess(len(json.dumps(patch)), len(SvgRenderer(element_id_prefix='').render(FlowDrawer(new_status).layout())))
+
+    def test_diff_edits(self):
+        for seed in range(10):
+            with self.subTest(seed=seed):
+                old_status = self.get_research_flow_status(seed)
+                new_status = copy.deepcopy(old_status)
+                rand = random.Random(seed)
+                # remove a sub flow without children, rename a sub flow and add a sub flow to the first phase
+                parent_ids = {parent_id for phase in new_status for sub_flow in phase._sub_flow_data for parent_id in sub_flow._parent_ids}
+                leaves = [(phase, sub_flow) for phase in new_status for sub_flow in phase._sub_flow_data if sub_flow._id not in parent_ids]
+                phase, leaf = rand.choice(leaves)
+                phase._sub_flow_data.remove(leaf)
+                rand.choice(new_status[2]._sub_flow_data)._name = 'renamed'
+                new_status[0]._sub_flow_data.append(SubFlowStatus(id='new', name='new', link='', parent_ids=[], create_datetime=0))
+
+                for renderer, options in ((None, {}), (SvgRenderer(style_mode='css', element_id_prefix='p-'), {}),
+                                          (SvgRenderer(long_edge_mode='polyline', element_id_prefix=''), {'ordering': 'barycenter'})):
+                    diff, _ = self.assert_patch(old_status, new_status, renderer, **options)
+                    self.assertEqual(['new'], diff.added_nodes)
+                    self.assertEqual([leaf._id], diff.removed_nodes)
+
+    def test_diff_frame(self):
+        old_status = self.get_research_flow_status()
+        new_status = copy.deepcopy(old_status)
+        new_status[0]._name = 'renamed phase'
+        new_status[0]._sub_flow_data.extend(SubFlowStatus(id=f'new-{index}', name='', link='', parent_ids=[], create_datetime=0) for index in range(10))
+
+        diff, patch = self.assert_patch(old_status, new_status, SvgRenderer(style_mode='css', element_id_prefix=''))
+
+        self.assertTrue(diff.frame_changed)
+        self.assertTrue(diff.size_changed)
+        self.assertIn('frame', patch['replace'])
+        self.assertEqual(FlowDrawer(new_status).layout().height, patch['height'])
+
+    def test_from_research_flow_status(self):
+        old_status = self.get_research_flow_status()
+        new_status = copy.deepcopy(old_status)
+        new_status[3]._sub_flow_data[0]._name = 'renamed'
+
+        diff = FlowDiff.from_research_flow_status(old_status, new_status, whole_max_width=1200)
+
+        self.assertEqual(['3-0'], diff.changed_nodes)
+        self.assertEqual([], diff.moved_nodes)
+        self.assertEqual(1, len(diff.get_patch()['replace']))
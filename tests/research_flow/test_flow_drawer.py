@@ -1,6 +1,34 @@
 from unittest import TestCase
+import io
+import os
+import subprocess
+import sys
+import tempfile
+from xml.etree import ElementTree
+import zlib
+from dg_drawer.error.error import ArgError
 from dg_drawer.research_flow import FlowDrawer
-from dg_drawer.research_flow import PhaseStatus, SubFlowStatus
+from dg_drawer.research_flow import PhaseStatus, SubFlowStatus, ResearchFlowStatus
+from dg_drawer.research_flow.component.node import Node, DummyNode
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+# Draws the test data and a research flow history with many dummy nodes (parents several phases before)
+reproducibility_script = '''
+import hashlib
+from dg_drawer.research_flow import FlowDrawer, PhaseStatus, SubFlowStatus, ResearchFlowStatus
+status = ResearchFlowStatus.load_from_json('./tests/test_data/test_1_research_flow_status.json')
+phases = []
+for p in range(6):
+    sub_flows = []
+    for i in range(8):
+        parent_ids = [] if p == 0 else [f'{p-1}-{(i*3)%8}', f'{(i*5)%p}-{i}']
+        sub_flows.append(SubFlowStatus(id=f'{p}-{i}', name=f'sub flow {p}-{i}', link='', parent_ids=parent_ids, create_datetime=1672498800+p*86400+i))
+    phases.append(PhaseStatus(seq_number=p+1, name=f'phase {p}', sub_flow_data=sub_flows))
+for ordering in ('parent', 'barycenter'):
+    for research_flow_status in (status, phases):
+        print(hashlib.sha256(FlowDrawer(research_flow_status, ordering=ordering).draw().encode('utf-8')).hexdigest())
+'''
 
 class TestFlowDrawer(TestCase):
     # test exec : python -m unittest tests.research_flow.test_flow_drawer
@@ -147,3 +175,250 @@ class TestFlowDrawer(TestCase):
         research_flow_status = [phase_A, phase_B, phase_C, phase_D]
         fd = FlowDrawer(research_flow_status=research_flow_status)
         svg = fd.draw()
+
+    def test_iter_svg(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        fd = FlowDrawer(research_flow_status=research_flow_status)
+
+        fragments = list(fd.iter_svg())
+
+        self.assertEqual('<svg width="900" height="500">', fragments[0])
+        self.assertEqual('</svg>', fragments[-1])
+        self.assertEqual(fd.draw(), ''.join(fragments))
+
+    def test_draw_to(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        fd = FlowDrawer(research_flow_status=research_flow_status)
+        ## a standalone SVG document
+        svg = fd.draw().replace('<svg ', '<svg xmlns="http://www.w3.org/2000/svg" ', 1)
+
+        ## text stream
+        text_stream = io.StringIO()
+        written = fd.draw_to(text_stream, buffer_size=100)
+        self.assertEqual(svg, text_stream.getvalue())
+        self.assertEqual(len(svg), written)
+
+        ## binary stream
+        binary_stream = io.BytesIO()
+        written = fd.draw_to(binary_stream)
+        self.assertEqual(svg.encode('utf-8'), binary_stream.getvalue())
+        self.assertEqual(len(svg.encode('utf-8')), written)
+
+        ## socket like object
+        class Socket():
+            def __init__(self):
+                self.data = b''
+            def sendall(self, data):
+                self.data += data
+        socket = Socket()
+        fd.draw_to(socket, buffer_size=1)
+        self.assertEqual(svg.encode('utf-8'), socket.data)
+
+    def test_draw_to_err(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        fd = FlowDrawer(research_flow_status=research_flow_status)
+
+        with self.assertRaises(ArgError):
+            fd.draw_to(object())
+
+    def test_draw_line_mode_path(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+
+        svg = FlowDrawer(research_flow_status=research_flow_status, line_mode='path').draw()
+
+        self.assertEqual(1, svg.count('<path '))
+        self.assertEqual(0, svg.count('<line '))
+
+    def test_constructor_line_mode_err(self):
+        with self.assertRaises(ArgError):
+            FlowDrawer(research_flow_status=[], line_mode='curve')
+
+    def test_get_dummy_id(self):
+        fd = FlowDrawer(ResearchFlowStatus.load_from_json(test_data_path))
+        dummy_id = fd.get_dummy_id('1', '2', 3)
+        self.assertTrue(dummy_id.startswith('dummy:'))
+        self.assertEqual(dummy_id, fd.get_dummy_id('1', '2', 3))
+        self.assertEqual(dummy_id, fd.get_dummy_id('1', '2', 3, 0))
+        self.assertEqual(len({dummy_id, fd.get_dummy_id('1', '2', 4), fd.get_dummy_id('2', '1', 3), fd.get_dummy_id('1', '2', 3, 1)}), 4)
+
+    def test_fill_dummy_nodes_each_phase(self):
+        node_1 = Node(id='1', parent_ids=[], create_datetime=0, node_name='node_1')
+        node_2 = Node(id='2', parent_ids=['1'], create_datetime=10, node_name='node_2')
+        node_3 = Node(id='3', parent_ids=['1'], create_datetime=11, node_name='node_3')
+        node_4 = Node(id='4', parent_ids=['2', '1'], create_datetime=20, node_name='node_4')
+        nodes_each_phase = [[node_1], [node_2, node_3], [node_4]]
+        fd = FlowDrawer(research_flow_status=[])
+
+        filled = fd.fill_dummy_nodes_each_phase(nodes_each_phase)
+
+        ## the input is not modified
+        self.assertEqual(['2', '3'], [node.id for node in nodes_each_phase[1]])
+        self.assertEqual(['1', '2'], nodes_each_phase[2][0].parent_ids)
+
+        ## a dummy node is filled in between node 1 and node 4
+        self.assertEqual(3, len(filled[1]))
+        dummy = filled[1][2]
+        self.assertIs(type(dummy), DummyNode)
+        self.assertEqual(['1'], dummy.parent_ids)
+        self.assertEqual(sorted(['2', dummy.id]), filled[2][0].parent_ids)
+
+    def test_fill_dummy_nodes_each_phase_not_found(self):
+        node_1 = Node(id='1', parent_ids=[], create_datetime=0, node_name='node_1')
+        node_2 = Node(id='2', parent_ids=['100'], create_datetime=10, node_name='node_2')
+        fd = FlowDrawer(research_flow_status=[])
+
+        with self.assertRaises(Exception):
+            fd.fill_dummy_nodes_each_phase([[node_1], [node_2]])
+
+    def test_layout_store_deterministic(self):
+        def get_layout(fd:FlowDrawer):
+            store, _, _ = fd.layout_store()
+            return [[(store.get_id(row), store.cx[row], store.cy[row]) for row in rows] for rows in store.phase_rows]
+
+        research_flow_status = ResearchFlowStatus.load_from_json(test_data_path)
+        layout = get_layout(FlowDrawer(research_flow_status))
+        dummy_ids = [id for rows in layout for id, _, _ in rows if id.startswith('dummy:')]
+        self.assertGreater(len(dummy_ids), 0)
+        self.assertEqual(layout, get_layout(FlowDrawer(research_flow_status)))
+        self.assertEqual(FlowDrawer(research_flow_status).draw(), FlowDrawer(research_flow_status).draw())
+
+    def test_draw_reproducible_across_processes(self):
+        # Hash randomization of str must not change the drawing.
+        outputs = []
+        for hash_seed in ('0', '1', '12345'):
+            env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+            result = subprocess.run([sys.executable, '-c', reproducibility_script], env=env, stdout=subprocess.PIPE, check=True)
+            outputs.append(result.stdout)
+        self.assertEqual(len(outputs[0].split()), 4)
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(outputs[0], outputs[2])
+
+    def test_draw_long_edge_mode_polyline(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        svg_dummy = FlowDrawer(research_flow_status=research_flow_status).draw()
+
+        svg = FlowDrawer(research_flow_status=research_flow_status, long_edge_mode='polyline').draw()
+
+        # The test data has one line to a parent two phases before, with one dummy node.
+        self.assertEqual(1, svg.count('<polyline '))
+        self.assertEqual(svg_dummy.count('<line ') - 2, svg.count('<line '))
+        self.assertEqual(svg_dummy.count('<circle ') - 1, svg.count('<circle '))
+        self.assertLess(len(svg), len(svg_dummy))
+
+        ## the polyline is merged into the path
+        svg = FlowDrawer(research_flow_status=research_flow_status, line_mode='path', long_edge_mode='polyline').draw()
+        self.assertEqual(1, svg.count('<path '))
+        self.assertEqual(0, svg.count('<polyline '))
+
+    def test_constructor_long_edge_mode_err(self):
+        with self.assertRaises(ArgError):
+            FlowDrawer(research_flow_status=[], long_edge_mode='curve')
+
+    def test_draw_style_mode_css(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        svg_inline = FlowDrawer(research_flow_status=research_flow_status).draw()
+
+        fd = FlowDrawer(research_flow_status=research_flow_status, style_mode='css')
+        fragments = list(fd.iter_svg())
+        svg = ''.join(fragments)
+
+        self.assertEqual('<svg class="dg-rf" width="900" height="500">', fragments[0])
+        self.assertEqual(1, svg.count('<style>'))
+        self.assertEqual(1, svg.count('<circle '))
+        # No presentation attribute is repeated, and the invisible dummy node and its empty label are not drawn.
+        self.assertNotIn('stroke=', svg)
+        self.assertNotIn('fill=', svg)
+        self.assertEqual(svg_inline.count('<circle ') - 1, svg.count('<use '))
+        self.assertEqual(svg_inline.count('<line '), svg.count('<line class="l" '))
+        self.assertEqual(svg_inline.count('<text ') - 1, svg.count('<text class='))
+        self.assertLess(len(svg), len(svg_inline))
+
+        ## more phases than the defined colours
+        research_flow_status = [PhaseStatus(seq_number=index+1, name=f'phase_{index}', sub_flow_data=[
+                                    SubFlowStatus(id=str(index), name=f'node_{index}', link='', parent_ids=[] if index == 0 else [str(index-1)], create_datetime=1672498800+index)
+                                ]) for index in range(12)]
+        svg = FlowDrawer(research_flow_status=research_flow_status, style_mode='css', line_mode='path').draw()
+        self.assertIn('.dg-rf .h11{fill:#', svg)
+        self.assertIn('<use href="#dg-rf-node" class="n11" ', svg)
+        self.assertEqual(1, svg.count('<path class="l" '))
+
+    def test_constructor_style_mode_err(self):
+        with self.assertRaises(ArgError):
+            FlowDrawer(research_flow_status=[], style_mode='compact')
+
+    def test_draw_bytes(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        fd = FlowDrawer(research_flow_status=research_flow_status)
+        svg = fd.draw().replace('<svg ', '<svg xmlns="http://www.w3.org/2000/svg" ', 1)
+
+        self.assertEqual(svg.encode('utf-8'), fd.draw_bytes())
+        self.assertEqual(svg.encode('utf-8'), b''.join(fd.iter_bytes(buffer_size=100)))
+
+        svgz = fd.draw_bytes(codec='gzip')
+        self.assertEqual(svg.encode('utf-8'), zlib.decompress(svgz, 16 + zlib.MAX_WBITS))
+        self.assertLess(len(svgz), len(svg))
+
+        with self.assertRaises(ArgError):
+            fd.draw_bytes(codec='unknown')
+
+    def test_draw_bytes_document(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+
+        for style_mode in FlowDrawer.STYLE_MODES:
+            fd = FlowDrawer(research_flow_status=research_flow_status, style_mode=style_mode)
+            ## the bytes are a standalone SVG document, and draw() is SVG data to embed in HTML
+            root = ElementTree.fromstring(fd.draw_bytes())
+            self.assertEqual('{http://www.w3.org/2000/svg}svg', root.tag)
+            self.assertNotIn('xmlns', fd.draw())
+
+        ## the encoding other than UTF-8 is declared
+        research_flow_status[0]._sub_flow_data[0]._name = 'データ名'
+        fd = FlowDrawer(research_flow_status=research_flow_status)
+        svg = fd.draw_bytes().decode('utf-8')
+        for encoding in ('utf-16', 'shift_jis'):
+            declaration = f'<?xml version="1.0" encoding="{encoding}"?>\n'
+            self.assertEqual(declaration + svg, fd.draw_bytes(encoding=encoding).decode(encoding))
+        self.assertFalse(fd.draw_bytes(encoding='UTF8').startswith(b'<?xml'))
+        ## a character which the encoding cannot represent is written as a character reference
+        research_flow_status[0]._sub_flow_data[0]._name = 'é'
+        fd = FlowDrawer(research_flow_status=research_flow_status)
+        root = ElementTree.fromstring(fd.draw_bytes(encoding='ascii'))
+        self.assertIn('é', ''.join(root.itertext()))
+
+    def test_draw_to_codec(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        fd = FlowDrawer(research_flow_status=research_flow_status)
+        svg = fd.draw().replace('<svg ', '<svg xmlns="http://www.w3.org/2000/svg" ', 1)
+
+        binary_stream = io.BytesIO()
+        written = fd.draw_to(binary_stream, buffer_size=100, codec='gzip')
+        self.assertEqual(len(binary_stream.getvalue()), written)
+        self.assertEqual(svg.encode('utf-8'), zlib.decompress(binary_stream.getvalue(), 16 + zlib.MAX_WBITS))
+
+        with self.assertRaises(ArgError):
+            fd.draw_to(io.StringIO(), codec='gzip')
+
+    def test_save(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        fd = FlowDrawer(research_flow_status=research_flow_status)
+        svg = fd.draw().replace('<svg ', '<svg xmlns="http://www.w3.org/2000/svg" ', 1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'flow.svg')
+            self.assertEqual(len(svg.encode('utf-8')), fd.save(path))
+            with open(path, 'rb') as f:
+                self.assertEqual(svg.encode('utf-8'), f.read())
+
+            ## .svgz files are compressed with gzip
+            path = os.path.join(directory, 'flow.svgz')
+            written = fd.save(path)
+            with open(path, 'rb') as f:
+                data = f.read()
+            self.assertEqual(len(data), written)
+            self.assertEqual(svg.encode('utf-8'), zlib.decompress(data, 16 + zlib.MAX_WBITS))
+
+            ## no file is created with an unsupported codec
+            path = os.path.join(directory, 'flow.svg.zz')
+            with self.assertRaises(ArgError):
+                fd.save(path, codec='unknown')
+            self.assertFalse(os.path.exists(path))
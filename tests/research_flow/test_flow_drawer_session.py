@@ -0,0 +1,132 @@
+from unittest import TestCase
+import os
+import re
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow import FlowDrawer, ResearchFlowStatus, SubFlowStatus
+from dg_drawer.research_flow.flow_drawer_session import FlowDrawerSession
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+class TestFlowDrawerSession(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_flow_drawer_session
+
+    def remove_groups(self, svg:str)->str:
+        return re.sub(r'</?g[^>]*>', '', svg)
+
+    def apply_changes(self, svg:str, changes:dict)->str:
+        for element_id, fragment in changes.items():
+            if element_id == 'svg':
+                svg = re.sub(r'^<svg[^>]*>', fragment, svg)
+            else:
+                svg = re.sub(f'<g id="{element_id}">.*?</g>', lambda m: fragment, svg, flags=re.DOTALL)
+        return svg
+
+    def test_draw(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        session = FlowDrawerSession(research_flow_status, element_id_prefix='rf-')
+
+        svg = session.draw()
+
+        self.assertIn('<g id="rf-frame">', svg)
+        self.assertIn('<g id="rf-lines-2">', svg)
+        self.assertIn('<g id="rf-nodes-0">', svg)
+        self.assertIn('<g id="rf-labels-1">', svg)
+        self.assertEqual(FlowDrawer(research_flow_status).draw(), self.remove_groups(svg))
+        self.assertEqual({}, session.draw_changes())
+
+    def test_add_sub_flow(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        session = FlowDrawerSession(research_flow_status)
+        svg = session.draw()
+
+        session.add_sub_flow(2, SubFlowStatus(id='pw_sf_3', name='pw_sf_3 name', link='', parent_ids=['ex_sf_3'], create_datetime=102))
+        changes = session.draw_changes()
+
+        ## only the last phase changed
+        self.assertEqual(['lines-2', 'nodes-2', 'labels-2'], list(changes.keys()))
+        self.assertEqual(3, len(research_flow_status[2]._sub_flow_data))
+
+        svg = self.apply_changes(svg, changes)
+        self.assertEqual(session.draw(), svg)
+        self.assertEqual(FlowDrawer(research_flow_status).draw(), self.remove_groups(svg))
+
+    def test_add_sub_flow_with_dummy_nodes(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        session = FlowDrawerSession(research_flow_status)
+        svg = session.draw()
+
+        for index in range(4):
+            session.add_sub_flow(2, SubFlowStatus(id=f'pw_sf_{index+3}', name='', link='', parent_ids=['rp_sf_1'], create_datetime=102+index))
+        changes = session.draw_changes()
+
+        ## the image becomes higher
+        self.assertIn('svg', changes)
+        self.assertIn('frame', changes)
+        self.assertIn('nodes-1', changes)
+
+        svg = self.apply_changes(svg, changes)
+        self.assertEqual(session.draw(), svg)
+        self.assertEqual(FlowDrawer(research_flow_status).draw().count('<circle '), svg.count('<circle '))
+        self.assertEqual(len(FlowDrawer(research_flow_status).draw()), len(self.remove_groups(svg)))
+
+    def test_add_sub_flow_err(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        session = FlowDrawerSession(research_flow_status)
+
+        with self.assertRaises(ArgError):
+            session.add_sub_flow(3, SubFlowStatus(id='new', name='', link='', parent_ids=[], create_datetime=0))
+        with self.assertRaises(ArgError):
+            session.add_sub_flow(1, SubFlowStatus(id='ex_sf_1', name='', link='', parent_ids=['rp_sf_1'], create_datetime=0))
+        with self.assertRaises(ArgError):
+            session.add_sub_flow(1, SubFlowStatus(id='new', name='', link='', parent_ids=['unknown'], create_datetime=0))
+        with self.assertRaises(ArgError):
+            session.add_sub_flow(1, SubFlowStatus(id='new', name='', link='', parent_ids=['pw_sf_1'], create_datetime=0))
+
+    def test_remove_sub_flow(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        session = FlowDrawerSession(research_flow_status)
+        svg = session.draw()
+
+        session.remove_sub_flow('pw_sf_2')
+        svg = self.apply_changes(svg, session.draw_changes())
+
+        self.assertEqual(['pw_sf_1'], [sub_flow._id for sub_flow in research_flow_status[2]._sub_flow_data])
+        self.assertEqual(session.draw(), svg)
+        self.assertEqual(FlowDrawer(research_flow_status).draw(), self.remove_groups(svg))
+
+        with self.assertRaises(ArgError):
+            session.remove_sub_flow('ex_sf_1')
+        with self.assertRaises(ArgError):
+            session.remove_sub_flow('pw_sf_2')
+
+    def test_rename_sub_flow(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        session = FlowDrawerSession(research_flow_status)
+        session.draw()
+
+        session.rename_sub_flow('ex_sf_2', 'renamed')
+        changes = session.draw_changes()
+
+        self.assertEqual(['labels-1'], list(changes.keys()))
+        self.assertIn('>renamed</text>', changes['labels-1'])
+        self.assertEqual('renamed', research_flow_status[1]._sub_flow_data[1]._name)
+
+        with self.assertRaises(ArgError):
+            session.rename_sub_flow('unknown', 'renamed')
+
+    def test_constructor_long_edge_mode_err(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+
+        with self.assertRaises(ArgError):
+            FlowDrawerSession(research_flow_status, long_edge_mode='polyline')
+
+    def test_draw_style_mode_css(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        svg = FlowDrawer(research_flow_status, style_mode='css').draw()
+        session = FlowDrawerSession(research_flow_status, style_mode='css')
+
+        self.assertEqual(svg, self.remove_groups(session.draw()))
+
+        session.rename_sub_flow('ex_sf_2', 'renamed')
+        changes = session.draw_changes()
+        self.assertIn('<text class="t" ', changes['labels-1'])
@@ -0,0 +1,107 @@
+from unittest import TestCase
+import json
+import os
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow import FlowDrawer, FlowLayout, JsonRenderer, SvgRenderer, ResearchFlowStatus
+from dg_drawer.research_flow.level_of_detail import LevelOfDetail
+from dg_drawer.research_flow.render_stats import RenderStats
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+class TestFlowLayout(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_flow_layout
+
+    def get_layout(self, **options)->FlowLayout:
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        return FlowDrawer(research_flow_status=research_flow_status, **options).layout()
+
+    def test_layout(self):
+        layout = self.get_layout()
+
+        self.assertEqual((900, 500, 300, 100, 400), (layout.width, layout.height, layout.phase_width, layout.header_height, layout.body_height))
+        self.assertEqual(('research_preparation', 'experiments', 'paper_writing'), layout.phase_names)
+        self.assertEqual(('#00796B', '#B2DFDB'), layout.get_palette()[1])
+
+        ## dummy nodes are not generated
+        nodes = list(layout.iter_nodes())
+        self.assertEqual(6, len(nodes))
+        self.assertEqual(('ex_sf_2', 'ex_sf_2 name', 'ex_sf_2 link', 1, 450, 250), nodes[2])
+
+        ## a line to a parent node two phases before is bent in the phase between
+        edges = list(layout.iter_edges())
+        self.assertEqual(6, len(edges))
+        self.assertIn(('ex_sf_2', 'pw_sf_1', [(450, 250), (750, 150)]), edges)
+        self.assertIn(('rp_sf_1', 'pw_sf_2', [(150, 150), (450, 450), (750, 250)]), edges)
+
+        ## the store has the positioned nodes, with the dummy nodes
+        store = layout.store
+        self.assertEqual(3, store.phase_num)
+        self.assertEqual((450, 250), (store.cx[store.get_row('ex_sf_2')], store.cy[store.get_row('ex_sf_2')]))
+        with self.assertRaises(AttributeError):
+            layout.store = None
+
+    def test_to_columns(self):
+        columns = self.get_layout().to_columns()
+
+        self.assertEqual(1, columns['version'])
+        self.assertEqual(['#616161', '#00796B', '#D32F2F'], columns['phases']['color'])
+        nodes = columns['nodes']
+        self.assertEqual(['rp_sf_1', 'ex_sf_1', 'ex_sf_2', 'ex_sf_3', 'pw_sf_1', 'pw_sf_2'], nodes['id'])
+        self.assertEqual([0, 1, 1, 1, 2, 2], nodes['phase'])
+        self.assertEqual([150, 150, 250, 350, 150, 250], nodes['y'])
+        edges = columns['edges']
+        self.assertEqual([0, 0, 0, 1, 2, 0], edges['source'])
+        self.assertEqual([1, 2, 3, 4, 4, 5], edges['target'])
+        ## only the last edge has a bend point
+        self.assertEqual([0, 0, 0, 0, 0, 0, 1], edges['bend_offsets'])
+        self.assertEqual([450, 450], edges['bends'])
+        self.assertEqual({'value': [], 'x': [], 'y': []}, columns['badges'])
+
+    def test_to_columns_badges(self):
+        layout = self.get_layout(lod=LevelOfDetail(compress_chains=True))
+
+        # ex_sf_1 and ex_sf_2 are hidden in the chain from rp_sf_1 to pw_sf_1
+        columns = layout.to_columns()
+        self.assertEqual(['rp_sf_1', 'ex_sf_3', 'pw_sf_1', 'pw_sf_2'], columns['nodes']['id'])
+        self.assertEqual((('+2', 600, 200),), layout.badges)
+        self.assertEqual({'value': ['+2'], 'x': [600], 'y': [200]}, columns['badges'])
+
+
+class TestLayoutRenderer(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_flow_layout
+
+    def test_svg_renderer(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        layout = FlowDrawer(research_flow_status=research_flow_status).layout()
+
+        ## one layout is drawn in several styles, as drawn by the drawer with the same options
+        for options in ({}, {'style_mode': 'css'}, {'line_mode': 'path', 'long_edge_mode': 'polyline'}):
+            with self.subTest(options=options):
+                expected = FlowDrawer(research_flow_status=research_flow_status, **options).draw()
+                self.assertEqual(expected, SvgRenderer(**options).render(layout))
+
+    def test_svg_renderer_stages(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        stats = RenderStats()
+        svg = ''.join(SvgRenderer().iter_svg(FlowDrawer(research_flow_status).layout(), stats.stage))
+
+        self.assertEqual(FlowDrawer(research_flow_status).draw(), svg)
+        self.assertEqual(['frame', 'lines', 'nodes', 'labels'], list(stats.get_durations()))
+
+    def test_svg_renderer_err(self):
+        with self.assertRaises(ArgError):
+            SvgRenderer(line_mode='polyline')
+        with self.assertRaises(ArgError):
+            SvgRenderer(long_edge_mode='spline')
+        with self.assertRaises(ArgError):
+            SvgRenderer(style_mode='xml')
+
+    def test_json_renderer(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        layout = FlowDrawer(research_flow_status=research_flow_status).layout()
+
+        data = JsonRenderer().render(layout)
+
+        self.assertNotIn(' ', data.replace('_sf_', '').replace(' name', '').replace(' link', ''))
+        self.assertEqual(layout.to_columns(), json.loads(data))
+        self.assertEqual(layout.to_columns(), json.loads(JsonRenderer(indent=2).render(layout)))
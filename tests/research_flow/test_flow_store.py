@@ -0,0 +1,86 @@
+from unittest import TestCase
+from dg_drawer.research_flow.component.node import Node, DummyNode
+from dg_drawer.research_flow.flow_store import FlowStore
+from dg_drawer.research_flow import PhaseStatus, SubFlowStatus
+
+class TestFlowStore(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_flow_store
+
+    def get_research_flow_status(self):
+        phase_A = PhaseStatus(seq_number=1, name='phase_A', sub_flow_data=[
+            SubFlowStatus(id='1', name='node_1', link='', parent_ids=[], create_datetime=0),
+        ])
+        phase_B = PhaseStatus(seq_number=2, name='phase_B', sub_flow_data=[
+            SubFlowStatus(id='2', name='node_2', link='https://sample', parent_ids=['1'], create_datetime=10),
+            SubFlowStatus(id='3', name='node_3', link='', parent_ids=['1'], create_datetime=11),
+        ])
+        phase_C = PhaseStatus(seq_number=3, name='phase_C', sub_flow_data=[
+            SubFlowStatus(id='4', name='node_4', link='', parent_ids=['3', '100', '1'], create_datetime=20),
+        ])
+        return [phase_A, phase_B, phase_C]
+
+    def test_from_research_flow_status(self):
+        store = FlowStore.from_research_flow_status(self.get_research_flow_status())
+
+        ## 4 sub flows and 1 placeholder for the unknown parent ID
+        self.assertEqual(5, len(store))
+        self.assertEqual(3, store.phase_num)
+        self.assertEqual([[0], [1, 2], [3]], [list(rows) for rows in store.phase_rows])
+        self.assertEqual([0, 1, 1, 2, -1], list(store.phase_indexes))
+        self.assertEqual([0, 10, 11, 20, 0], list(store.create_datetimes))
+
+        self.assertEqual(2, store.get_row('3'))
+        self.assertEqual(4, store.get_row('100'))
+        self.assertEqual(-1, store.get_row('200'))
+        self.assertEqual('100', store.get_id(4))
+
+        ## parent rows are ordered by parent ID
+        self.assertEqual([0, 4, 2], list(store.get_parent_rows(3)))
+        self.assertEqual([], list(store.get_parent_rows(0)))
+
+    def test_from_nodes_each_phase(self):
+        node_1 = Node(id='1', parent_ids=[], create_datetime=0, node_name='node_1', cx=1, cy=2)
+        node_2 = DummyNode(id='2', parent_ids=['1'], create_datetime=10, node_name='')
+        store = FlowStore.from_nodes_each_phase([[node_1], [node_2]])
+
+        self.assertEqual(2, len(store))
+        self.assertFalse(store.is_dummy(0))
+        self.assertTrue(store.is_dummy(1))
+        self.assertEqual(1, store.cx[0])
+        self.assertEqual(2, store.cy[0])
+
+    def test_add_row(self):
+        store = FlowStore.from_research_flow_status(self.get_research_flow_status())
+        store.set_layer_parents({3: [2]})
+
+        row = store.add_row(phase_index=1, id='dummy', name='', link='', parent_rows=[0], create_datetime=5, dummy=True)
+
+        self.assertEqual(5, row)
+        self.assertEqual(row, store.get_row('dummy'))
+        self.assertEqual([0], list(store.get_parent_rows(row)))
+        self.assertEqual([0], list(store.get_layer_parent_rows(row)))
+        self.assertEqual([2], list(store.get_layer_parent_rows(3)))
+        self.assertEqual([0, 4, 2], list(store.get_parent_rows(3)))
+        self.assertEqual([0], list(store.get_layer_parent_rows(1)))
+        ## the row is not added to the rows of the phase
+        self.assertEqual([1, 2], list(store.phase_rows[1]))
+
+    def test_get_node(self):
+        store = FlowStore.from_research_flow_status(self.get_research_flow_status())
+        store.cx[1] = 45
+        store.cy[1] = 67
+
+        node = store.get_node(1)
+
+        self.assertIs(type(node), Node)
+        self.assertEqual('2', node.id)
+        self.assertEqual(['1'], node.parent_ids)
+        self.assertEqual(10, node.create_datetime)
+        self.assertEqual('node_2', node.node_name)
+        self.assertEqual('https://sample', node.href)
+        self.assertEqual(45, node.cx)
+        self.assertEqual(67, node.cy)
+
+        nodes_each_phase = store.get_nodes_each_phase()
+        self.assertEqual([['1'], ['2', '3'], ['4']], [[node.id for node in nodes] for nodes in nodes_each_phase])
+        self.assertEqual(['1', '100', '3'], nodes_each_phase[2][0].parent_ids)
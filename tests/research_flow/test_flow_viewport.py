@@ -0,0 +1,113 @@
+from unittest import TestCase
+import os
+import random
+import re
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow import FlowDrawer, PhaseStatus, SubFlowStatus, ResearchFlowStatus
+from dg_drawer.research_flow.level_of_detail import LevelOfDetail
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+class TestFlowViewport(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_flow_viewport
+
+    def get_research_flow_status(self):
+        rand = random.Random(0)
+        phases = []
+        for phase_index in range(5):
+            sub_flows = []
+            for index in range(rand.randint(5, 30)):
+                parent_ids = []
+                if phase_index > 0:
+                    parent_phase_index = rand.randint(max(phase_index-3, 0), phase_index-1)
+                    parent_ids.append(rand.choice(phases[parent_phase_index]._sub_flow_data)._id)
+                sub_flows.append(SubFlowStatus(id=f'{phase_index}-{index}', name=f'name {phase_index}-{index}', link='',
+                                               parent_ids=parent_ids, create_datetime=1672498800+phase_index*1000+index))
+            phases.append(PhaseStatus(seq_number=phase_index+1, name=f'phase {phase_index}', sub_flow_data=sub_flows))
+        return phases
+
+    def get_elements(self, svg:str):
+        return re.findall(r'<(line|circle) ([^>]*)>', svg)
+
+    def test_draw(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        fd = FlowDrawer(research_flow_status=research_flow_status)
+        viewport = fd.viewport()
+
+        svg = viewport.draw(phases=(1, 2), rows=(1, 3))
+
+        self.assertTrue(svg.startswith('<svg width="300" height="200" viewBox="300 200 300 200">'))
+        self.assertEqual(2, svg.count('<circle '))
+        self.assertIn('>ex_sf_2 name</text>', svg)
+        self.assertNotIn('>ex_sf_1 name</text>', svg)
+        # lines from the previous phase and to the next phase crossing the window
+        self.assertIn('<line x1="450" y1="450" x2="750" y2="250" ', svg)
+        self.assertNotIn('<line x1="450" y1="150" x2="750" y2="150" ', svg)
+
+        ## the whole window has the elements of the whole image
+        self.assertEqual(sorted(self.get_elements(fd.draw())), sorted(self.get_elements(viewport.draw())))
+        self.assertEqual((900, 500), (viewport.width, viewport.height))
+
+    def test_draw_windows(self):
+        fd = FlowDrawer(research_flow_status=self.get_research_flow_status())
+        viewport = fd.viewport()
+        all_elements = self.get_elements(fd.draw())
+        rand = random.Random(1)
+        for _ in range(50):
+            phase_start = rand.randint(0, 4)
+            phases = (phase_start, rand.randint(phase_start+1, 5))
+            y_start = rand.randint(0, viewport.height-1)
+            y_range = (y_start, rand.randint(y_start+1, viewport.height))
+
+            elements = self.get_elements(viewport.draw(phases=phases, y_range=y_range))
+
+            x0, x1 = phases[0] * 180, phases[1] * 180
+            y0, y1 = y_range
+            expected = []
+            for name, attributes in all_elements:
+                values = {key: int(value) for key, value in re.findall(r'(\w+)="(-?\d+)"', attributes)}
+                if name == 'line':
+                    visible = (min(values['x1'], values['x2']) <= x1 and max(values['x1'], values['x2']) >= x0
+                               and min(values['y1'], values['y2']) <= y1 and max(values['y1'], values['y2']) >= y0)
+                else:
+                    visible = x0 <= values['cx'] < x1 and values['cy'] - 27 <= y1 and values['cy'] + 10 >= y0
+                if visible:
+                    expected.append((name, attributes))
+            self.assertEqual(sorted(expected), sorted(elements), (phases, y_range))
+
+    def test_draw_badges(self):
+        fd = FlowDrawer(research_flow_status=self.get_research_flow_status(), lod=LevelOfDetail(compress_chains=True, max_phase_nodes=5))
+        viewport = fd.viewport()
+        svg = fd.draw()
+
+        ## the whole window has the labels and the badges of the whole image
+        self.assertEqual(sorted(re.findall(r'<text [^<]*', svg)), sorted(re.findall(r'<text [^<]*', viewport.draw())))
+
+        ## a badge on a line crossing the side of a window is drawn in the windows on both sides
+        badges = re.findall(r'<text x="(\d+)" y="(\d+)"[^>]*>(\+\d+)<', svg)
+        self.assertIn(('360', '1050', '+1'), badges)
+        for phases in ((1, 2), (2, 3)):
+            self.assertIn('>+1</text>', viewport.draw(phases=phases, y_range=(1000, 1100)))
+        self.assertNotIn('>+1</text>', viewport.draw(phases=(3, 5), y_range=(1000, 1100)))
+        self.assertNotIn('>+1</text>', viewport.draw(phases=(1, 3), y_range=(1100, 1200)))
+
+    def test_draw_style_mode_css(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        viewport = FlowDrawer(research_flow_status=research_flow_status, style_mode='css').viewport()
+
+        svg = viewport.draw(y_range=(0, 80))
+
+        self.assertTrue(svg.startswith('<svg class="dg-rf" width="900" height="80" viewBox="0 0 900 80"><style>'))
+        self.assertEqual(3, svg.count('<rect '))
+        self.assertEqual(0, svg.count('<use '))
+
+    def test_get_window_err(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(os.path.normpath(test_data_path))
+        viewport = FlowDrawer(research_flow_status=research_flow_status).viewport()
+
+        with self.assertRaises(ArgError):
+            viewport.draw(y_range=(0, 100), rows=(0, 1))
+        with self.assertRaises(ArgError):
+            viewport.draw(phases=(2, 2))
+        with self.assertRaises(ArgError):
+            viewport.draw(y_range=(600, 700))
@@ -0,0 +1,41 @@
+from unittest import TestCase
+import io
+import json
+
+from dg_drawer.research_flow.json_reader import JSONReader
+
+class TestJSONReader(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_json_reader
+
+    text = '{"a": [1, {"b": "あい"}, -12345.5e3], "c": {"d": [true, null]}, "e": "f"}'
+
+    def read(self, reader:JSONReader):
+        data = {}
+        for key in reader.iter_object():
+            if key == 'a':
+                data[key] = list(reader.iter_values())
+            elif key == 'c':
+                reader.skip_value()
+            else:
+                data[key] = reader.read_value()
+        reader.expect_end()
+        return data
+
+    def test_read(self):
+        expected = {'a': [1, {'b': 'あい'}, -12345.5e3], 'e': 'f'}
+        self.assertEqual(expected, self.read(JSONReader.from_text(self.text)))
+
+        ## chunks may split values and multibyte characters
+        for chunk_size in (1, 2, 3, 5, 8):
+            self.assertEqual(expected, self.read(JSONReader(io.StringIO(self.text).read, chunk_size=chunk_size)))
+            self.assertEqual(expected, self.read(JSONReader(io.BytesIO(self.text.encode('utf-8')).read, chunk_size=chunk_size)))
+
+    def test_read_error(self):
+        for text in ('{"a": [1 2]}', '{"a": [1, 2]', '{"a": 1} x', '{"a": [1, {"b": "c'):
+            with self.assertRaises(json.JSONDecodeError):
+                self.read(JSONReader(io.StringIO(text).read, chunk_size=4))
+
+        try:
+            self.read(JSONReader(io.StringIO('{"a": [1, 2]} x').read, chunk_size=4))
+        except json.JSONDecodeError as e:
+            self.assertEqual(14, e.pos)
@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow.flow_drawer import FlowDrawer
+from dg_drawer.research_flow.flow_drawer_session import FlowDrawerSession
+from dg_drawer.research_flow.layer_ordering import LayerOrdering
+from dg_drawer.research_flow.research_flow_status import PhaseStatus, ResearchFlowStatus, SubFlowStatus
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+class TestLayerOrdering(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_layer_ordering
+
+    def get_research_flow_status(self):
+        return [
+            PhaseStatus(1, 'phase_1', [SubFlowStatus('a', 'a', '', [], 0), SubFlowStatus('b', 'b', '', [], 1), SubFlowStatus('c', 'c', '', [], 2)]),
+            PhaseStatus(2, 'phase_2', [SubFlowStatus('x', 'x', '', ['a', 'c'], 0), SubFlowStatus('y', 'y', '', ['b'], 1), SubFlowStatus('z', 'z', '', ['a'], 2)]),
+        ]
+
+    def get_ids_each_phase(self, store):
+        return [['dummy' if store.is_dummy(row) else store.get_id(row) for row in rows] for rows in store.phase_rows]
+
+    def test_count_crossings(self):
+        store, _, _ = FlowDrawer(self.get_research_flow_status()).layout_store()
+
+        ## x-c crosses z-a and y-b
+        self.assertEqual([['a', 'b', 'c'], ['x', 'z', 'y']], self.get_ids_each_phase(store))
+        self.assertEqual(2, LayerOrdering(store).count_crossings())
+
+    def test_order(self):
+        for ordering in ('barycenter', 'median'):
+            fd = FlowDrawer(self.get_research_flow_status(), ordering=ordering)
+            store, _, _ = fd.layout_store()
+
+            self.assertEqual([['a', 'c', 'b'], ['z', 'x', 'y']], self.get_ids_each_phase(store))
+            self.assertEqual(0, fd.order_rows(store))
+            ## the coordinates follow the order
+            self.assertLess(store.cy[store.get_row('c')], store.cy[store.get_row('b')])
+
+    def test_order_no_crossing(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(test_data_path)
+        store, _, _ = FlowDrawer(research_flow_status).layout_store()
+        ordered_store, _, _ = FlowDrawer(research_flow_status, ordering='barycenter').layout_store()
+
+        ## the order without crossings is kept
+        self.assertEqual(0, LayerOrdering(store).count_crossings())
+        self.assertEqual(self.get_ids_each_phase(store), self.get_ids_each_phase(ordered_store))
+
+    def test_order_error(self):
+        with self.assertRaises(ArgError):
+            FlowDrawer(self.get_research_flow_status(), ordering='unknown')
+        with self.assertRaises(ArgError):
+            FlowDrawer(self.get_research_flow_status(), ordering_iterations=-1)
+        with self.assertRaises(ArgError):
+            FlowDrawerSession(self.get_research_flow_status(), ordering='median')
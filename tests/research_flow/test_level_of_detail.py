@@ -0,0 +1,95 @@
+from unittest import TestCase
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow import FlowDrawer, PhaseStatus, SubFlowStatus
+from dg_drawer.research_flow.level_of_detail import LevelOfDetail
+from dg_drawer.research_flow.status_validator import StatusValidator
+
+
+class TestLevelOfDetail(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_level_of_detail
+
+    def get_research_flow_status(self):
+        # phase 0 : a
+        # phase 1 : b_0 ... b_9 (children of a), c (child of a)
+        # phase 2 : d (child of c)
+        # phase 3 : e (child of d)
+        # phase 4 : f (child of b_0 and e)
+        def sub_flow(id, parent_ids, create_datetime):
+            return SubFlowStatus(id=id, name=f'name of {id}', link='', parent_ids=parent_ids, create_datetime=create_datetime)
+        return [
+            PhaseStatus(seq_number=1, name='phase_0', sub_flow_data=[sub_flow('a', [], 0)]),
+            PhaseStatus(seq_number=2, name='phase_1', sub_flow_data=[sub_flow(f'b_{index}', ['a'], 10-index) for index in range(10)] + [sub_flow('c', ['a'], 20)]),
+            PhaseStatus(seq_number=3, name='phase_2', sub_flow_data=[sub_flow('d', ['c'], 30)]),
+            PhaseStatus(seq_number=4, name='phase_3', sub_flow_data=[sub_flow('e', ['d'], 40)]),
+            PhaseStatus(seq_number=5, name='phase_4', sub_flow_data=[sub_flow('f', ['b_0', 'e'], 50)]),
+        ]
+
+    def get_ids(self, research_flow_status):
+        return [[sub_flow._id for sub_flow in phase_status._sub_flow_data] for phase_status in research_flow_status]
+
+    def test_summarize_phases(self):
+        research_flow_status = self.get_research_flow_status()
+
+        summary = LevelOfDetail(max_phase_nodes=4, group_link='?expand={group}').summarize(research_flow_status)
+
+        ## the first created sub flows are shown
+        self.assertEqual([['a'], ['b_7', 'b_8', 'b_9', 'lod:phase:1'], ['d'], ['e'], ['f']], self.get_ids(summary.research_flow_status))
+        self.assertEqual(['b_0', 'b_1', 'b_2', 'b_3', 'b_4', 'b_5', 'b_6', 'c'], summary.groups['lod:phase:1'])
+        aggregate = summary.research_flow_status[1]._sub_flow_data[-1]
+        self.assertEqual('+8 sub flows', aggregate._name)
+        self.assertEqual('?expand=lod:phase:1', aggregate._link)
+        self.assertEqual(['a'], aggregate._parent_ids)
+        self.assertEqual(['lod:phase:1'], summary.research_flow_status[2]._sub_flow_data[0]._parent_ids)
+        self.assertEqual(['lod:phase:1', 'e'], summary.research_flow_status[4]._sub_flow_data[0]._parent_ids)
+        StatusValidator.validate(summary.research_flow_status)
+        # The given research flow status is not modified.
+        self.assertEqual(11, len(research_flow_status[1]._sub_flow_data))
+        self.assertEqual(['b_0', 'e'], research_flow_status[4]._sub_flow_data[0]._parent_ids)
+
+        ## expanded group
+        summary = LevelOfDetail(max_phase_nodes=4).expand('lod:phase:1').summarize(research_flow_status)
+        self.assertEqual(self.get_ids(research_flow_status), self.get_ids(summary.research_flow_status))
+
+    def test_summarize_chains(self):
+        research_flow_status = self.get_research_flow_status()
+
+        summary = LevelOfDetail(compress_chains=True).summarize(research_flow_status)
+
+        # b_0 and c -> d -> e are chains between a and f
+        self.assertEqual([['a'], [f'b_{index}' for index in range(1, 10)], [], [], ['f']], self.get_ids(summary.research_flow_status))
+        self.assertEqual({'lod:chain:a:f': ['b_0', 'c', 'd', 'e']}, summary.groups)
+        self.assertEqual([('a', 'f', 4)], summary.badges)
+        self.assertEqual(['a'], summary.research_flow_status[4]._sub_flow_data[0]._parent_ids)
+        StatusValidator.validate(summary.research_flow_status)
+
+        summary = LevelOfDetail(compress_chains=True, expanded=['lod:chain:a:f']).summarize(research_flow_status)
+        self.assertEqual(self.get_ids(research_flow_status), self.get_ids(summary.research_flow_status))
+
+    def test_summarize_labels(self):
+        summary = LevelOfDetail(max_label_length=6).summarize(self.get_research_flow_status())
+
+        self.assertEqual('name …', summary.research_flow_status[0]._sub_flow_data[0]._name)
+
+    def test_draw(self):
+        research_flow_status = self.get_research_flow_status()
+        svg = FlowDrawer(research_flow_status=research_flow_status).draw()
+        fd = FlowDrawer(research_flow_status=research_flow_status, lod=LevelOfDetail(max_phase_nodes=4))
+
+        svg_lod = fd.draw()
+
+        self.assertIn('>+8 sub flows</text>', svg_lod)
+        self.assertIn('height="500"', svg_lod)
+        self.assertLess(len(svg_lod), len(svg))
+        self.assertNotEqual(FlowDrawer(research_flow_status=research_flow_status).fingerprint(), fd.fingerprint())
+
+        ## badge on the line from the child of the chain
+        fd = FlowDrawer(research_flow_status=research_flow_status, lod=LevelOfDetail(compress_chains=True))
+        self.assertIn('>+4</text>', fd.draw())
+        fd = FlowDrawer(research_flow_status=research_flow_status, lod=LevelOfDetail(compress_chains=True), style_mode='css')
+        self.assertIn('<text class="bd" ', fd.draw())
+
+    def test_constructor_err(self):
+        with self.assertRaises(ArgError):
+            LevelOfDetail(max_phase_nodes=0)
+        with self.assertRaises(ArgError):
+            LevelOfDetail(max_label_length=0)
@@ -0,0 +1,87 @@
+import os
+import tempfile
+from unittest import TestCase
+from dg_drawer.research_flow.flow_drawer import FlowDrawer
+from dg_drawer.research_flow.render_cache import RenderCache, get_fingerprint
+from dg_drawer.research_flow.render_stats import RenderStats
+from dg_drawer.research_flow.research_flow_status import ResearchFlowStatus
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+class TestRenderCache(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_render_cache
+
+    def test_get_fingerprint(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(test_data_path)
+        options = FlowDrawer(research_flow_status).get_options()
+
+        fingerprint = get_fingerprint(research_flow_status, options)
+        self.assertEqual(fingerprint, get_fingerprint(ResearchFlowStatus.load_from_json(test_data_path), options))
+
+        ## the order of the parent IDs does not change the fingerprint
+        sub_flow = research_flow_status[-1]._sub_flow_data[0]
+        sub_flow._parent_ids = list(reversed(sub_flow._parent_ids))
+        self.assertEqual(fingerprint, get_fingerprint(research_flow_status, options))
+
+        ## options and sub flow data change the fingerprint
+        self.assertNotEqual(fingerprint, get_fingerprint(research_flow_status, dict(options, line_mode='path')))
+        sub_flow._name = sub_flow._name + '_renamed'
+        self.assertNotEqual(fingerprint, get_fingerprint(research_flow_status, options))
+
+    def test_lru_eviction(self):
+        cache = RenderCache(max_bytes=10)
+        cache.put_svg('a', '1234')
+        cache.put_svg('b', '1234')
+        self.assertEqual('1234', cache.get_svg('a'))
+        cache.put_svg('c', '1234')
+
+        ## 'b' is the least recently used
+        self.assertEqual(2, len(cache))
+        self.assertEqual(8, cache.size)
+        self.assertIsNone(cache.get_svg('b'))
+        self.assertEqual('1234', cache.get_svg('a'))
+
+        ## data larger than max_bytes is not held
+        cache.put_svg('d', '12345678901')
+        self.assertIsNone(cache.get_svg('d'))
+
+    def test_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = RenderCache(directory=directory)
+            cache.put_svg('abcd', '<svg></svg>')
+            cache.put_layout('abcd', ([1, 2], 3))
+            self.assertTrue(os.path.isfile(os.path.join(directory, 'ab', 'abcd.svg')))
+
+            ## another instance reads the results from the directory
+            cache = RenderCache(directory=directory)
+            self.assertEqual('<svg></svg>', cache.get_svg('abcd'))
+            self.assertEqual(([1, 2], 3), cache.get_layout('abcd'))
+            self.assertIsNone(cache.get_svg('efgh'))
+
+    def test_flow_drawer(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(test_data_path)
+        expected = FlowDrawer(research_flow_status).draw()
+        cache = RenderCache()
+
+        fd = FlowDrawer(research_flow_status, cache=cache)
+        self.assertEqual(expected, fd.draw())
+        self.assertEqual(expected, cache.get_svg(fd.fingerprint()))
+        self.assertIsNotNone(cache.get_layout(fd.layout_fingerprint()))
+        self.assertIsNone(cache.get_layout(fd.fingerprint()))
+
+        ## the layout is reused by a drawer with the same fingerprint
+        cache.put_svg(fd.fingerprint(), 'cached')
+        self.assertEqual('cached', FlowDrawer(research_flow_status, cache=cache).draw())
+
+        ## the options only used to render the layout share the cached layout
+        stats = RenderStats()
+        fd = FlowDrawer(research_flow_status, line_mode='path', style_mode='css', cache=cache, stats=stats)
+        self.assertEqual(FlowDrawer(research_flow_status, line_mode='path', style_mode='css').draw(), fd.draw())
+        self.assertEqual(1, stats.counts['layout_cache_hits'])
+        self.assertNotEqual(FlowDrawer(research_flow_status).fingerprint(), fd.fingerprint())
+        self.assertNotEqual(fd.layout_fingerprint(), FlowDrawer(research_flow_status, ordering='barycenter').layout_fingerprint())
+
+        ## a cached layout gives the same SVG data
+        with tempfile.TemporaryDirectory() as directory:
+            FlowDrawer(research_flow_status, cache=RenderCache(directory=directory)).layout_store()
+            self.assertEqual(expected, FlowDrawer(research_flow_status, cache=RenderCache(directory=directory)).draw())
@@ -0,0 +1,211 @@
+from unittest import TestCase
+from concurrent.futures import BrokenExecutor, ThreadPoolExecutor
+import contextlib
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import threading
+from xml.etree import ElementTree
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow import FlowDrawer, ResearchFlowStatus
+from dg_drawer.research_flow.render_cli import BatchRenderer, main
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+
+class BreakingExecutor(ThreadPoolExecutor):
+    # Executor which breaks after rendering a number of inputs in each of its first broken_num maps
+
+    def __init__(self, rendered_num:int, broken_num:int=1):
+        super().__init__(max_workers=1)
+        self.rendered_num = rendered_num
+        self.broken_num = broken_num
+
+    def map(self, fn, *iterables, **kwargs):
+        if self.broken_num == 0:
+            return super().map(fn, *iterables, **kwargs)
+        self.broken_num -= 1
+        def iter_results():
+            # The inputs after the break are not rendered.
+            for args in list(zip(*iterables))[:self.rendered_num]:
+                yield self.submit(fn, *args).result()
+            raise BrokenExecutor('A worker was terminated')
+        return iter_results()
+
+
+class TestRenderCli(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_render_cli
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.input_dir = os.path.join(self.dir, 'in')
+        self.output_dir = os.path.join(self.dir, 'out')
+        os.makedirs(os.path.join(self.input_dir, 'sub'))
+        for name in ('a.json', os.path.join('sub', 'b.json')):
+            self.copy_input(name)
+        with open(os.path.join(self.input_dir, 'notes.txt'), 'w') as f:
+            f.write('not an input')
+        self.executor = ThreadPoolExecutor(max_workers=2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+        shutil.rmtree(self.dir)
+
+    def copy_input(self, name:str, mtime:int=1000000000):
+        path = os.path.join(self.input_dir, name)
+        shutil.copyfile(test_data_path, path)
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_render(self):
+        renderer = BatchRenderer([self.input_dir], output_dir=self.output_dir, executor=self.executor, style_mode='css')
+
+        report = renderer.render()
+
+        self.assertEqual([], report.failed)
+        self.assertEqual(0, report.skipped_num)
+        outputs = sorted(os.path.relpath(result.output_path, self.output_dir) for result in report.results)
+        self.assertEqual(['a.svg', os.path.join('sub', 'b.svg')], outputs)
+        expected = FlowDrawer(ResearchFlowStatus.load_from_json(test_data_path), style_mode='css').draw_bytes().decode('utf-8')
+        with open(os.path.join(self.output_dir, 'sub', 'b.svg'), encoding='utf-8') as f:
+            self.assertEqual(expected, f.read())
+
+        ## the outputs newer than their input are skipped
+        report = renderer.render()
+        self.assertEqual(([], 2), (report.results, report.skipped_num))
+
+        ## only the changed and new inputs are rendered
+        changed_path = self.copy_input('a.json', mtime=2000000000)
+        new_path = self.copy_input('c.json')
+        report = renderer.render()
+        self.assertEqual([changed_path, new_path], [result.input_path for result in report.results])
+        self.assertEqual(1, report.skipped_num)
+
+        ## force renders all the inputs
+        renderer = BatchRenderer([self.input_dir], output_dir=self.output_dir, force=True, executor=self.executor)
+        self.assertEqual(3, len(renderer.render().results))
+
+    def test_render_files(self):
+        path = self.copy_input('d.json')
+        bad_path = os.path.join(self.input_dir, 'bad.json')
+        with open(bad_path, 'w') as f:
+            f.write('{')
+        renderer = BatchRenderer([path, bad_path], suffix='.svgz', max_workers=1)
+
+        report = renderer.render()
+
+        ## the outputs are next to the inputs
+        self.assertEqual([os.path.join(self.input_dir, 'd.svgz'), os.path.join(self.input_dir, 'bad.svgz')],
+                         [result.output_path for result in report.results])
+        with open(os.path.join(self.input_dir, 'd.svgz'), 'rb') as f:
+            self.assertEqual(FlowDrawer(ResearchFlowStatus.load_from_json(test_data_path)).draw_bytes(), gzip.decompress(f.read()))
+        self.assertEqual([bad_path], [result.input_path for result in report.failed])
+        self.assertFalse(os.path.exists(os.path.join(self.input_dir, 'bad.svgz')))
+
+        ## a failed input is not rendered again until it changes
+        report = renderer.render()
+        self.assertEqual(([], 2), (report.results, report.skipped_num))
+        os.utime(bad_path, (2000000000, 2000000000))
+        self.assertEqual([bad_path], [result.input_path for result in renderer.render().failed])
+
+    def test_render_document(self):
+        renderer = BatchRenderer([self.input_dir], output_dir=self.output_dir, executor=self.executor)
+        self.assertEqual([], renderer.render().failed)
+        renderer = BatchRenderer([self.input_dir], output_dir=self.output_dir, suffix='.svgz', executor=self.executor)
+        self.assertEqual([], renderer.render().failed)
+
+        ## the written files are standalone SVG documents
+        root = ElementTree.parse(os.path.join(self.output_dir, 'a.svg')).getroot()
+        self.assertEqual('{http://www.w3.org/2000/svg}svg', root.tag)
+        with gzip.open(os.path.join(self.output_dir, 'sub', 'b.svgz')) as f:
+            root = ElementTree.parse(f).getroot()
+        self.assertEqual('{http://www.w3.org/2000/svg}svg', root.tag)
+
+    def test_watch(self):
+        renderer = BatchRenderer([self.input_dir], output_dir=self.output_dir, executor=self.executor)
+        stop = threading.Event()
+        rendered = []
+        first_pass = threading.Event()
+        def callback(result):
+            rendered.append(result.input_path)
+            if len(rendered) == 2:
+                first_pass.set()
+            if len(rendered) == 3:
+                stop.set()
+        thread = threading.Thread(target=renderer.watch, args=(0.01, stop, callback))
+        thread.start()
+
+        self.assertTrue(first_pass.wait(10))
+        new_path = self.copy_input('e.json', mtime=2000000000)
+        thread.join(10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(new_path, rendered[2])
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'e.svg')))
+
+    def test_render_broken_executor(self):
+        self.copy_input('c.json')
+        with BreakingExecutor(rendered_num=1) as executor:
+            renderer = BatchRenderer([self.input_dir], output_dir=self.output_dir, executor=executor)
+
+            report = renderer.render()
+
+            ## the inputs after the break are failed
+            self.assertEqual(3, len(report.results))
+            self.assertEqual(1, len(report.results) - len(report.failed))
+            self.assertTrue(all(isinstance(result.error, BrokenExecutor) for result in report.failed))
+            ## and rendered again at the next pass
+            report = renderer.render()
+            self.assertEqual(([], 1), (report.failed, report.skipped_num))
+            self.assertEqual(2, len(report.results))
+
+        ## the executor breaks before rendering any input
+        with BreakingExecutor(rendered_num=0) as executor:
+            renderer = BatchRenderer([self.input_dir], output_dir=self.output_dir, force=True, executor=executor)
+            self.assertEqual(3, len(renderer.render().failed))
+
+    def test_watch_broken_executor(self):
+        with BreakingExecutor(rendered_num=0, broken_num=2) as executor:
+            renderer = BatchRenderer([self.input_dir], output_dir=self.output_dir, executor=executor)
+            stop = threading.Event()
+            results = []
+            def callback(result):
+                results.append(result)
+                if result.ok and len([result for result in results if result.ok]) == 2:
+                    stop.set()
+
+            ## the watch keeps polling
+            renderer.watch(0.01, stop, callback)
+
+        self.assertEqual([False] * 4 + [True] * 2, [result.ok for result in results])
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'a.svg')))
+
+    def test_main(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            status = main([self.input_dir, '-o', self.output_dir, '-j', '1', '--line-mode', 'path'])
+
+        self.assertEqual(0, status)
+        self.assertIn('2 rendered, 0 skipped, 0 failed', stdout.getvalue())
+        expected = FlowDrawer(ResearchFlowStatus.load_from_json(test_data_path), line_mode='path').draw_bytes().decode('utf-8')
+        with open(os.path.join(self.output_dir, 'a.svg'), encoding='utf-8') as f:
+            self.assertEqual(expected, f.read())
+
+        with open(os.path.join(self.input_dir, 'bad.json'), 'w') as f:
+            f.write('{')
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(1, main([self.input_dir, '-o', self.output_dir, '-j', '1', '--quiet']))
+        self.assertIn('bad.json', stderr.getvalue())
+
+    def test_err(self):
+        with self.assertRaises(ArgError):
+            BatchRenderer([self.input_dir], suffix='.png')
+        with self.assertRaises(ArgError):
+            BatchRenderer([self.input_dir], max_workers=0)
+        with self.assertRaises(ArgError):
+            BatchRenderer([self.input_dir], chunksize=0)
+        with self.assertRaises(ArgError):
+            BatchRenderer([self.input_dir], style_mode='xml')
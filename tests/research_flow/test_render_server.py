@@ -0,0 +1,197 @@
+from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import gzip
+import http.client
+import io
+import json
+import threading
+from xml.etree import ElementTree
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow import FlowDrawer, ResearchFlowStatus
+from dg_drawer.research_flow.render_server import RenderServer, RenderService, RequestTooLargeError
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+
+class GatedExecutor(ThreadPoolExecutor):
+    # Executor counting the submitted drawings, which start when the gate is opened
+
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.gate = threading.Event()
+        self.submitted_num = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted_num += 1
+        def run():
+            self.gate.wait(10)
+            return fn(*args, **kwargs)
+        return super().submit(run)
+
+
+class FailingExecutor(ThreadPoolExecutor):
+    # Executor whose drawings fail with an error which is not an error of the request
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+
+    def submit(self, fn, *args, **kwargs):
+        def run():
+            raise RecursionError('maximum recursion depth exceeded')
+        return super().submit(run)
+
+
+class TestRenderServer(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_render_server
+
+    @classmethod
+    def setUpClass(cls):
+        with open(test_data_path, 'rb') as f:
+            cls.body = f.read()
+        cls.service = RenderService(max_workers=1, max_body_bytes=16*1024, max_sub_flows=10)
+        cls.server = RenderServer(('127.0.0.1', 0), cls.service)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.close()
+
+    def request(self, method:str, path:str, body:bytes=None, headers:dict=None, server:RenderServer=None):
+        connection = http.client.HTTPConnection(*(server or self.server).server_address, timeout=30)
+        try:
+            connection.request(method, path, body=body, headers=headers or {})
+            response = connection.getresponse()
+            return response.status, dict(response.getheaders()), response.read()
+        finally:
+            connection.close()
+
+    def test_render(self):
+        expected = FlowDrawer(ResearchFlowStatus.load(self.body), style_mode='css').draw_bytes()
+
+        status, headers, data = self.request('POST', '/render?style_mode=css', self.body)
+
+        self.assertEqual(200, status)
+        self.assertEqual(expected, data)
+        self.assertEqual('{http://www.w3.org/2000/svg}svg', ElementTree.fromstring(data).tag)
+        self.assertEqual('image/svg+xml; charset=utf-8', headers['Content-Type'])
+        etag = headers['ETag']
+
+        ## the same request gives the same ETag, and 304 if the client has the result
+        self.assertEqual(etag, self.request('POST', '/render?style_mode=css', self.body)[1]['ETag'])
+        status, _, data = self.request('POST', '/render?style_mode=css', self.body, {'If-None-Match': etag})
+        self.assertEqual((304, b''), (status, data))
+        ## other options give another result
+        status, headers, data = self.request('POST', '/render', self.body, {'If-None-Match': etag})
+        self.assertEqual(200, status)
+        self.assertNotEqual(etag, headers['ETag'])
+        self.assertEqual(FlowDrawer(ResearchFlowStatus.load(self.body)).draw_bytes(), data)
+
+    def test_render_gzip(self):
+        status, headers, data = self.request('POST', '/render', self.body, {'Accept-Encoding': 'br, gzip'})
+
+        self.assertEqual(200, status)
+        self.assertEqual('gzip', headers['Content-Encoding'])
+        self.assertEqual(FlowDrawer(ResearchFlowStatus.load(self.body)).draw_bytes(), gzip.decompress(data))
+
+    def test_layout(self):
+        status, headers, data = self.request('POST', '/layout', self.body)
+
+        self.assertEqual((200, 'application/json'), (status, headers['Content-Type']))
+        self.assertEqual(FlowDrawer(ResearchFlowStatus.load(self.body)).layout().to_columns(), json.loads(data))
+
+    def test_health(self):
+        self.assertEqual((200, b'ok'), self.request('GET', '/health')[::2])
+        self.assertEqual(404, self.request('GET', '/render')[0])
+        self.assertEqual(404, self.request('POST', '/draw', self.body)[0])
+
+    def test_bad_request(self):
+        self.assertEqual(400, self.request('POST', '/render', b'{"research_flow_status": ')[0])
+        self.assertEqual(400, self.request('POST', '/render', b'{"research_flow_pahse_data": [{"seq_number": 1}]}')[0])
+        self.assertEqual(400, self.request('POST', '/render?width=100', self.body)[0])
+        self.assertEqual(400, self.request('POST', '/render?whole_max_width=wide', self.body)[0])
+        ## options are checked by the drawer
+        status, _, data = self.request('POST', '/render?style_mode=xml', self.body)
+        self.assertEqual(400, status)
+        self.assertIn(b'Unsupported style mode', data)
+
+    def test_internal_error(self):
+        # A drawing failing with an unexpected error (the same with both JSON backends)
+        executor = FailingExecutor()
+        service = RenderService(executor=executor)
+        server = RenderServer(('127.0.0.1', 0), service)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr):
+                status, _, data = self.request('POST', '/render', self.body, server=server)
+
+            self.assertEqual((500, b'Internal server error'), (status, data))
+            self.assertIn('RecursionError', stderr.getvalue())
+            ## the server still works
+            self.assertEqual((200, b'ok'), self.request('GET', '/health', server=server)[::2])
+        finally:
+            server.shutdown()
+            server.server_close()
+            executor.shutdown()
+
+    def test_too_large(self):
+        status, _, data = self.request('POST', '/render', self.body + b' ' * 16*1024)
+        self.assertEqual(413, status)
+
+        research_flow_status = json.loads(self.body)
+        sub_flows = research_flow_status['research_flow_pahse_data'][0]['sub_flow_data']
+        for index in range(10):
+            sub_flows.append(dict(sub_flows[0], id=f'more_{index}'))
+        status, _, data = self.request('POST', '/render', json.dumps(research_flow_status, separators=(',', ':')).encode('utf-8'))
+        self.assertEqual(413, status)
+        self.assertIn(b'Too many sub flows', data)
+
+
+class TestRenderService(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_render_server
+
+    def test_coalescing(self):
+        with open(test_data_path, 'rb') as f:
+            body = f.read()
+        executor = GatedExecutor()
+        service = RenderService(executor=executor)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(service.render(body, {'style_mode': 'css'}))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while service.coalesced_num < 2:
+            threading.Event().wait(0.01)
+        executor.gate.set()
+        for thread in threads:
+            thread.join()
+
+        ## the identical requests in flight are drawn once
+        self.assertEqual(1, executor.submitted_num)
+        self.assertEqual(3, len(results))
+        self.assertEqual(1, len(set(results)))
+        ## finished requests are drawn again
+        service.render(body, {'style_mode': 'css'})
+        self.assertEqual(2, executor.submitted_num)
+        executor.shutdown()
+
+    def test_render_err(self):
+        service = RenderService(max_body_bytes=10, executor=ThreadPoolExecutor(max_workers=1))
+        with self.assertRaises(RequestTooLargeError):
+            service.render(b'{' * 11, {})
+        with self.assertRaises(ArgError):
+            service.render(b'{}', {}, 'png')
+        with self.assertRaises(ArgError):
+            RenderService().render(b'{}', {})
+
+    def test_constructor_err(self):
+        with self.assertRaises(ArgError):
+            RenderService(max_workers=0)
+        with self.assertRaises(ArgError):
+            RenderService(max_body_bytes=0)
+        with self.assertRaises(ArgError):
+            RenderService(max_sub_flows=0)
@@ -0,0 +1,89 @@
+from unittest import TestCase
+import json
+import os
+import tempfile
+
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow.flow_drawer import FlowDrawer
+from dg_drawer.research_flow.render_cache import RenderCache
+from dg_drawer.research_flow.render_stats import RenderStats
+from dg_drawer.research_flow.research_flow_status import ResearchFlowStatus
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+class TestRenderStats(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_render_stats
+
+    stages = ['validate', 'build_store', 'fill_dummy_rows', 'sort_rows', 'set_locations', 'frame', 'lines', 'nodes', 'labels']
+
+    def test_flow_drawer(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(test_data_path)
+        ended_stages = []
+        stats = RenderStats(callback=lambda record: ended_stages.append(record.name))
+
+        svg = FlowDrawer(research_flow_status, stats=stats).draw()
+
+        self.assertEqual(self.stages, ended_stages)
+        self.assertEqual(self.stages, list(stats.get_durations().keys()))
+        self.assertTrue(all(record.seconds >= 0 and record.allocated_bytes is None for record in stats.records))
+        self.assertEqual(
+            {'nodes': 6, 'dummy_nodes': 1, 'lines': 7, 'output_bytes': len(svg.encode('utf-8'))},
+            stats.counts
+        )
+
+        ## the SVG data does not change with stats
+        self.assertEqual(FlowDrawer(research_flow_status).draw(), svg)
+
+    def test_trace_allocations(self):
+        stats = RenderStats(trace_allocations=True)
+        FlowDrawer(ResearchFlowStatus.load_from_json(test_data_path), stats=stats).draw()
+
+        record = stats.records[1]
+        self.assertEqual('build_store', record.name)
+        self.assertGreater(record.peak_bytes, 0)
+        self.assertIsNotNone(record.allocated_bytes)
+
+    def test_trace_allocations_concurrent(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(test_data_path)
+        stats = RenderStats(trace_allocations=True)
+
+        ## tracemalloc is global to the process, so a traced stage cannot run during another one (of any instance)
+        svg = FlowDrawer(research_flow_status, stats=stats).iter_svg()
+        ## in the 'frame' stage after the start tag
+        fragments = [next(svg), next(svg)]
+        with self.assertRaises(ArgError):
+            FlowDrawer(research_flow_status, stats=RenderStats(trace_allocations=True)).draw()
+        ## stages without allocation tracing are not limited
+        FlowDrawer(research_flow_status, stats=RenderStats()).draw()
+        fragments.extend(svg)
+        self.assertEqual(FlowDrawer(research_flow_status).draw(), ''.join(fragments))
+
+        ## tracing is available again once the stage ends
+        FlowDrawer(research_flow_status, stats=RenderStats(trace_allocations=True)).draw()
+        self.assertEqual(self.stages, list(stats.get_durations().keys()))
+
+    def test_cache_hits(self):
+        research_flow_status = ResearchFlowStatus.load_from_json(test_data_path)
+        cache = RenderCache()
+        FlowDrawer(research_flow_status, cache=cache).draw()
+
+        stats = RenderStats()
+        FlowDrawer(research_flow_status, cache=cache, stats=stats).draw()
+        self.assertEqual(['fingerprint'], list(stats.get_durations().keys()))
+        self.assertEqual(1, stats.counts['svg_cache_hits'])
+
+    def test_chrome_trace(self):
+        stats = RenderStats()
+        FlowDrawer(ResearchFlowStatus.load_from_json(test_data_path), stats=stats).draw()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.json')
+            stats.save_chrome_trace(path)
+            with open(path, 'r') as f:
+                trace = json.load(f)
+
+        events = trace['traceEvents']
+        self.assertEqual(self.stages, [event['name'] for event in events if event['ph'] == 'X'])
+        self.assertEqual(stats.counts, events[-1]['args'])
+        self.assertTrue(all(event['ts'] >= 0 for event in events))
+        self.assertEqual(stats.to_dict()['counts'], stats.counts)
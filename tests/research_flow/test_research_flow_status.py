@@ -1,8 +1,15 @@
 from unittest import TestCase
+import io
+import json
 import os
+from unittest import skipIf
 
+from dg_drawer.error.error import JSONDataError
+from dg_drawer.research_flow.json_reader import JSONReader, get_ijson
 from dg_drawer.research_flow.research_flow_status import ResearchFlowStatus
 
+ijson = get_ijson()
+
 class TestResearchFlowStatus(TestCase):
     # test exec : python -m unittest tests.research_flow.test_research_flow_status
 
@@ -71,3 +78,90 @@ class TestResearchFlowStatus(TestCase):
         self.assertEqual("pw_sf_2 link", pw_sf[1]._link)
         self.assertEqual(1, len(pw_sf[1]._parent_ids))
         self.assertEqual(101, pw_sf[1]._create_datetime)
+
+    def test_load(self):
+
+        test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+        def to_tuples(rfs):
+            return [
+                (ps._seq_number, ps._name, [(sf._id, sf._name, sf._link, sf._parent_ids, sf._create_datetime) for sf in ps._sub_flow_data])
+                for ps in rfs
+            ]
+
+        expected = to_tuples(ResearchFlowStatus.load_from_json(test_data_path))
+        with open(test_data_path, 'rb') as f:
+            data = f.read()
+
+        ## path, bytes, str and file-like objects
+        self.assertEqual(expected, to_tuples(ResearchFlowStatus.load(test_data_path)))
+        self.assertEqual(expected, to_tuples(ResearchFlowStatus.load(data)))
+        self.assertEqual(expected, to_tuples(ResearchFlowStatus.load(data.decode('utf-8'))))
+        self.assertEqual(expected, to_tuples(ResearchFlowStatus.load(io.BytesIO(data))))
+        self.assertEqual(expected, to_tuples(ResearchFlowStatus.load(io.StringIO(data.decode('utf-8')))))
+
+        ## unknown keys are skipped and phases are sorted by sequence number
+        loaded_json = json.loads(data)
+        loaded_json['unknown'] = {'key': [1, 2]}
+        loaded_json['research_flow_pahse_data'].reverse()
+        self.assertEqual(expected, to_tuples(ResearchFlowStatus.load(json.dumps(loaded_json))))
+
+        ## parent IDs share the string of the parent ID
+        rfs = ResearchFlowStatus.load(data)
+        self.assertIs(rfs[0]._sub_flow_data[0]._id, rfs[1]._sub_flow_data[0]._parent_ids[0])
+
+    @skipIf(ijson is None, 'ijson is not installed')
+    def test_load_backends(self):
+
+        test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+        def load(text):
+            # the result or the error of JSONReader and ijson
+            results = []
+            for load_data in (lambda: ResearchFlowStatus._load_from_reader(JSONReader.from_text(text)),
+                              lambda: ResearchFlowStatus._load_with_ijson(ijson, io.BytesIO(text.encode('utf-8')))):
+                try:
+                    results.append([(ps._seq_number, ps._name, [(sf._id, sf._name, sf._link, sf._parent_ids, sf._create_datetime)
+                                                                for sf in ps._sub_flow_data])
+                                    for ps in load_data()])
+                except JSONDataError as e:
+                    results.append(str(e))
+                except json.JSONDecodeError:
+                    results.append(json.JSONDecodeError)
+            return results
+
+        with open(test_data_path, 'r') as f:
+            loaded_json = json.load(f)
+
+        def load_with(update, expected):
+            data = json.loads(json.dumps(loaded_json))
+            update(data)
+            self.assertEqual([expected] * 2, load(json.dumps(data)))
+
+        def phase(data):
+            return data['research_flow_pahse_data'][1]
+
+        def sub_flow(data):
+            return phase(data)['sub_flow_data'][0]
+
+        ## valid data
+        expected = load(json.dumps(loaded_json))[0]
+        self.assertEqual(3, len(expected))
+        load_with(lambda data: data.update(unknown={'research_flow_pahse_data': [[1]]}), expected)
+        load_with(lambda data: phase(data).update(unknown=[{'seq_number': {}}]), expected)
+
+        ## invalid data
+        load_with(lambda data: data.pop('research_flow_pahse_data'), 'Missing key [research_flow_pahse_data] at (root)')
+        load_with(lambda data: data.update(research_flow_pahse_data={}), 'Invalid type at research_flow_pahse_data : expected array')
+        load_with(lambda data: data['research_flow_pahse_data'].append([]), 'Invalid type at research_flow_pahse_data[3] : expected object')
+        load_with(lambda data: phase(data).pop('name'), 'Missing key [name] at research_flow_pahse_data[1]')
+        load_with(lambda data: phase(data).update(seq_number={'a': 1}), 'Invalid type at research_flow_pahse_data[1].seq_number : expected int, got dict')
+        load_with(lambda data: phase(data).update(name=['a']), 'Invalid type at research_flow_pahse_data[1].name : expected str, got list')
+        load_with(lambda data: phase(data).update(sub_flow_data={}), 'Invalid type at research_flow_pahse_data[1].sub_flow_data : expected array')
+        load_with(lambda data: phase(data)['sub_flow_data'].append([1]), 'Invalid type at research_flow_pahse_data[1].sub_flow_data[2] : expected object, got list')
+        load_with(lambda data: phase(data)['sub_flow_data'].insert(0, 'a'), 'Invalid type at research_flow_pahse_data[1].sub_flow_data[0] : expected object, got str')
+        load_with(lambda data: sub_flow(data).pop('link'), 'Missing key [link] at research_flow_pahse_data[1].sub_flow_data[0]')
+        load_with(lambda data: sub_flow(data).update(parent_ids=[['rp_sf_1']]),
+                  'Invalid type at research_flow_pahse_data[1].sub_flow_data[0].parent_ids[0] : expected str, got list')
+        self.assertEqual([json.JSONDecodeError] * 2, load('{"research_flow_pahse_data": [{"seq_number": 1'))
+        self.assertEqual([json.JSONDecodeError] * 2, load('{"research_flow_pahse_data": [] x'))
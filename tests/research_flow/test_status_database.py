@@ -0,0 +1,118 @@
+from unittest import TestCase
+import os
+import shutil
+import sqlite3
+import tempfile
+from dg_drawer.error.error import ArgError, JSONDataError
+from dg_drawer.research_flow import FlowDrawer, PhaseStatus, ResearchFlowStatus, SubFlowStatus
+from dg_drawer.research_flow.status_database import StatusDatabase
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+
+class TestStatusDatabase(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_status_database
+
+    def setUp(self):
+        self.database = StatusDatabase()
+        self.database.import_json('project_a', test_data_path)
+
+    def tearDown(self):
+        self.database.close()
+
+    def dump(self, research_flow_status):
+        return [(phase._seq_number, phase._name, [(sub_flow._id, sub_flow._parent_ids) for sub_flow in phase._sub_flow_data])
+                for phase in research_flow_status]
+
+    def test_load(self):
+        expected = ResearchFlowStatus.load_from_json(test_data_path)
+
+        research_flow_status = self.database.load('project_a')
+
+        self.assertEqual(self.dump(expected), self.dump(research_flow_status))
+        self.assertEqual(FlowDrawer(expected).draw(), FlowDrawer(research_flow_status).draw())
+        sub_flow = research_flow_status[2]._sub_flow_data[1]
+        self.assertEqual(('pw_sf_2', 'pw_sf_2 name', 'pw_sf_2 link', 101), (sub_flow._id, sub_flow._name, sub_flow._link, sub_flow._create_datetime))
+
+    def test_load_phases(self):
+        research_flow_status = self.database.load('project_a', seq_numbers=[2, 3])
+
+        ## the parents in the phases which are not loaded are left out
+        self.assertEqual([
+            (2, 'experiments', [('ex_sf_1', []), ('ex_sf_2', []), ('ex_sf_3', [])]),
+            (3, 'paper_writing', [('pw_sf_1', ['ex_sf_1', 'ex_sf_2']), ('pw_sf_2', [])]),
+        ], self.dump(research_flow_status))
+        FlowDrawer(research_flow_status).draw()
+
+    def test_load_period(self):
+        research_flow_status = self.database.load('project_a', created_from=11, created_to=100)
+
+        ## all the phases are kept
+        self.assertEqual([
+            (1, 'research_preparation', []),
+            (2, 'experiments', [('ex_sf_2', []), ('ex_sf_3', [])]),
+            (3, 'paper_writing', [('pw_sf_1', ['ex_sf_2'])]),
+        ], self.dump(research_flow_status))
+        self.assertEqual([], self.dump(self.database.load('project_a', created_from=200))[0][2])
+
+    def test_load_lineage(self):
+        self.assertEqual([
+            (1, 'research_preparation', [('rp_sf_1', [])]),
+            (2, 'experiments', [('ex_sf_2', ['rp_sf_1'])]),
+            (3, 'paper_writing', [('pw_sf_1', ['ex_sf_2'])]),
+        ], self.dump(self.database.load_lineage('project_a', 'ex_sf_2')))
+        self.assertEqual([
+            (1, 'research_preparation', [('rp_sf_1', [])]),
+            (2, 'experiments', [('ex_sf_1', ['rp_sf_1']), ('ex_sf_2', ['rp_sf_1'])]),
+            (3, 'paper_writing', [('pw_sf_1', ['ex_sf_1', 'ex_sf_2'])]),
+        ], self.dump(self.database.load_lineage('project_a', 'pw_sf_1', descendants=False)))
+        self.assertEqual([
+            (1, 'research_preparation', [('rp_sf_1', [])]),
+            (2, 'experiments', [('ex_sf_1', ['rp_sf_1']), ('ex_sf_2', ['rp_sf_1']), ('ex_sf_3', ['rp_sf_1'])]),
+            (3, 'paper_writing', [('pw_sf_1', ['ex_sf_1', 'ex_sf_2']), ('pw_sf_2', ['rp_sf_1'])]),
+        ], self.dump(self.database.load_lineage('project_a', 'rp_sf_1', ancestors=False)))
+
+    def test_projects(self):
+        research_flow_status = [PhaseStatus(1, 'phase', [SubFlowStatus('rp_sf_1', 'name', '', [], 0)])]
+        self.database.import_research_flow_status('project_b', research_flow_status)
+
+        self.assertEqual(['project_a', 'project_b'], self.database.get_projects())
+        ## the same IDs are used in other projects
+        self.assertEqual([(1, 'phase', [('rp_sf_1', [])])], self.dump(self.database.load('project_b')))
+        self.assertEqual(3, len(self.database.load('project_a')))
+
+        ## import replaces the project
+        self.database.import_research_flow_status('project_a', research_flow_status)
+        self.assertEqual(self.dump(research_flow_status), self.dump(self.database.load('project_a')))
+
+        self.database.delete_project('project_a')
+        self.assertEqual(['project_b'], self.database.get_projects())
+
+    def test_file(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'status.db')
+            with StatusDatabase(path) as database:
+                database.import_json('project_a', test_data_path)
+            with StatusDatabase(path) as database:
+                self.assertEqual(self.dump(ResearchFlowStatus.load_from_json(test_data_path)), self.dump(database.load('project_a')))
+
+            connection = sqlite3.connect(path)
+            connection.execute('PRAGMA user_version=99')
+            connection.close()
+            with self.assertRaises(ArgError):
+                StatusDatabase(path)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_err(self):
+        with self.assertRaises(ArgError):
+            self.database.load('project_c')
+        with self.assertRaises(ArgError):
+            self.database.load_lineage('project_a', 'not_found')
+        with self.assertRaises(ArgError):
+            self.database.import_research_flow_status('project_c', [PhaseStatus(1, 'phase', [SubFlowStatus('a', '', '', ['b'], 0)])])
+        with self.assertRaises(JSONDataError):
+            self.database.import_json('project_c', '{"a": 1}')
+        ## a failed import does not change the database
+        self.assertEqual(['project_a'], self.database.get_projects())
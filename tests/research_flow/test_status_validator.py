@@ -0,0 +1,65 @@
+from unittest import TestCase
+import json
+
+from dg_drawer.error.error import ArgError, JSONDataError
+from dg_drawer.research_flow.flow_drawer import FlowDrawer
+from dg_drawer.research_flow.research_flow_status import PhaseStatus, ResearchFlowStatus, SubFlowStatus
+from dg_drawer.research_flow.status_validator import StatusValidator
+
+test_data_path = './tests/test_data/test_1_research_flow_status.json'
+
+class TestStatusValidator(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_status_validator
+
+    def get_research_flow_status(self, parent_ids_3:list, id_3:str='3'):
+        return [
+            PhaseStatus(1, 'phase_1', [SubFlowStatus('1', 'sf_1', '', [], 1)]),
+            PhaseStatus(2, 'phase_2', [SubFlowStatus('2', 'sf_2', '', ['1'], 2), SubFlowStatus(id_3, 'sf_3', '', parent_ids_3, 3)]),
+        ]
+
+    def test_validate(self):
+        index = StatusValidator.validate(self.get_research_flow_status(['1']))
+        self.assertEqual({'1': 0, '2': 1, '3': 2}, index)
+
+    def test_validate_error(self):
+        ## parent ID not found
+        with self.assertRaisesRegex(ArgError, r'Parent ID \[100\] of sub flow \[3\] is not found at phase \[2\] \(phase_2\) sub flow \[1\]'):
+            StatusValidator.validate(self.get_research_flow_status(['100']))
+
+        ## parent in the same phase (including the sub flow itself)
+        with self.assertRaisesRegex(ArgError, r'Parent ID \[2\] of sub flow \[3\] is not in a previous phase'):
+            StatusValidator.validate(self.get_research_flow_status(['2']))
+        with self.assertRaisesRegex(ArgError, r'Parent ID \[3\] of sub flow \[3\] is not in a previous phase'):
+            StatusValidator.validate(self.get_research_flow_status(['3']))
+
+        ## duplicate ID
+        with self.assertRaisesRegex(JSONDataError, r'Duplicate sub flow ID \[1\] at phase \[2\] \(phase_2\) sub flow \[1\], already used in phase \[1\]'):
+            StatusValidator.validate(self.get_research_flow_status(['1'], id_3='1'), error_class=JSONDataError)
+
+    def test_flow_drawer(self):
+        fd = FlowDrawer(self.get_research_flow_status(['100']))
+        with self.assertRaises(ArgError):
+            fd.draw()
+
+    def test_load_error(self):
+        with open(test_data_path, 'r') as f:
+            loaded_json = json.load(f)
+
+        def load_with(update, message):
+            data = json.loads(json.dumps(loaded_json))
+            update(data)
+            with self.assertRaisesRegex(JSONDataError, message):
+                ResearchFlowStatus.load(json.dumps(data))
+
+        def sub_flow(data):
+            return data['research_flow_pahse_data'][2]['sub_flow_data'][2]
+
+        load_with(lambda data: data.pop('research_flow_pahse_data'), r'Missing key \[research_flow_pahse_data\] at \(root\)')
+        load_with(lambda data: data.update(research_flow_pahse_data={}), r'Invalid type at research_flow_pahse_data : expected array')
+        load_with(lambda data: data['research_flow_pahse_data'][1].pop('name'), r'Missing key \[name\] at research_flow_pahse_data\[1\]')
+        load_with(lambda data: data['research_flow_pahse_data'][2].pop('sub_flow_data'), r'Missing key \[sub_flow_data\] at research_flow_pahse_data\[2\]')
+        load_with(lambda data: data['research_flow_pahse_data'][0].update(sub_flow_data='x'), r'Invalid type at research_flow_pahse_data\[0\]\.sub_flow_data : expected array')
+        load_with(lambda data: sub_flow(data).pop('link'), r'Missing key \[link\] at research_flow_pahse_data\[2\]\.sub_flow_data\[2\]')
+        load_with(lambda data: sub_flow(data).update(create_datetime=True), r'Invalid type at research_flow_pahse_data\[2\]\.sub_flow_data\[2\]\.create_datetime : expected int, got bool')
+        load_with(lambda data: sub_flow(data).update(parent_ids=['rp_sf_1', 1]), r'Invalid type at research_flow_pahse_data\[2\]\.sub_flow_data\[2\]\.parent_ids\[1\] : expected str, got int')
+        load_with(lambda data: sub_flow(data).update(parent_ids=['pw_sf_1']), r'Parent ID \[pw_sf_1\] of sub flow \[ex_sf_3\] is not in a previous phase')
@@ -0,0 +1,42 @@
+from unittest import TestCase
+import zlib
+from dg_drawer.error.error import ArgError
+from dg_drawer.research_flow.svg_codec import create_compressor, get_codecs, iter_compressed, register_codec
+
+
+class TestSvgCodec(TestCase):
+    # test exec : python -m unittest tests.research_flow.test_svg_codec
+
+    def test_iter_compressed(self):
+        chunks = [b'<svg>', b'<line />' * 1000, b'</svg>']
+
+        gzip_data = b''.join(iter_compressed(chunks, 'gzip'))
+        self.assertEqual(b'\x1f\x8b', gzip_data[:2])
+        self.assertEqual(b''.join(chunks), zlib.decompress(gzip_data, 16 + zlib.MAX_WBITS))
+        # gzip data does not depend on the time
+        self.assertEqual(gzip_data, b''.join(iter_compressed(chunks, 'gzip')))
+
+        deflate_data = b''.join(iter_compressed(chunks, 'deflate'))
+        self.assertEqual(b''.join(chunks), zlib.decompress(deflate_data))
+
+    def test_register_codec(self):
+        class Reverse():
+            def __init__(self):
+                self.data = []
+            def compress(self, data):
+                self.data.append(data)
+                return b''
+            def flush(self):
+                return b''.join(self.data)[::-1]
+
+        register_codec('test-reverse', Reverse)
+        self.assertIn('test-reverse', get_codecs())
+        self.assertEqual([b'cba'], list(iter_compressed([b'a', b'', b'bc'], 'test-reverse')))
+
+        with self.assertRaises(ArgError):
+            register_codec('test-reverse', Reverse)
+        register_codec('test-reverse', Reverse, overwrite=True)
+
+    def test_create_compressor_err(self):
+        with self.assertRaises(ArgError):
+            create_compressor('unknown')